@@ -1,2 +1,4 @@
-# Alice OS Core
+"""Alice OS Core
+
 Core module for Alice OS voice assistant.
+"""
@@ -1,4 +1,7 @@
 """Alice OS Core - Orchestrates all modules"""
+import argparse
+import asyncio
+
 from .voice import VoiceInput
 from .brain import Brain
 from .home import SmartHome
@@ -6,6 +9,10 @@ from .habits import HabitTracker
 from .finance import Finance
 from .shopping import Shopping
 from .context import ContextEngine
+from .intents import default_router
+from .pipeline import VoicePipeline
+from .models import warm_up
+from .metrics import metrics
 
 class AliceOS:
     def __init__(self):
@@ -16,21 +23,98 @@ class AliceOS:
         self.finance = Finance()
         self.shopping = Shopping()
         self.context = ContextEngine()
+        self.intents = default_router(self.home, self.shopping, self.habits)
+    
+    def warm_up(self, background=True):
+        """Preload the STT and LLM models in parallel."""
+        return warm_up(self.voice.warm_up, self.brain.warm_up, background=background)
     
-    def run(self):
+    def run(self, pipelined=False):
         """Main voice loop."""
+        # Models load in the background while the mic starts listening
+        self.warm_up()
+        self.context.start()
+        if pipelined:
+            return asyncio.run(self.pipeline().run())
         while True:
             # 1. Listen
-            audio = self.voice.listen()
-            # 2. Transcribe
-            text = self.voice.transcribe(audio)
-            # 3. Get context
+            with metrics.timer("listen"):
+                audio = self.voice.listen()
+            self.turn(audio)
+    
+    def turn(self, audio):
+        """Handle one captured utterance: transcribe, think and speak; returns the reply."""
+        # 2. Transcribe
+        with metrics.timer("transcribe"):
+            text = self.transcribe(audio)
+        # 3. Get context
+        with metrics.timer("context"):
             ctx = self.context.get_context()
-            # 4. Think
-            response = self.brain.think(text, ctx)
-            # 5. Speak
+        # 4. Think
+        with metrics.timer("think"):
+            response = self.respond(text, ctx)
+        # 5. Speak
+        with metrics.timer("speak"):
             self.voice.speak(response)
+        return response
+    
+    def transcribe(self, audio):
+        """Speech to text; the same samples feed background mood inference."""
+        self.context.observe_audio(audio)
+        return self.voice.transcribe(audio)
+    
+    def respond(self, text, ctx=None, stream=False):
+        """Handle simple commands directly; only fall back to the LLM when nothing matches."""
+        routed = self.intents.route(text)
+        if routed:
+            return routed[1]
+        if stream:
+            return self.brain.think_stream(text, ctx)
+        return self.brain.think(text, ctx)
+    
+    def pipeline(self):
+        """Build the concurrent voice pipeline over this instance's modules."""
+        return VoicePipeline(
+            listen=self.voice.listen,
+            transcribe=self.transcribe,
+            get_context=self.context.get_context,
+            think=lambda text, ctx: self.respond(text, ctx, stream=True),
+            speak=self.voice.speak,
+            interrupt=self.voice.stop,
+            metrics=metrics,
+        )
 
-if __name__ == "__main__":
+def main():
+    parser = argparse.ArgumentParser(description="Alice OS voice assistant")
+    parser.add_argument(
+        "command", nargs="?", choices=["run", "serve"], default="run",
+        help="run: local voice loop (default); serve: multi-device gateway"
+    )
+    parser.add_argument(
+        "--pipelined", action="store_true",
+        help="Run listen/transcribe/think/speak as concurrent stages (with barge-in)"
+    )
+    parser.add_argument("--host", default="0.0.0.0", help="Gateway bind address")
+    parser.add_argument("--port", type=int, default=8765, help="Gateway port")
+    parser.add_argument("--max-concurrency", type=int, default=2, help="Parallel LLM requests")
+    parser.add_argument("--metrics-port", type=int, default=None, help="Serve Prometheus /metrics")
+    parser.add_argument("--trace", default=None, help="Append per-stage timings to a JSONL file")
+    args = parser.parse_args()
+    
+    if args.trace:
+        metrics.trace_to(args.trace)
+    if args.metrics_port:
+        metrics.serve(args.metrics_port)
+    
     alice = AliceOS()
-    alice.run()
+    if args.command == "serve":
+        from .gateway import Gateway
+        gateway = Gateway(
+            model=alice.brain.model, router=alice.intents, max_concurrency=args.max_concurrency
+        )
+        gateway.serve(args.host, args.port)
+    else:
+        alice.run(pipelined=args.pipelined)
+
+if __name__ == "__main__":
+    main()
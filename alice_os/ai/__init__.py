@@ -35,21 +35,26 @@ Never reveal you are an AI model. You are Alice.
 
 ## Context Window
 
-- **History:** Last 20 messages
-- **User Profile:** Persistent memory in memory/
+- **History:** Last 20 messages, capped at ~2k tokens; older turns are folded
+  into a rolling summary and everything is logged to memory/conversation.jsonl
+- **User Profile:** Persistent memory in memory/ (memory/profile.md is appended
+  to the system prompt once per session, so the prompt prefix never drifts)
 - **Current Context:** Location, activity, mood
 
 ## Fine-tuning (Future)
 
 For deeper personalization, consider:
 1. **LoRA adapters** for personality
-2. **RAG** with personal documents
-3. **Memory embedding** for long-term recall
+2. **RAG** with personal documents (started: BM25 index over memory/, see retrieval.py)
+3. **Memory embedding** for long-term recall (set `embedding_model` to blend it in)
 """
 
 from enum import Enum
+from pathlib import Path
 from pydantic import BaseModel
 
+from .memory import ConversationMemory
+
 class AIModel(str, Enum):
     LLAMA_32 = "llama3.2"
     LLAMA_31 = "llama3.1"
@@ -65,46 +70,146 @@ You know the user's habits, preferences, and routines.
 You proactively help with smart home, habits, finance, and daily tasks.
 Keep responses natural and concise."""
     context_window: int = 20
+    history_tokens: int = 2048
+    persist_history: bool = True
     memory_path: str = "./memory/"
+    keep_alive: str = "30m"  # how long Ollama keeps the model resident between turns
+    rag_top_k: int = 3  # notes from memory_path injected per turn (0 disables)
+    rag_refresh_seconds: float = 30.0
+    embedding_model: str = None  # e.g. "nomic-embed-text"; BM25 only when unset
 
 class AliceAI:
     """Main AI interface for Alice OS."""
     
     def __init__(self, config: AIConfig = None):
         self.config = config or AIConfig()
-        self.conversation_history = []
-        self.load_model()
+        self.memory = ConversationMemory(
+            max_tokens=self.config.history_tokens,
+            max_messages=self.config.context_window,
+            path=Path(self.config.memory_path) / "conversation.jsonl"
+            if self.config.persist_history else None,
+        )
+        self._handle = None
+        self._session = None
+        self._index = None
+    
+    @property
+    def conversation_history(self):
+        """Recent messages still inside the history budget."""
+        return self.memory.messages
+    
+    @property
+    def client(self):
+        """Shared Ollama client for the configured model (see alice_os.models.registry)."""
+        if self._handle is None:
+            from ..models import registry
+            self._handle = registry.acquire("ollama", self.config.model.value)
+        return self._handle.model
+    
+    @property
+    def session(self):
+        """Warm LLM session; the system prompt and profile are fixed for its lifetime."""
+        if self._session is None:
+            from ..brain.session import LLMSession
+            profile_file = Path(self.config.memory_path) / "profile.md"
+            profile = profile_file.read_text() if profile_file.exists() else None
+            self._session = LLMSession(
+                self.client, self.config.model.value, self.config.system_prompt,
+                profile=profile, keep_alive=self.config.keep_alive,
+                options={"temperature": self.config.temperature, "num_predict": self.config.max_tokens},
+            )
+        return self._session
     
     def load_model(self):
-        """Load the selected LLM via Ollama."""
-        import ollama
-        ollama.pull(self.config.model.value)
+        """Load the selected LLM via Ollama (pulls only if not already present)."""
+        from ..models import ensure_ollama_model
+        ensure_ollama_model(self.config.model.value, client=self.client)
+        self.session.warm_up()
         print(f"✅ Loaded {self.config.model.value}")
     
-    def chat(self, user_message: str) -> str:
-        """Process user message and return Alice's response."""
-        import ollama
-        
-        messages = [{"role": "system", "content": self.config.system_prompt}]
-        messages.extend(self.conversation_history[-self.config.context_window:])
+    def close(self):
+        """Release this instance's reference to the shared LLM client."""
+        if self._handle is not None:
+            self._handle.release()
+            self._handle = None
+            self._session = None
+    
+    def _messages(self, user_message, context_prompt=None):
+        # The session supplies the system/profile prefix; history is append-only after it
+        messages = self.memory.as_messages()
+        if context_prompt:
+            # Per-turn context goes in the prompt but is never stored in history
+            messages.append({"role": "system", "content": context_prompt})
         messages.append({"role": "user", "content": user_message})
+        return messages
+    
+    def _remember(self, user_message, reply):
+        self.memory.append("user", user_message)
+        self.memory.append("assistant", reply)
+    
+    def chat(self, user_message: str, context_prompt: str = None) -> str:
+        """Process user message and return Alice's response."""
+        from ..brain import record_eval_rate
+        from ..metrics import metrics
         
-        response = ollama.chat(model=self.config.model.value, messages=messages)
+        messages = self._messages(user_message, context_prompt)
+        with metrics.timer("llm.total"):
+            response = self.session.chat(messages)
+        record_eval_rate(response)
         reply = response["message"]["content"]
         
-        self.conversation_history.append({"role": "user", "content": user_message})
-        self.conversation_history.append({"role": "assistant", "content": reply})
+        self._remember(user_message, reply)
         
         return reply
     
-    def with_context(self, user_message: str, context: dict) -> str:
-        """Chat with additional context (location, activity, mood)."""
-        context_prompt = f"""
-Context:
+    def chat_stream(self, user_message: str, context_prompt: str = None):
+        """Like chat(), but yield Alice's reply sentence by sentence as it is generated."""
+        from ..brain import iter_sentences
+        from ..metrics import metrics
+        
+        messages = self._messages(user_message, context_prompt)
+        stream = self.session.chat(messages, stream=True)
+        tokens = metrics.track_stream("llm", (chunk["message"]["content"] for chunk in stream))
+        spoken = []
+        try:
+            for sentence in iter_sentences(tokens):
+                spoken.append(sentence)
+                yield sentence
+        finally:
+            # Record whatever was said, even if the caller stopped early (barge-in)
+            self._remember(user_message, " ".join(spoken))
+    
+    @property
+    def index(self):
+        """Retrieval index over memory_path (built on first use)."""
+        if self._index is None:
+            from .retrieval import MemoryIndex
+            embed = None
+            if self.config.embedding_model:
+                def embed(texts):
+                    return self.client.embed(model=self.config.embedding_model, input=texts)["embeddings"]
+            self._index = MemoryIndex(self.config.memory_path, embed=embed)
+        return self._index
+    
+    def recall(self, query: str, k: int = None) -> list:
+        """Most relevant note snippets from memory_path for the query."""
+        k = self.config.rag_top_k if k is None else k
+        if k <= 0:
+            return []
+        self.index.refresh(max_age=self.config.rag_refresh_seconds)
+        return self.index.search(query, k)
+    
+    def describe_context(self, context: dict, notes: list = None) -> str:
+        """Describe the current situation (location, activity, mood, time) and relevant notes."""
+        prompt = f"""Context:
 - Location: {context.get('location', 'home')}
 - Activity: {context.get('activity', 'unknown')}
 - Mood: {context.get('mood', 'neutral')}
-- Time: {context.get('time', 'now')}
-
-User says: {user_message}"""
-        return self.chat(context_prompt)
+- Time: {context.get('time', 'now')}"""
+        if notes:
+            prompt += "\n\nRelevant notes:\n" + "\n".join(f"- ({file}) {text}" for _, file, text in notes)
+        return prompt
+    
+    def with_context(self, user_message: str, context: dict) -> str:
+        """Chat with additional context (location, activity, mood) and recalled notes."""
+        return self.chat(user_message, self.describe_context(context, self.recall(user_message)))
@@ -0,0 +1,145 @@
+"""Alice OS - Conversation Memory (token-budgeted, persistent)
+
+Recent turns are kept within a token budget; turns that fall out of the
+budget are folded into a rolling summary, so prompt size stays flat however
+long the session runs.
+
+Every message (and every new summary) is appended to a JSONL log under
+AIConfig.memory_path. On restart only the tail of the log is read: the latest
+summary record plus the messages it doesn't cover.
+"""
+import json
+from collections import deque
+from pathlib import Path
+
+def estimate_tokens(text):
+    """Cheap token estimate (~4 characters per token for English)."""
+    return len(text) // 4 + 1
+
+def extractive_summary(summary, evicted, max_tokens=256):
+    """Default summarizer: keep the gist of each evicted line, newest last, within max_tokens."""
+    lines = [summary] if summary else []
+    for message in evicted:
+        first = message["content"].strip().split("\n")[0][:160]
+        lines.append(f"{message['role']}: {first}")
+    text = "\n".join(lines)
+    max_chars = max_tokens * 4
+    return text[-max_chars:].split("\n", 1)[-1] if len(text) > max_chars else text
+
+def read_backwards(path, block_size=65536):
+    """Yield JSONL records from the end of a file towards the start."""
+    with open(path, "rb") as f:
+        f.seek(0, 2)
+        pos = f.tell()
+        remainder = b""
+        while pos > 0:
+            step = min(block_size, pos)
+            pos -= step
+            f.seek(pos)
+            lines = (f.read(step) + remainder).split(b"\n")
+            remainder = lines.pop(0)
+            for line in reversed(lines):
+                if line.strip():
+                    try:
+                        yield json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # torn write at the end of the log
+        if remainder.strip():
+            try:
+                yield json.loads(remainder)
+            except json.JSONDecodeError:
+                pass
+
+class ConversationMemory:
+    """Bounded chat history with a rolling summary and an append-only on-disk log."""
+    
+    def __init__(self, max_tokens=2048, max_messages=None, path=None, summarize=None):
+        self.max_tokens = max_tokens
+        self.max_messages = max_messages
+        self.path = Path(path) if path else None
+        self.summarize = summarize or extractive_summary
+        self.summary = ""
+        self.tokens = 0
+        self._messages = deque()  # (seq, message, tokens)
+        self._seq = 0
+        if self.path:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            if self.path.exists():
+                self.load()
+    
+    def __len__(self):
+        return len(self._messages)
+    
+    @property
+    def messages(self):
+        """Retained messages, oldest first."""
+        return [message for _, message, _ in self._messages]
+    
+    def as_messages(self):
+        """Chat messages for the prompt: the rolling summary (if any) then recent turns."""
+        prefix = []
+        if self.summary:
+            prefix.append({"role": "system", "content": f"Earlier in this conversation:\n{self.summary}"})
+        return prefix + self.messages
+    
+    def append(self, role, content):
+        """Add a message, persisting it and evicting old turns past the budget."""
+        self._seq += 1
+        message = {"role": role, "content": content}
+        self._write({"seq": self._seq, **message})
+        self._push(self._seq, message)
+        self._evict()
+    
+    def _push(self, seq, message):
+        tokens = estimate_tokens(message["content"])
+        self._messages.append((seq, message, tokens))
+        self.tokens += tokens
+    
+    def _over_budget(self):
+        if self.max_messages and len(self._messages) > self.max_messages:
+            return True
+        return self.tokens > self.max_tokens and len(self._messages) > 1
+    
+    def _evict(self):
+        evicted = []
+        while self._over_budget():
+            seq, message, tokens = self._messages.popleft()
+            self.tokens -= tokens
+            evicted.append((seq, message))
+        if evicted:
+            self.summary = self.summarize(self.summary, [message for _, message in evicted])
+            self._write({"summary": self.summary, "upto": evicted[-1][0]})
+    
+    def _write(self, record):
+        if self.path:
+            with open(self.path, "a") as f:
+                f.write(json.dumps(record) + "\n")
+    
+    def load(self):
+        """Rebuild state from the tail of the log (latest summary plus later messages)."""
+        tail = []
+        summary, upto = None, 0
+        for record in read_backwards(self.path):
+            if "summary" in record:
+                if summary is None:
+                    summary, upto = record["summary"], record["upto"]
+                continue
+            if summary is not None and record["seq"] <= upto:
+                break  # everything from here back is covered by the summary
+            tail.append(record)
+        
+        self.summary = summary or ""
+        self._messages.clear()
+        self.tokens = 0
+        self._seq = upto
+        for record in reversed(tail):
+            self._seq = max(self._seq, record["seq"])
+            self._push(record["seq"], {"role": record["role"], "content": record["content"]})
+        self._evict()
+    
+    def clear(self):
+        """Forget the conversation (the log keeps its history; a blank summary resets it)."""
+        self._messages.clear()
+        self.tokens = 0
+        self.summary = ""
+        self._write({"summary": "", "upto": self._seq})
@@ -0,0 +1,220 @@
+"""Alice OS - Memory Retrieval (local index over memory/ for RAG)
+
+Notes under AIConfig.memory_path are split into paragraph-sized chunks and
+indexed for BM25 keyword search, optionally blended with embedding cosine
+similarity. Postings and document lengths are NumPy arrays, so scoring a query
+is a handful of vectorized updates plus an argpartition for the top k.
+
+refresh() only re-reads files whose size or mtime changed; the index itself is
+cached under <memory_path>/.index/ so startup doesn't re-tokenize everything.
+"""
+import math
+import pickle
+import re
+import time
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+
+NOTE_EXTENSIONS = {".md", ".txt"}
+TOKEN = re.compile(r"[a-z0-9']+")
+STOPWORDS = frozenset(
+    "a an and are as at be but by do for from has have i in is it its me my of on or so "
+    "that the their them they this to was we were what when where which who will with you your".split()
+)
+
+def tokenize(text):
+    """Lowercase word tokens without stopwords."""
+    return [t for t in TOKEN.findall(text.lower()) if t not in STOPWORDS]
+
+def chunk_text(text, max_chars=800):
+    """Split text on blank lines, merging short paragraphs up to max_chars."""
+    chunks, current = [], ""
+    for paragraph in re.split(r"\n\s*\n", text):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        if current and len(current) + len(paragraph) > max_chars:
+            chunks.append(current)
+            current = ""
+        current = f"{current}\n\n{paragraph}" if current else paragraph
+    if current:
+        chunks.append(current)
+    return chunks
+
+class MemoryIndex:
+    """Incrementally maintained BM25 (+ optional embedding) index over a notes directory."""
+    
+    VERSION = 1
+    
+    def __init__(self, root, embed=None, k1=1.5, b=0.75, cache=True):
+        self.root = Path(root)
+        self.embed = embed  # optional: list[str] -> list[vector]
+        self.k1 = k1
+        self.b = b
+        self.cache_path = self.root / ".index" / "index.pkl" if cache else None
+        self.files = {}  # relative path -> (mtime_ns, size, [slots])
+        self.texts = []  # slot -> (file, chunk text), None when free
+        self.postings = {}  # term -> {slot: term frequency}
+        self.doc_len = np.zeros(0, dtype=np.float32)
+        self.vectors = None  # slot x dim, L2-normalized (only with embed)
+        self.total_len = 0.0
+        self.live = 0
+        self.refreshed_at = 0.0
+        self._free = []
+        self._arrays = {}  # term -> (slots, tf) cache, dropped when the term changes
+        if self.cache_path and self.cache_path.exists():
+            self._load()
+    
+    def _load(self):
+        try:
+            with open(self.cache_path, "rb") as f:
+                state = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return
+        if state.get("version") == self.VERSION and state.get("embed") == (self.embed is not None):
+            self.__dict__.update(state["data"])
+    
+    def save(self):
+        """Write the index cache."""
+        if not self.cache_path:
+            return
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        keys = ("files", "texts", "postings", "doc_len", "vectors", "total_len", "live", "_free")
+        state = {"version": self.VERSION, "embed": self.embed is not None,
+                 "data": {k: getattr(self, k) for k in keys}}
+        tmp = self.cache_path.with_suffix(".tmp")
+        with open(tmp, "wb") as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        tmp.replace(self.cache_path)
+    
+    def _note_files(self):
+        for path in self.root.rglob("*"):
+            rel = path.relative_to(self.root)
+            if path.suffix.lower() in NOTE_EXTENSIONS and not any(p.startswith(".") for p in rel.parts):
+                yield rel.as_posix(), path
+    
+    def refresh(self, max_age=0.0):
+        """Re-index changed, new and deleted notes; returns how many files changed."""
+        if time.monotonic() - self.refreshed_at < max_age:
+            return 0
+        self.refreshed_at = time.monotonic()
+        if not self.root.exists():
+            return 0
+        
+        seen, changed = set(), []
+        for rel, path in self._note_files():
+            seen.add(rel)
+            stat = path.stat()
+            known = self.files.get(rel)
+            if known is None or known[:2] != (stat.st_mtime_ns, stat.st_size):
+                changed.append((rel, path, stat))
+        removed = [rel for rel in self.files if rel not in seen]
+        
+        for rel in removed:
+            self._remove_file(rel)
+        new_slots = []
+        for rel, path, stat in changed:
+            if rel in self.files:
+                self._remove_file(rel)
+            text = path.read_text(errors="ignore")
+            slots = [self._add_chunk(rel, chunk) for chunk in chunk_text(text)]
+            self.files[rel] = (stat.st_mtime_ns, stat.st_size, slots)
+            new_slots.extend(slots)
+        if self.embed and new_slots:
+            self._embed_slots(new_slots)
+        if changed or removed:
+            self.save()
+        return len(changed) + len(removed)
+    
+    def _add_chunk(self, rel, text):
+        slot = self._free.pop() if self._free else len(self.texts)
+        if slot == len(self.texts):
+            self.texts.append(None)
+        if slot >= len(self.doc_len):
+            self.doc_len = np.resize(self.doc_len, max(64, 2 * len(self.doc_len)))
+            self.doc_len[slot:] = 0
+        terms = Counter(tokenize(text))
+        self.texts[slot] = (rel, text)
+        self.doc_len[slot] = sum(terms.values())
+        self.total_len += self.doc_len[slot]
+        self.live += 1
+        for term, tf in terms.items():
+            self.postings.setdefault(term, {})[slot] = tf
+            self._arrays.pop(term, None)
+        return slot
+    
+    def _remove_file(self, rel):
+        _, _, slots = self.files.pop(rel)
+        for slot in slots:
+            _, text = self.texts[slot]
+            for term in set(tokenize(text)):
+                docs = self.postings.get(term)
+                if docs is not None:
+                    docs.pop(slot, None)
+                    if not docs:
+                        del self.postings[term]
+                self._arrays.pop(term, None)
+            self.total_len -= self.doc_len[slot]
+            self.doc_len[slot] = 0
+            self.texts[slot] = None
+            if self.vectors is not None and slot < len(self.vectors):
+                self.vectors[slot] = 0.0
+            self.live -= 1
+            self._free.append(slot)
+    
+    def _embed_slots(self, slots):
+        vectors = np.asarray(self.embed([self.texts[s][1] for s in slots]), dtype=np.float32)
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True) + 1e-9
+        capacity = len(self.doc_len)
+        if self.vectors is None or self.vectors.shape[1] != vectors.shape[1]:
+            self.vectors = np.zeros((capacity, vectors.shape[1]), dtype=np.float32)
+        elif len(self.vectors) < capacity:
+            grown = np.zeros((capacity, self.vectors.shape[1]), dtype=np.float32)
+            grown[: len(self.vectors)] = self.vectors
+            self.vectors = grown
+        self.vectors[slots] = vectors
+    
+    def _term_arrays(self, term):
+        arrays = self._arrays.get(term)
+        if arrays is None:
+            docs = self.postings[term]
+            arrays = (np.fromiter(docs.keys(), np.int64, len(docs)),
+                      np.fromiter(docs.values(), np.float32, len(docs)))
+            self._arrays[term] = arrays
+        return arrays
+    
+    def bm25(self, query):
+        """BM25 score of every slot for the query (free slots score 0)."""
+        scores = np.zeros(len(self.doc_len), dtype=np.float32)
+        if not self.live:
+            return scores
+        avgdl = self.total_len / self.live
+        for term in set(tokenize(query)):
+            if term not in self.postings:
+                continue
+            slots, tf = self._term_arrays(term)
+            idf = math.log(1 + (self.live - len(slots) + 0.5) / (len(slots) + 0.5))
+            norm = self.k1 * (1 - self.b + self.b * self.doc_len[slots] / avgdl)
+            scores[slots] += idf * tf * (self.k1 + 1) / (tf + norm)
+        return scores
+    
+    def search(self, query, k=3):
+        """Top-k (score, file, text) chunks for the query, best first."""
+        scores = self.bm25(query)
+        if self.embed and self.vectors is not None and self.live:
+            q = np.asarray(self.embed([query])[0], dtype=np.float32)
+            q /= np.linalg.norm(q) + 1e-9
+            cosine = np.zeros_like(scores)
+            cosine[: len(self.vectors)] = self.vectors @ q
+            top = scores.max()
+            scores = 0.5 * (scores / top if top > 0 else scores) + 0.5 * np.clip(cosine, 0, None)
+        free = [slot for slot in self._free if slot < len(scores)]
+        scores[free] = 0.0
+        k = min(k, int(np.count_nonzero(scores > 0)))
+        if k <= 0:
+            return []
+        best = np.argpartition(-scores, k - 1)[:k]
+        best = best[np.argsort(-scores[best])]
+        return [(float(scores[i]), *self.texts[i]) for i in best if self.texts[i] is not None]
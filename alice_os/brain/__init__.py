@@ -1,15 +1,131 @@
 """Alice OS - Brain Module (Ollama LLM)"""
-import ollama
+import re
+import threading
+
+from ..metrics import metrics
+from ..models import preload_ollama_model, registry
+from .cache import ResponseCache
+from .session import LLMSession
+
+SYSTEM_PROMPT = "You are Alice, a helpful AI assistant."
+
+# End of a sentence: terminal punctuation (plus closing quotes/brackets) followed
+# by whitespace, or a line break.
+SENTENCE_END = re.compile(r"[.!?…]+[\"')\]]*(?=\s)|\n+")
+
+class SentenceSplitter:
+    """Incrementally regroup streamed text chunks into complete sentences."""
+    
+    def __init__(self):
+        self.buffer = ""
+    
+    def feed(self, chunk):
+        """Add a chunk; return the sentences it completes."""
+        self.buffer += chunk
+        sentences = []
+        while True:
+            match = SENTENCE_END.search(self.buffer)
+            if not match:
+                break
+            sentence = self.buffer[:match.end()].strip()
+            self.buffer = self.buffer[match.end():].lstrip()
+            if sentence:
+                sentences.append(sentence)
+        return sentences
+    
+    def flush(self):
+        """Whatever is left at the end of the stream."""
+        rest, self.buffer = self.buffer.strip(), ""
+        return [rest] if rest else []
+
+def iter_sentences(chunks):
+    """Regroup streamed text chunks into complete sentences."""
+    splitter = SentenceSplitter()
+    for chunk in chunks:
+        yield from splitter.feed(chunk)
+    yield from splitter.flush()
+
+def record_eval_rate(response, series="llm.tokens_per_second"):
+    """Record generation speed from Ollama's eval stats on a finished response."""
+    count, duration = response.get("eval_count"), response.get("eval_duration")
+    if count and duration:
+        metrics.observe_rate(series, count / (duration / 1e9))
 
 class Brain:
-    def __init__(self, model="llama3.2"):
+    def __init__(self, model="llama3.2", cache=True, keep_alive="30m"):
         self.model = model
+        self.keep_alive = keep_alive
+        self._session = None
+        # True for the default cache, False/None to disable, or a ResponseCache
+        self.cache = ResponseCache() if cache is True else (cache or None)
+        self._handle = None
+        self._handle_lock = threading.Lock()
+    
+    @property
+    def client(self):
+        """Shared Ollama client for this model, acquired from the registry on first use."""
+        if self._handle is None:
+            with self._handle_lock:
+                if self._handle is None:
+                    self._handle = registry.acquire("ollama", self.model)
+        return self._handle.model
+    
+    @property
+    def session(self):
+        """Warm LLM session with a fixed system prefix (see brain.session)."""
+        if self._session is None:
+            self._session = LLMSession(self.client, self.model, SYSTEM_PROMPT, keep_alive=self.keep_alive)
+        return self._session
+    
+    def close(self):
+        """Release this instance's reference to the shared LLM client."""
+        if self._handle is not None:
+            self._handle.release()
+            self._handle = None
+            self._session = None
     
-    def think(self, user_input, context=None):
-        """Process user input and generate response."""
+    def _messages(self, user_input, context=None):
         # TODO: Implement context-aware thinking
-        response = ollama.chat(model=self.model, messages=[
-            {"role": "system", "content": "You are Alice, a helpful AI assistant."},
-            {"role": "user", "content": user_input},
-        ])
-        return response["message"]["content"]
+        # The system prompt is the session prefix; per-turn messages only go after it
+        return [{"role": "user", "content": user_input}]
+    
+    def warm_up(self):
+        """Make sure the model is present and loaded before the first turn."""
+        preload_ollama_model(self.model, keep_alive=self.keep_alive, client=self.client)
+    
+    def _cache_key(self, user_input, context, cache):
+        if not (cache and self.cache):
+            return None
+        return self.cache.key(user_input, context)
+    
+    def think(self, user_input, context=None, cache=True):
+        """Process user input and generate response (cache=False for context-sensitive prompts)."""
+        key = self._cache_key(user_input, context, cache)
+        if key is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return " ".join(cached)
+        with metrics.timer("llm.total"):
+            response = self.session.chat(self._messages(user_input, context))
+        record_eval_rate(response)
+        reply = response["message"]["content"]
+        if key is not None:
+            self.cache.put(key, list(iter_sentences([reply])))
+        return reply
+    
+    def think_stream(self, user_input, context=None, cache=True):
+        """Yield the response sentence by sentence as the model generates it."""
+        key = self._cache_key(user_input, context, cache)
+        if key is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                yield from cached
+                return
+        stream = self.session.chat(self._messages(user_input, context), stream=True)
+        tokens = metrics.track_stream("llm", (chunk["message"]["content"] for chunk in stream))
+        sentences = []
+        for sentence in iter_sentences(tokens):
+            sentences.append(sentence)
+            yield sentence
+        if key is not None:
+            self.cache.put(key, sentences)  # only complete replies are cached
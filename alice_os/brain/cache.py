@@ -0,0 +1,91 @@
+"""Alice OS - Response Cache (LRU + TTL in front of Brain.think)
+
+Repeated, predictable utterances ("good morning", "turn off the lights") are
+answered from memory instead of another multi-second LLM call. Keys are the
+normalized utterance plus the context fields that can change the answer.
+"""
+import re
+import threading
+import time
+from collections import OrderedDict
+
+FILLERS = re.compile(r"\b(?:hey|hi|ok|okay|alice|please|um|uh)\b")
+PUNCTUATION = re.compile(r"[^\w\s']")
+
+# Prompts whose answers depend on live state rather than on the words alone
+CONTEXT_SENSITIVE = re.compile(
+    r"\b(?:remember|remind|earlier|last time|yesterday|today|tomorrow|tonight|this week|"
+    r"news|weather|balance|spent|spending|schedule|calendar|"
+    r"time is it|what time|clock|date|day is it|what day|"
+    r"monday|tuesday|wednesday|thursday|friday|saturday|sunday|weekend)\b"
+)
+
+def normalize_utterance(text):
+    """Lowercase, drop punctuation and filler words, collapse whitespace."""
+    text = PUNCTUATION.sub(" ", text.lower())
+    return " ".join(FILLERS.sub(" ", text).split())
+
+class ResponseCache:
+    """Thread-safe LRU cache with per-entry TTL and hit/miss counters."""
+    
+    def __init__(self, maxsize=256, ttl=3600.0, context_keys=("location", "activity", "time"),
+                 uncacheable=CONTEXT_SENSITIVE, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.context_keys = context_keys
+        self.uncacheable = uncacheable
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()  # key -> (expires_at, response)
+        self._lock = threading.Lock()
+    
+    def key(self, text, context=None):
+        """Cache key for an utterance, or None if it shouldn't be cached."""
+        normalized = normalize_utterance(text)
+        if not normalized or (self.uncacheable and self.uncacheable.search(normalized)):
+            return None
+        context = context or {}
+        return (normalized,) + tuple(context.get(k) for k in self.context_keys)
+    
+    def get(self, key):
+        """Cached response for key, or None on a miss or expired entry."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, response = entry
+            if expires_at is not None and self.clock() >= expires_at:
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return response
+    
+    def put(self, key, response, ttl=None):
+        """Store a response; ttl overrides the default for this entry (None = default)."""
+        ttl = self.ttl if ttl is None else ttl
+        with self._lock:
+            self._entries[key] = (self.clock() + ttl if ttl else None, response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+    
+    def stats(self):
+        """Hit/miss counters for metrics and tuning."""
+        total = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
@@ -0,0 +1,55 @@
+"""Alice OS - Warm LLM Sessions (keep_alive, stable prompt prefix)
+
+Ollama keeps a model's KV cache between requests, so a prompt that starts with
+exactly the same tokens as the last one only pays for the new tokens. That
+only works if the model stays loaded and the prefix never drifts:
+
+- keep_alive is sent on every request so the model stays resident;
+- the system/profile prefix is rendered once per session and reused
+  byte-for-byte, with per-turn context always placed after it;
+- options are fixed per session (changing e.g. num_ctx forces a reload).
+"""
+
+class LLMSession:
+    """A long-lived, warm conversation channel to one Ollama model."""
+    
+    def __init__(self, client, model, system_prompt, profile=None, keep_alive="30m", options=None):
+        self.client = client
+        self.model = model
+        self.keep_alive = keep_alive
+        self.options = dict(options or {})
+        self.system = system_prompt if not profile else f"{system_prompt}\n\n{profile.strip()}"
+        self.prefix = ({"role": "system", "content": self.system},)
+        self.last_stats = {}
+    
+    def _request(self):
+        request = {"model": self.model, "keep_alive": self.keep_alive}
+        if self.options:
+            request["options"] = self.options
+        return request
+    
+    def _record(self, response):
+        self.last_stats = {
+            key: response.get(key) for key in
+            ("prompt_eval_count", "prompt_eval_duration", "eval_count", "eval_duration", "load_duration")
+        }
+    
+    def warm_up(self):
+        """Load the model and keep it resident for keep_alive."""
+        self.client.generate(prompt="", **self._request())
+    
+    def chat(self, messages, stream=False):
+        """Chat with the fixed prefix followed by `messages`; streams chunks when stream=True."""
+        full = list(self.prefix) + list(messages)
+        response = self.client.chat(messages=full, stream=stream, **self._request())
+        if not stream:
+            self._record(response)
+            return response
+        return self._tap(response)
+    
+    def _tap(self, stream):
+        for chunk in stream:
+            if chunk.get("done"):
+                self._record(chunk)
+            yield chunk
+
@@ -1,31 +1,160 @@
-"""Alice OS - Context Awareness (Location, Activity, Mood)"""
+"""Alice OS - Context Awareness (Location, Activity, Mood)
+
+Sensors refresh in a background thread (or on events via publish()); each
+update builds a new immutable snapshot and swaps it in with a single
+assignment. get_context() just returns the current snapshot, so gathering
+context never blocks or slows a voice turn.
+
+Mood comes from the prosody of the user's own speech: observe_audio() hands
+the STT's in-memory samples to the sensor thread, which extracts features and
+updates the mood field.
+"""
+import os
+import threading
+import time
+from collections import deque
+from types import MappingProxyType
+
+from .prosody import MoodEstimator, prosody_features
+from .sensors import Sensor, default_sensors
+from ..voice.streaming import SAMPLE_RATE
+
+FIELDS = ("location", "activity", "mood", "time")
+
 class ContextEngine:
-    def __init__(self):
-        self.location = None
-        self.activity = None
-        self.mood = None
-        self.time_context = None
-    
-    def update_location(self):
-        """Get current location."""
-        pass
+    def __init__(self, sensors=None, clock=time.monotonic):
+        self.clock = clock
+        self.sensors = {}
+        self._values = {}  # field -> (value, updated_at)
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._audio = deque(maxlen=4)  # utterances awaiting mood inference (newest wins)
+        self.mood_estimator = MoodEstimator()
+        self.mood_errors = 0
+        self._snapshot = MappingProxyType(dict.fromkeys(FIELDS))
+        for sensor in default_sensors() if sensors is None else sensors:
+            self.add_sensor(sensor)
     
-    def detect_activity(self):
-        """Detect current activity (working, sleeping, eating, etc.)."""
-        pass
+    def add_sensor(self, sensor: Sensor):
+        """Register (or replace) the source for a context field."""
+        self.sensors[sensor.field] = sensor
+        sensor.next_poll = 0.0
+        self._wake.set()
     
-    def infer_mood(self):
-        """AI inference of mood from voice/text patterns."""
-        pass
+    def publish(self, field, value):
+        """Event-driven update of one field; swaps in a new snapshot."""
+        with self._lock:
+            self._values[field] = (value, self.clock())
+            self._swap()
+    
+    def _swap(self):
+        snapshot = dict.fromkeys(FIELDS)
+        snapshot.update((field, value) for field, (value, _) in self._values.items())
+        self._snapshot = MappingProxyType(snapshot)
+    
+    def poll(self):
+        """Read due sensors and drop stale values; returns seconds until the next deadline."""
+        while self._audio:
+            try:
+                self.infer_mood(*self._audio.popleft())
+            except Exception:
+                self.mood_errors += 1  # a bad buffer must not kill the sensor thread
+        now = self.clock()
+        deadline = float("inf")
+        for sensor in list(self.sensors.values()):
+            if sensor.read and sensor.interval is not None and now >= sensor.next_poll:
+                try:
+                    value = sensor.read()
+                except Exception:
+                    sensor.errors += 1  # keep the last value until it goes stale
+                else:
+                    self.publish(sensor.field, value)
+                sensor.next_poll = now + sensor.interval
+            if sensor.interval is not None:
+                deadline = min(deadline, sensor.next_poll)
+        
+        with self._lock:
+            expired = []
+            for field, (_, updated) in self._values.items():
+                max_age = getattr(self.sensors.get(field), "max_age", None)
+                if max_age is None:
+                    continue
+                if now - updated >= max_age:
+                    expired.append(field)
+                else:
+                    deadline = min(deadline, updated + max_age)
+            for field in expired:
+                del self._values[field]
+            if expired:
+                self._swap()
+        return max(0.0, deadline - now)
+    
+    def start(self):
+        """Run sensors in a daemon thread (idempotent)."""
+        if self._thread and self._thread.is_alive():
+            return self
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="alice-context", daemon=True)
+        self._thread.start()
+        return self
+    
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+    
+    def _run(self):
+        while not self._stop.is_set():
+            timeout = self.poll()
+            self._wake.wait(None if timeout == float("inf") else timeout)
+            self._wake.clear()
+    
+    def update_location(self, location):
+        """Record the current location (e.g. from a phone or presence sensor)."""
+        self.publish("location", location)
+    
+    def detect_activity(self, activity):
+        """Record the current activity (working, sleeping, eating, etc.)."""
+        self.publish("activity", activity)
+    
+    def infer_mood(self, audio, sample_rate=SAMPLE_RATE):
+        """Infer mood from an utterance's prosody and publish it (runs on the sensor thread)."""
+        mood = self.mood_estimator.update(prosody_features(audio, sample_rate))
+        if mood is not None:
+            self.publish("mood", mood)
+        return mood
+    
+    def observe_audio(self, audio, sample_rate=SAMPLE_RATE):
+        """Queue an in-memory utterance for background mood inference; returns immediately."""
+        if isinstance(audio, (str, os.PathLike)):
+            return  # only reuse samples already in memory; never decode a second time
+        # Anything else is decoded on the sensor thread; bad input is counted there, never raised here
+        self._audio.append((audio, sample_rate))
+        self._wake.set()
     
     def get_context(self):
-        """Return full context snapshot."""
-        return {
-            "location": self.location,
-            "activity": self.activity,
-            "mood": self.mood,
-            "time": self.time_context,
-        }
+        """Return the latest context snapshot (read-only mapping, O(1))."""
+        return self._snapshot
+    
+    @property
+    def location(self):
+        return self._snapshot["location"]
+    
+    @property
+    def activity(self):
+        return self._snapshot["activity"]
+    
+    @property
+    def mood(self):
+        return self._snapshot["mood"]
+    
+    @property
+    def time_context(self):
+        return self._snapshot["time"]
     
     def adapt_to_context(self, response):
         """Modify Alice's response based on context."""
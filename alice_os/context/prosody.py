@@ -0,0 +1,123 @@
+"""Alice OS - Prosodic mood inference (energy, pitch, speaking rate, pauses)
+
+Features are computed with vectorized NumPy straight from the 16 kHz float32
+samples the STT already holds: no second decode and no extra model. A small
+estimator compares each utterance with a running baseline of the user's own
+voice and smooths its verdict across turns, so one odd sentence doesn't flip
+the mood. Prosody mostly tells arousal (energetic vs. tired), not valence.
+"""
+import math
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from ..voice.streaming import SAMPLE_RATE, to_float32
+
+FEATURES = ("energy", "pitch", "pitch_var", "rate", "pause_ratio")
+
+def prosody_features(audio, sample_rate=SAMPLE_RATE, min_speech=0.3):
+    """Energy (dB), pitch and its spread (semitones re 100 Hz), rate (syllables/s), pause ratio.
+    
+    Returns None if the buffer holds less than `min_speech` seconds of speech.
+    """
+    audio = to_float32(audio, sample_rate)
+    sr = SAMPLE_RATE
+    
+    # 10 ms envelope for voicing, pauses and syllable nuclei
+    hop = sr // 100
+    n = len(audio) // hop
+    if n < 3:
+        return None
+    env = np.sqrt(np.mean(audio[: n * hop].reshape(n, hop) ** 2, axis=1))
+    threshold = max(0.005, 0.15 * float(env.max()))
+    voiced = env > threshold
+    if voiced.sum() * 0.01 < min_speech:
+        return None
+    first, last = np.flatnonzero(voiced)[[0, -1]]
+    span = voiced[first : last + 1]
+    pause_ratio = 1.0 - span.mean()
+    speech_seconds = len(span) * 0.01
+    
+    smooth = np.convolve(env, np.ones(5) / 5, mode="same")
+    window = sliding_window_view(np.pad(smooth, 7, mode="edge"), 15).max(axis=1)  # ±70 ms
+    peaks = (smooth >= window) & (smooth > threshold)
+    peaks[1:] &= ~peaks[:-1]  # a flat top counts once
+    rate = peaks.sum() / speech_seconds
+    
+    energy = 20 * math.log10(float(env[voiced].mean()))
+    
+    # Pitch: batched FFT autocorrelation over 32 ms voiced frames, 60-400 Hz
+    size = 512
+    m = len(audio) // size
+    frames = audio[: m * size].reshape(m, size)
+    rms = np.sqrt(np.mean(frames ** 2, axis=1))
+    frames = frames[rms > threshold]
+    pitch = pitch_var = 0.0
+    if len(frames):
+        frames = frames - frames.mean(axis=1, keepdims=True)
+        spectrum = np.fft.rfft(frames, n=2 * size, axis=1)
+        ac = np.fft.irfft(spectrum * spectrum.conj(), axis=1)[:, :size]
+        ac /= ac[:, :1] + 1e-12
+        lo, hi = sr // 400, sr // 60
+        lags = ac[:, lo:hi].argmax(axis=1) + lo
+        periodic = ac[np.arange(len(ac)), lags] > 0.3
+        if periodic.any():
+            semitones = 12 * np.log2(sr / lags[periodic] / 100.0)
+            pitch = float(np.median(semitones))
+            pitch_var = float(semitones.std())
+    
+    return {
+        "energy": energy,
+        "pitch": pitch,
+        "pitch_var": pitch_var,
+        "rate": float(rate),
+        "pause_ratio": float(pause_ratio),
+    }
+
+class MoodEstimator:
+    """Classify utterances against a running per-user baseline, smoothed across turns."""
+    
+    def __init__(self, warmup=3, smoothing=0.5, threshold=0.8):
+        self.warmup = warmup        # utterances needed before the baseline is trusted
+        self.smoothing = smoothing  # EMA weight of the newest utterance
+        self.threshold = threshold  # z-score needed to leave "neutral"
+        self.count = 0
+        self.mean = dict.fromkeys(FEATURES, 0.0)
+        self.m2 = dict.fromkeys(FEATURES, 0.0)
+        self.arousal = 0.0
+        self.pausing = 0.0
+        self.mood = None
+    
+    def _z(self, name, value):
+        var = self.m2[name] / (self.count - 1) if self.count > 1 else 0.0
+        return (value - self.mean[name]) / math.sqrt(var + 1e-6 + (0.1 * abs(self.mean[name])) ** 2)
+    
+    def _learn(self, features):
+        # Welford update of the baseline
+        self.count += 1
+        for name in FEATURES:
+            delta = features[name] - self.mean[name]
+            self.mean[name] += delta / self.count
+            self.m2[name] += delta * (features[name] - self.mean[name])
+    
+    def update(self, features):
+        """Fold in one utterance's features; returns the current mood (None while warming up)."""
+        if features is None:
+            return self.mood
+        if self.count < self.warmup:
+            self._learn(features)
+            return self.mood
+        z = {name: self._z(name, features[name]) for name in FEATURES}
+        arousal = 0.4 * z["energy"] + 0.2 * z["pitch"] + 0.2 * z["pitch_var"] + 0.2 * z["rate"]
+        a = self.smoothing
+        self.arousal = a * arousal + (1 - a) * self.arousal
+        self.pausing = a * z["pause_ratio"] + (1 - a) * self.pausing
+        self._learn(features)
+        
+        if self.arousal > self.threshold:
+            self.mood = "stressed" if self.pausing < -self.threshold else "energetic"
+        elif self.arousal < -self.threshold:
+            self.mood = "tired" if self.pausing > self.threshold else "calm"
+        else:
+            self.mood = "neutral"
+        return self.mood
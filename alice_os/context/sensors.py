@@ -0,0 +1,40 @@
+"""Alice OS - Context sensors (polled or event-driven sources with staleness budgets)
+
+A Sensor is a named source for one context field. Polled sensors have an
+`interval` and are read by the ContextEngine's background thread; event-driven
+sensors (interval=None) only change when something calls
+ContextEngine.publish(). `max_age` is the staleness budget: a value older than
+that is dropped from the snapshot rather than presented as current.
+"""
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+@dataclass
+class Sensor:
+    field: str
+    read: Optional[Callable[[], object]] = None
+    interval: Optional[float] = None   # seconds between polls; None = event-driven
+    max_age: Optional[float] = None    # seconds a value stays valid; None = forever
+    next_poll: float = 0.0
+    errors: int = 0
+
+def time_of_day(now=None):
+    """Coarse time context: morning, afternoon, evening or night."""
+    hour = time.localtime(now).tm_hour
+    if 5 <= hour < 12:
+        return "morning"
+    if 12 <= hour < 17:
+        return "afternoon"
+    if 17 <= hour < 22:
+        return "evening"
+    return "night"
+
+def default_sensors():
+    """Built-in sources: the clock is polled; location, activity and mood arrive as events."""
+    return [
+        Sensor("time", time_of_day, interval=60.0),
+        Sensor("location", max_age=30 * 60.0),
+        Sensor("activity", max_age=15 * 60.0),
+        Sensor("mood", max_age=10 * 60.0),
+    ]
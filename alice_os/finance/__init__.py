@@ -1,26 +1,143 @@
-"""Alice OS - Personal Finance Module"""
+"""Alice OS - Personal Finance Module
+
+Transactions are kept in a columnar TransactionStore (see store.py) and bank
+exports are streamed in by importers.py; insights are vectorized group-bys
+over the store's columns.
+"""
+import time
+
+import numpy as np
+
+from .anomaly import AnomalyDetector
+from .categorize import Categorizer
+from .importers import import_statement
+from .store import TransactionStore, normalize_merchant
+from .subscriptions import SubscriptionDetector
+
+PERIODS = ("week", "month")
+
+def period_index(timestamps, period="month"):
+    """Integer bucket per timestamp: weeks (Monday-based) or months since 1970."""
+    days = timestamps // 86400
+    if period == "week":
+        return (days + 3) // 7  # 1970-01-01 was a Thursday
+    if period == "month":
+        if not len(days):
+            return days
+        # Bucket against the few month boundaries in range (much cheaper than datetime casts)
+        first, last = (np.datetime64(int(d), "D").astype("datetime64[M]") for d in (days.min(), days.max()))
+        months = np.arange(first, last + 1)
+        starts = months.astype("datetime64[D]").astype(np.int64)
+        return months.astype(np.int64)[np.searchsorted(starts, days, side="right") - 1]
+    raise ValueError(f"Unknown period: {period} (expected one of {PERIODS})")
+
+def period_label(index, period="month"):
+    """ISO label for a period_index bucket: week start (YYYY-MM-DD) or month (YYYY-MM)."""
+    if period == "week":
+        return str(np.datetime64(int(index) * 7 - 3, "D"))
+    return str(np.datetime64(int(index), "M"))
+
 class Finance:
-    def __init__(self):
+    def __init__(self, store=None, categorizer=None):
         self.budgets = {}
-        self.transactions = []
+        self.transactions = store if store is not None else TransactionStore()
         self.goals = {}
+        self.categorizer = categorizer or Categorizer()
+        self.subscriptions = SubscriptionDetector()
+        self._observe(self.subscriptions.observe)
+        self.anomalies = AnomalyDetector()
+        self._observe(self.anomalies.observe)
     
-    def categorize_transaction(self, amount, description, merchant):
-        """Auto-categorize spending."""
-        pass
+    def _observe(self, callback):
+        """Feed existing rows to an incremental analyser, then every new batch."""
+        if len(self.transactions):
+            callback(self.transactions, 0, len(self.transactions))
+        self.transactions.subscribe(callback)
     
-    def get_spending_insights(self):
-        """Weekly/monthly spending breakdown."""
-        pass
+    def import_statement(self, path, format=None):
+        """Stream a CSV/OFX bank export into the store; returns how many rows were added.
+        
+        Rows arrive uncategorized; call categorize_uncategorized() to label them in bulk.
+        """
+        return import_statement(self.transactions, path, format, normalize=normalize_merchant)
+    
+    def add_transaction(self, amount, description, timestamp=None, category=None):
+        """Record one transaction (amount in pounds, negative = spending); returns its row."""
+        return self.transactions.append(
+            int(time.time()) if timestamp is None else timestamp,
+            round(amount * 100),
+            normalize_merchant(description),
+            category,
+        )
+    
+    def categorize_transaction(self, amount, description, merchant=None):
+        """Auto-categorize spending (cached per merchant, see categorize.py)."""
+        if amount > 0:
+            return "income"
+        return self.categorizer.categorize(normalize_merchant(merchant or description))
+    
+    def categorize_uncategorized(self):
+        """Label every uncategorized outgoing row, one lookup per distinct merchant."""
+        store = self.transactions
+        rows = (store.category < 0) & (store.amount < 0)
+        merchant_ids = np.unique(store.merchant[rows])
+        names = [store.merchants.lookup(int(i)) for i in merchant_ids]
+        found = self.categorizer.categorize_many(names)
+        
+        lookup = np.full(len(store.merchants), -1, dtype=np.int16)
+        for merchant_id, name in zip(merchant_ids, names):
+            if name in found:
+                lookup[merchant_id] = store.categories.intern(found[name])
+        rows = np.flatnonzero(rows)
+        categorized = rows[lookup[store.merchant[rows]] >= 0]
+        store.category[categorized] = lookup[store.merchant[categorized]]
+        # Imported rows were scored before they had a category; let their categories learn now
+        self.anomalies.observe_categories(store, categorized)
+        return len(categorized)
+    
+    def get_spending_insights(self, period="month", since=None, until=None, top=5):
+        """Weekly/monthly spending breakdown, by category and top merchants (pounds)."""
+        store = self.transactions
+        mask = store.amount < 0
+        if since is not None:
+            mask &= store.timestamp >= since
+        if until is not None:
+            mask &= store.timestamp < until
+        spent = -store.amount[mask].astype(np.float64)  # exact for pence, fast to bincount
+        
+        buckets = period_index(store.timestamp[mask], period)
+        first = int(buckets.min()) if len(buckets) else 0
+        by_period = np.bincount(buckets - first, weights=spent)
+        
+        by_category = np.bincount(store.category[mask] + 1, weights=spent, minlength=len(store.categories) + 1)
+        categories = {"uncategorized" if i == 0 else store.categories.lookup(i - 1): total / 100
+                      for i, total in enumerate(by_category) if total}
+        
+        by_merchant = np.bincount(store.merchant[mask], weights=spent, minlength=len(store.merchants))
+        leaders = np.argsort(by_merchant)[::-1][:top]
+        
+        return {
+            "period": period,
+            "total": round(spent.sum()) / 100,
+            "count": int(mask.sum()),
+            "by_period": {period_label(first + i, period): total / 100
+                          for i, total in enumerate(by_period) if total},
+            "by_category": dict(sorted(categories.items(), key=lambda item: -item[1])),
+            "top_merchants": [(store.merchants.lookup(int(i)), by_merchant[i] / 100)
+                              for i in leaders if by_merchant[i]],
+        }
     
     def suggest_savings(self):
         """Based on income, suggest savings goals."""
         pass
     
-    def track_subscriptions(self):
-        """Find and track recurring payments."""
-        pass
+    def track_subscriptions(self, now=None):
+        """Recurring payments still running, costliest first (maintained incrementally)."""
+        return self.subscriptions.active(now)
     
-    def alert_unusual_spending(self):
-        """Notify of unusual purchases."""
-        pass
+    def alert_unusual_spending(self, since=None):
+        """Unusual purchases flagged as they were imported (newest last).
+        
+        To be notified immediately, append a callback to `self.anomalies.listeners`.
+        """
+        return self.anomalies.recent(since)
@@ -0,0 +1,199 @@
+"""Alice OS - Streaming spending anomaly detection
+
+Each outgoing transaction is scored in O(1) the moment it is imported,
+against running statistics for its merchant and its category: a Welford
+mean/variance of log-amounts (spending is roughly log-normal) and a P²
+sketch of the 99th percentile. Scoring happens before the statistics are
+updated, so an outlier can't hide itself. All state is plain numbers and
+round-trips through to_dict()/from_dict().
+"""
+import json
+import math
+from bisect import bisect_right, insort
+from collections import deque
+from pathlib import Path
+
+class RunningStats:
+    """Welford's online mean and variance."""
+    
+    def __init__(self, count=0, mean=0.0, m2=0.0):
+        self.count = count
+        self.mean = mean
+        self.m2 = m2
+    
+    def update(self, x):
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (x - self.mean)
+    
+    @property
+    def std(self):
+        return math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else 0.0
+    
+    def z(self, x):
+        return (x - self.mean) / max(self.std, 0.1)
+    
+    def to_dict(self):
+        return {"count": self.count, "mean": self.mean, "m2": self.m2}
+    
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**data)
+
+class P2Quantile:
+    """Jain & Chlamtac's P² estimate of one quantile in constant memory."""
+    
+    def __init__(self, p=0.99):
+        self.p = p
+        self.q = []                         # marker heights
+        self.n = [0, 1, 2, 3, 4]            # marker positions
+        self.desired = [0, 2 * p, 4 * p, 2 + 2 * p, 4]
+        self.increments = [0, p / 2, p, (1 + p) / 2, 1]
+    
+    def update(self, x):
+        q, n = self.q, self.n
+        if len(q) < 5:
+            insort(q, x)
+            return
+        if x < q[0]:
+            q[0] = x
+        elif x > q[4]:
+            q[4] = x
+        k = min(max(bisect_right(q, x) - 1, 0), 3)
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self.desired[i] += self.increments[i]
+        for i in (1, 2, 3):
+            d = self.desired[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                d = 1 if d > 0 else -1
+                parabolic = q[i] + d / (n[i + 1] - n[i - 1]) * (
+                    (n[i] - n[i - 1] + d) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+                    + (n[i + 1] - n[i] - d) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+                )
+                if q[i - 1] < parabolic < q[i + 1]:
+                    q[i] = parabolic
+                else:
+                    q[i] += d * (q[i + d] - q[i]) / (n[i + d] - n[i])
+                n[i] += d
+    
+    @property
+    def value(self):
+        if not self.q:
+            return None
+        if len(self.q) < 5:
+            return self.q[min(len(self.q) - 1, int(self.p * len(self.q)))]
+        return self.q[2]
+    
+    def to_dict(self):
+        return {"p": self.p, "q": self.q, "n": self.n, "desired": self.desired}
+    
+    @classmethod
+    def from_dict(cls, data):
+        sketch = cls(data["p"])
+        sketch.q, sketch.n, sketch.desired = list(data["q"]), list(data["n"]), list(data["desired"])
+        return sketch
+
+class AnomalyDetector:
+    """Per-merchant and per-category spending baselines; alerts as transactions arrive."""
+    
+    def __init__(self, min_history=5, z_threshold=3.0, quantile=0.99, max_alerts=100):
+        self.min_history = min_history
+        self.z_threshold = z_threshold
+        self.quantile = quantile
+        self.stats = {}  # "merchant:<name>" / "category:<name>" -> (RunningStats, P2Quantile)
+        self.alerts = deque(maxlen=max_alerts)
+        self.listeners = []  # called with each alert as it fires
+    
+    def _baseline(self, key):
+        baseline = self.stats.get(key)
+        if baseline is None:
+            baseline = self.stats[key] = (RunningStats(), P2Quantile(self.quantile))
+        return baseline
+    
+    def score(self, key, pounds):
+        """(z-score, above-quantile) against a baseline, or None without enough history."""
+        baseline = self.stats.get(key)
+        if baseline is None or baseline[0].count < self.min_history:
+            return None
+        stats, sketch = baseline
+        return stats.z(math.log(pounds)), pounds > sketch.value
+    
+    def learn(self, key, pounds):
+        """Add one payment to a baseline without scoring it."""
+        stats, sketch = self._baseline(key)
+        stats.update(math.log(pounds))
+        sketch.update(pounds)
+    
+    def check(self, timestamp, pounds, merchant, category=None):
+        """Score one outgoing payment, learn from it, and return the alert if it is unusual."""
+        keys = [f"merchant:{merchant}"] + ([f"category:{category}"] if category else [])
+        alert = None
+        for key in keys:
+            scored = self.score(key, pounds)
+            if scored and scored[0] > self.z_threshold and scored[1]:
+                baseline = self.stats[key][0]
+                alert = {
+                    "timestamp": timestamp,
+                    "merchant": merchant,
+                    "category": category,
+                    "amount": pounds,
+                    "typical": round(math.exp(baseline.mean), 2),
+                    "against": key.split(":", 1)[0],
+                    "score": round(scored[0], 2),
+                }
+                break
+        for key in keys:
+            self.learn(key, pounds)
+        if alert:
+            self.alerts.append(alert)
+            for listener in self.listeners:
+                listener(alert)
+        return alert
+    
+    def observe(self, store, start, stop):
+        """TransactionStore subscriber: check rows [start, stop) in arrival order."""
+        amounts = store.amount[start:stop].tolist()
+        timestamps = store.timestamp[start:stop].tolist()
+        merchants = store.merchant[start:stop].tolist()
+        categories = store.category[start:stop].tolist()
+        for ts, pence, merchant, category in zip(timestamps, amounts, merchants, categories):
+            if pence < 0:
+                self.check(ts, -pence / 100, store.merchants.lookup(merchant),
+                           store.categories.lookup(category))
+    
+    def observe_categories(self, store, rows):
+        """Feed rows that were categorized after import into their category baselines."""
+        amounts = store.amount[rows].tolist()
+        categories = store.category[rows].tolist()
+        for pence, category in zip(amounts, categories):
+            if pence < 0 and category >= 0:
+                self.learn(f"category:{store.categories.lookup(category)}", -pence / 100)
+    
+    def recent(self, since=None):
+        return [alert for alert in self.alerts if since is None or alert["timestamp"] >= since]
+    
+    def to_dict(self):
+        return {
+            "stats": {key: [stats.to_dict(), sketch.to_dict()] for key, (stats, sketch) in self.stats.items()},
+            "alerts": list(self.alerts),
+        }
+    
+    @classmethod
+    def from_dict(cls, data, **options):
+        detector = cls(**options)
+        detector.stats = {
+            key: (RunningStats.from_dict(stats), P2Quantile.from_dict(sketch))
+            for key, (stats, sketch) in data["stats"].items()
+        }
+        detector.alerts.extend(data["alerts"])
+        return detector
+    
+    def save(self, path):
+        Path(path).write_text(json.dumps(self.to_dict()))
+    
+    @classmethod
+    def load(cls, path, **options):
+        return cls.from_dict(json.loads(Path(path).read_text()), **options)
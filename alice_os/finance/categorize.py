@@ -0,0 +1,150 @@
+"""Alice OS - Tiered merchant categorization
+
+1. Exact cache of normalized merchant -> category (every valid answer lands here).
+2. Word-level prefix trie of known merchant patterns ("uber eats" matches
+   "uber eats london", "bp" doesn't match "bpm studios").
+3. Only merchants neither tier knows go to the LLM, many per prompt.
+
+So a bulk import of years of statements costs one LLM call per batch of new
+merchants, and each merchant is paid for once. A merchant the LLM skips or
+answers with an unknown category stays uncategorized and is asked about again.
+"""
+import json
+from collections import Counter
+from pathlib import Path
+
+from ..models import registry
+from .store import normalize_merchant
+
+CATEGORIES = (
+    "groceries", "eating out", "transport", "bills", "subscriptions", "shopping",
+    "entertainment", "health", "housing", "income", "transfers", "other",
+)
+
+PATTERNS = {
+    "tesco": "groceries", "sainsbury's": "groceries", "sainsburys": "groceries", "asda": "groceries",
+    "aldi": "groceries", "lidl": "groceries", "morrisons": "groceries", "waitrose": "groceries",
+    "ocado": "groceries", "co op": "groceries", "costa": "eating out", "starbucks": "eating out",
+    "pret": "eating out", "greggs": "eating out", "mcdonald's": "eating out", "mcdonalds": "eating out",
+    "deliveroo": "eating out", "just eat": "eating out", "uber eats": "eating out", "uber": "transport",
+    "tfl": "transport", "trainline": "transport", "shell": "transport", "bp": "transport",
+    "esso": "transport", "netflix": "subscriptions", "spotify": "subscriptions",
+    "disney plus": "subscriptions", "amazon prime": "subscriptions", "amazon": "shopping",
+    "ebay": "shopping", "argos": "shopping", "boots": "health", "british gas": "bills",
+    "octopus energy": "bills", "thames water": "bills", "council tax": "bills", "vodafone": "bills",
+    "virgin media": "bills", "salary": "income",
+}
+
+PROMPT = """Categories: {categories}.
+Give each merchant below one of those categories. Reply with a JSON object mapping each merchant name, exactly as written, to its category.
+
+{merchants}"""
+
+class PrefixTrie:
+    """Longest-prefix match over whole words."""
+    
+    def __init__(self):
+        self.root = {}
+    
+    def insert(self, pattern, value):
+        node = self.root
+        for word in pattern.split():
+            node = node.setdefault(word, {})
+        node[None] = value
+    
+    def match(self, text):
+        node, found = self.root, None
+        for word in text.split():
+            node = node.get(word)
+            if node is None:
+                break
+            found = node.get(None, found)
+        return found
+
+class Categorizer:
+    """Cache -> trie -> batched LLM, with hit statistics per tier."""
+    
+    def __init__(self, model="llama3.2", classify=None, categories=CATEGORIES,
+                 patterns=PATTERNS, batch_size=40):
+        self.model = model
+        self.classify = classify or self.llm_classify
+        self.categories = categories
+        self.batch_size = batch_size
+        self.cache = {}
+        self.trie = PrefixTrie()
+        for pattern, category in patterns.items():
+            self.trie.insert(pattern, category)
+        self.hits = Counter()
+    
+    def learn(self, merchant, category):
+        """Remember a category for a merchant (and anything starting with its name)."""
+        self.cache[merchant] = category
+        self.trie.insert(merchant, category)
+    
+    def llm_classify(self, merchants):
+        """One LLM call for a batch of merchants; returns {merchant: category}."""
+        listing = "\n".join(f"- {merchant}" for merchant in merchants)
+        with registry.acquire("ollama", self.model) as client:
+            response = client.chat(
+                model=self.model,
+                messages=[{"role": "user", "content": PROMPT.format(
+                    categories=", ".join(self.categories), merchants=listing)}],
+                format="json",
+                options={"temperature": 0},
+            )
+        return json.loads(response["message"]["content"])
+    
+    def categorize_many(self, merchants):
+        """Categories for normalized merchant names, asking the LLM only about unknown ones."""
+        results, unknown = {}, []
+        for merchant in dict.fromkeys(merchants):
+            category = self.cache.get(merchant)
+            if category is not None:
+                self.hits["cache"] += 1
+            else:
+                category = self.trie.match(merchant)
+                if category is not None:
+                    self.hits["trie"] += 1
+                    self.cache[merchant] = category
+                else:
+                    unknown.append(merchant)
+                    continue
+            results[merchant] = category
+        
+        for start in range(0, len(unknown), self.batch_size):
+            batch = unknown[start : start + self.batch_size]
+            try:
+                answers = self.classify(batch)
+            except Exception as e:
+                print(f"⚠️ Categorizing {len(batch)} merchants failed: {e}")
+                continue  # left uncategorized; retried next time
+            self.hits["llm"] += len(batch)
+            if not isinstance(answers, dict):
+                print(f"⚠️ Categorizing {len(batch)} merchants failed: unexpected reply {answers!r}")
+                continue
+            # Match the names the model echoed back however it re-cased or re-punctuated them
+            answers = {normalize_merchant(str(name)): answer for name, answer in answers.items()}
+            for merchant in batch:
+                category = str(answers.get(merchant, "")).strip().lower()
+                if category not in self.categories:
+                    continue  # missing or made up: left uncategorized, retried next time
+                self.learn(merchant, category)
+                results[merchant] = category
+        return results
+    
+    def categorize(self, merchant):
+        return self.categorize_many([merchant]).get(merchant)
+    
+    def stats(self):
+        """Lookups served by each tier, and the share that avoided the LLM."""
+        total = sum(self.hits.values())
+        return {**self.hits, "hit_rate": (total - self.hits["llm"]) / total if total else 0.0}
+    
+    def save(self, path):
+        Path(path).write_text(json.dumps(self.cache, indent=2, sort_keys=True))
+    
+    def load(self, path):
+        """Restore learned merchants from a previous save()."""
+        for merchant, category in json.loads(Path(path).read_text()).items():
+            self.learn(merchant, category)
+        return self
@@ -0,0 +1,142 @@
+"""Alice OS - Streaming bank statement import (CSV and OFX)
+
+Both readers stream the file and yield (timestamp, pence, description)
+tuples; import_statement() buffers them into fixed-size batches for the
+columnar store, so years of history never sit in memory as text. Rows that
+are already in the store are skipped, so overlapping statements can be
+imported again safely.
+"""
+import calendar
+import csv
+import re
+from collections import Counter
+from datetime import datetime
+from decimal import Decimal
+from itertools import islice
+from pathlib import Path
+
+DATE_FORMATS = ("%Y-%m-%d", "%d/%m/%Y", "%d/%m/%y", "%d-%m-%Y", "%d %b %Y", "%d %B %Y", "%m/%d/%Y")
+DATE_COLUMNS = ("date", "transaction date", "posted date", "booking date")
+AMOUNT_COLUMNS = ("amount", "value", "amount (gbp)")
+OUT_COLUMNS = ("paid out", "debit", "money out", "withdrawals")
+IN_COLUMNS = ("paid in", "credit", "money in", "deposits")
+DESCRIPTION_COLUMNS = ("description", "merchant", "name", "payee", "details", "memo", "narrative")
+
+def parse_date(text):
+    """Unix timestamp (UTC midnight) for a statement date in any common format."""
+    text = text.strip()
+    for fmt in DATE_FORMATS:
+        try:
+            return calendar.timegm(datetime.strptime(text, fmt).timetuple())
+        except ValueError:
+            continue
+    raise ValueError(f"Unrecognised date: {text!r}")
+
+def to_pence(text):
+    text = text.strip().replace(",", "").replace("£", "").replace("$", "")
+    if not text:
+        return 0
+    if text.startswith("(") and text.endswith(")"):
+        text = "-" + text[1:-1]
+    return int((Decimal(text) * 100).to_integral_value())
+
+def _column(header, names):
+    for name in names:
+        if name in header:
+            return header.index(name)
+    return None
+
+def iter_csv(path):
+    """Yield (timestamp, pence, description) from a bank CSV export."""
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.reader(f)
+        header = [h.strip().lower() for h in next(reader)]
+        date = _column(header, DATE_COLUMNS)
+        amount = _column(header, AMOUNT_COLUMNS)
+        paid_out = _column(header, OUT_COLUMNS)
+        paid_in = _column(header, IN_COLUMNS)
+        description = _column(header, DESCRIPTION_COLUMNS)
+        if date is None or description is None or (amount is None and paid_out is None):
+            raise ValueError(f"Unrecognised CSV columns: {header}")
+        for row in reader:
+            if not row or not row[date].strip():
+                continue
+            if amount is not None:
+                pence = to_pence(row[amount])
+            else:
+                pence = -to_pence(row[paid_out])
+                if paid_in is not None:
+                    pence += to_pence(row[paid_in])
+            yield parse_date(row[date]), pence, row[description].strip()
+
+_OFX_TOKEN = re.compile(r"<(/?)(\w+)>([^<]*)")
+
+def _ofx_tokens(f, chunk_size=1 << 16):
+    """(closing slash, tag, text) for every tag in the stream, however it is split into lines."""
+    pending = ""
+    for chunk in iter(lambda: f.read(chunk_size), ""):
+        pending += chunk
+        cut = pending.rfind("<")  # the last tag may continue in the next chunk
+        if cut > 0:
+            yield from _OFX_TOKEN.findall(pending, 0, cut)
+            pending = pending[cut:]
+    yield from _OFX_TOKEN.findall(pending)
+
+def iter_ofx(path, chunk_size=1 << 16):
+    """Yield (timestamp, pence, description) from an OFX/QFX file (SGML or XML flavour)."""
+    transaction = None
+    fitids = set()  # a transaction listed twice in one download is only yielded once
+    with open(path, encoding="utf-8", errors="replace") as f:
+        for closing, tag, value in _ofx_tokens(f, chunk_size):
+            tag = tag.upper()
+            if tag != "STMTTRN":
+                if transaction is not None and not closing and value.strip():
+                    transaction[tag] = value.strip()
+            elif not closing:
+                transaction = {}
+            elif transaction is not None:
+                fitid = transaction.get("FITID")
+                if fitid is None or fitid not in fitids:
+                    fitids.add(fitid)
+                    posted = transaction["DTPOSTED"][:8]
+                    timestamp = calendar.timegm(datetime.strptime(posted, "%Y%m%d").timetuple())
+                    description = transaction.get("NAME") or transaction.get("MEMO", "")
+                    yield timestamp, to_pence(transaction["TRNAMT"]), description
+                transaction = None
+
+def iter_statement(path, format=None):
+    format = (format or Path(path).suffix.lstrip(".")).lower()
+    if format in ("ofx", "qfx"):
+        return iter_ofx(path)
+    if format == "csv":
+        return iter_csv(path)
+    raise ValueError(f"Unsupported statement format: {format}")
+
+def import_statement(store, path, format=None, normalize=None, batch_size=10000):
+    """Stream a statement into a TransactionStore in batches; returns the number of rows added.
+    
+    A row matching one already stored (same date, amount and merchant) is a re-import and is
+    skipped; matches are counted, so two identical purchases on one day stay two rows.
+    """
+    rows = iter_statement(path, format)
+    existing = Counter(zip(store.timestamp.tolist(), store.amount.tolist(), store.merchant.tolist()))
+    added = 0
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            return added
+        timestamps, amounts, descriptions = zip(*batch)
+        merchants = [normalize(d) for d in descriptions] if normalize else descriptions
+        if existing:
+            new = []
+            for timestamp, amount, merchant in zip(timestamps, amounts, merchants):
+                key = (timestamp, amount, store.merchants.ids.get(merchant))
+                if existing[key] > 0:
+                    existing[key] -= 1
+                else:
+                    new.append((timestamp, amount, merchant))
+            if not new:
+                continue
+            timestamps, amounts, merchants = zip(*new)
+        store.extend(timestamps, amounts, merchants)
+        added += len(timestamps)
@@ -0,0 +1,160 @@
+"""Alice OS - Columnar transaction store
+
+Transactions live in parallel NumPy columns (timestamp, amount in pence,
+merchant id, category id) that grow by doubling, with merchant and category
+names interned once. Group-bys over hundreds of thousands of rows are then
+a handful of vectorized bincount/unique calls instead of Python loops.
+"""
+import json
+import re
+from pathlib import Path
+
+import numpy as np
+
+COLUMNS = {
+    "timestamp": np.int64,  # unix seconds (UTC)
+    "amount": np.int64,     # pence; negative = money out
+    "merchant": np.int32,   # Interner id
+    "category": np.int16,   # Interner id, -1 = uncategorized
+}
+
+_NOISE = re.compile(
+    r"^(card payment to|card purchase|contactless|pos|dd|so|bgc|fpi|fpo|direct debit|"
+    r"standing order|payment to|paypal \*)\s+"
+)
+
+def normalize_merchant(description):
+    """Canonical merchant name: lower-case, bank prefixes, refs and numbers stripped."""
+    text = description.lower().strip()
+    text = _NOISE.sub("", text)
+    text = re.sub(r"\S*\d\S*", " ", text.replace("*", " "))  # card numbers, refs, store ids
+    text = re.sub(r"[^a-z&' ]+", " ", text)
+    text = re.sub(r"\b(on|ref|gb|uk|gbr)\b", " ", text)
+    return " ".join(text.split()) or description.strip().lower()
+
+class Interner:
+    """Bidirectional string <-> small integer id table."""
+    
+    def __init__(self, names=()):
+        self.names = []
+        self.ids = {}
+        for name in names:
+            self.intern(name)
+    
+    def intern(self, name):
+        id_ = self.ids.get(name)
+        if id_ is None:
+            id_ = self.ids[name] = len(self.names)
+            self.names.append(name)
+        return id_
+    
+    def lookup(self, id_):
+        return self.names[id_] if id_ >= 0 else None
+    
+    def __len__(self):
+        return len(self.names)
+
+class TransactionStore:
+    """Append-only, array-backed transactions with interned merchants and categories."""
+    
+    def __init__(self, capacity=1024):
+        self.size = 0
+        self._data = {name: np.zeros(capacity, dtype=dtype) for name, dtype in COLUMNS.items()}
+        self.merchants = Interner()
+        self.categories = Interner()
+        self.subscribers = []
+    
+    def __len__(self):
+        return self.size
+    
+    def column(self, name):
+        """View of a column covering only the filled rows."""
+        return self._data[name][: self.size]
+    
+    @property
+    def timestamp(self):
+        return self.column("timestamp")
+    
+    @property
+    def amount(self):
+        return self.column("amount")
+    
+    @property
+    def merchant(self):
+        return self.column("merchant")
+    
+    @property
+    def category(self):
+        return self.column("category")
+    
+    def _reserve(self, n):
+        capacity = len(self._data["timestamp"])
+        if self.size + n <= capacity:
+            return
+        while capacity < self.size + n:
+            capacity *= 2
+        for name, column in self._data.items():
+            grown = np.zeros(capacity, dtype=column.dtype)
+            grown[: self.size] = column[: self.size]
+            self._data[name] = grown
+    
+    def subscribe(self, callback):
+        """Call callback(store, start, stop) whenever rows [start, stop) are appended."""
+        self.subscribers.append(callback)
+    
+    def extend(self, timestamps, amounts, merchants, categories=None):
+        """Append a batch; merchants/categories are names (interned here). Returns the row range."""
+        n = len(timestamps)
+        self._reserve(n)
+        start, stop = self.size, self.size + n
+        self._data["timestamp"][start:stop] = timestamps
+        self._data["amount"][start:stop] = amounts
+        self._data["merchant"][start:stop] = [self.merchants.intern(m) for m in merchants]
+        if categories is None:
+            self._data["category"][start:stop] = -1
+        else:
+            self._data["category"][start:stop] = [
+                -1 if c is None else self.categories.intern(c) for c in categories
+            ]
+        self.size = stop
+        for callback in self.subscribers:
+            callback(self, start, stop)
+        return range(start, stop)
+    
+    def append(self, timestamp, amount, merchant, category=None):
+        """Append one transaction; returns its row index."""
+        return self.extend([timestamp], [amount], [merchant], [category])[0]
+    
+    def set_category(self, rows, category):
+        """Assign a category to the given rows (index, slice, list or mask)."""
+        self.category[rows] = -1 if category is None else self.categories.intern(category)
+    
+    def row(self, index):
+        return {
+            "timestamp": int(self.timestamp[index]),
+            "amount": int(self.amount[index]) / 100,
+            "merchant": self.merchants.lookup(int(self.merchant[index])),
+            "category": self.categories.lookup(int(self.category[index])),
+        }
+    
+    def save(self, path):
+        """Write the columns (npz) and name tables (json) next to each other."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        np.savez(path.with_suffix(".npz"), **{name: self.column(name) for name in COLUMNS})
+        path.with_suffix(".json").write_text(json.dumps(
+            {"merchants": self.merchants.names, "categories": self.categories.names}
+        ))
+    
+    @classmethod
+    def load(cls, path):
+        path = Path(path)
+        arrays = np.load(path.with_suffix(".npz"))
+        names = json.loads(path.with_suffix(".json").read_text())
+        store = cls(capacity=max(1024, len(arrays["timestamp"])))
+        store.merchants = Interner(names["merchants"])
+        store.categories = Interner(names["categories"])
+        store.size = len(arrays["timestamp"])
+        for name in COLUMNS:
+            store._data[name][: store.size] = arrays[name]
+        return store
@@ -0,0 +1,96 @@
+"""Alice OS - Recurring payment detection
+
+Outgoing payments are grouped by (merchant, amount band) with timestamps kept
+sorted as they arrive, back-dated imports included. Only groups touched by a
+new batch are re-classified, so asking "what subscriptions do I have?" is a
+lookup rather than a scan of years of history.
+"""
+import time
+from bisect import insort
+
+import numpy as np
+
+DAY = 86400
+CADENCES = {"weekly": 7.0, "fortnightly": 14.0, "monthly": 30.44, "quarterly": 91.31, "annual": 365.25}
+MONTHLY_FACTOR = {name: 30.44 / days for name, days in CADENCES.items()}
+
+def classify_intervals(timestamps, min_occurrences=3, tolerance=0.15, consistency=0.75):
+    """Cadence name for sorted payment timestamps, or None if they aren't regular."""
+    if len(timestamps) < min_occurrences:
+        return None
+    intervals = np.diff(np.asarray(timestamps, dtype=np.int64)) / DAY
+    intervals = intervals[intervals > 0.5]  # same-day duplicates aren't a cadence
+    if len(intervals) < min_occurrences - 1:
+        return None
+    median = float(np.median(intervals))
+    for name, days in CADENCES.items():
+        if abs(median - days) <= tolerance * days:
+            regular = np.abs(intervals - days) <= tolerance * days
+            return name if regular.mean() >= consistency else None
+    return None
+
+class SubscriptionDetector:
+    """Incrementally maintained recurring payments, fed by TransactionStore.subscribe()."""
+    
+    def __init__(self, min_occurrences=3, tolerance=0.15, band_width=0.25):
+        self.min_occurrences = min_occurrences
+        self.tolerance = tolerance
+        self.band_width = band_width
+        self.bands = {}          # merchant id -> [latest pence per band]
+        self.groups = {}         # (merchant id, band) -> sorted [(timestamp, pence)]
+        self.subscriptions = {}  # (merchant id, band) -> detected subscription
+        self.merchants = None
+    
+    def band(self, merchant, pence):
+        """Amount band within a merchant: within band_width of a band's latest amount.
+        
+        Bands follow the latest price, so gradual rises (9.99 -> 10.99 -> 11.99) stay together.
+        """
+        bands = self.bands.setdefault(merchant, [])
+        for band, reference in enumerate(bands):
+            if reference / (1 + self.band_width) <= pence <= reference * (1 + self.band_width):
+                bands[band] = pence
+                return band
+        bands.append(pence)
+        return len(bands) - 1
+    
+    def observe(self, store, start, stop):
+        """Fold rows [start, stop) into their groups and re-classify only those groups."""
+        self.merchants = store.merchants
+        amounts = store.amount[start:stop]
+        outgoing = np.flatnonzero(amounts < 0)
+        timestamps = store.timestamp[start:stop][outgoing].tolist()
+        merchants = store.merchant[start:stop][outgoing].tolist()
+        dirty = set()
+        for ts, merchant, pence in zip(timestamps, merchants, (-amounts[outgoing]).tolist()):
+            key = (merchant, self.band(merchant, pence))
+            insort(self.groups.setdefault(key, []), (ts, pence))
+            dirty.add(key)
+        for key in dirty:
+            self._classify(key)
+    
+    def _classify(self, key):
+        payments = self.groups[key]
+        cadence = classify_intervals([ts for ts, _ in payments], self.min_occurrences, self.tolerance)
+        if cadence is None:
+            self.subscriptions.pop(key, None)
+            return
+        last_paid, pence = payments[-1]
+        self.subscriptions[key] = {
+            "merchant": self.merchants.lookup(key[0]),
+            "cadence": cadence,
+            "amount": pence / 100,
+            "monthly_cost": round(pence * MONTHLY_FACTOR[cadence]) / 100,
+            "payments": len(payments),
+            "last_paid": last_paid,
+            "next_due": last_paid + round(CADENCES[cadence] * DAY),
+        }
+    
+    def active(self, now=None, grace=0.5):
+        """Subscriptions whose next payment isn't overdue by more than `grace` of a cycle."""
+        now = time.time() if now is None else now
+        found = [
+            sub for sub in self.subscriptions.values()
+            if now <= sub["next_due"] + grace * CADENCES[sub["cadence"]] * DAY
+        ]
+        return sorted(found, key=lambda sub: -sub["monthly_cost"])
@@ -0,0 +1,194 @@
+"""Alice OS - Multi-device Gateway (HTTP + WebSocket)
+
+`python -m alice_os serve` accepts turns from the mobile app, RPi devices and
+the PC app concurrently:
+
+    POST /v1/turn   {"device": "kitchen-pi", "text": "...", "context": {...},
+                     "priority": "interactive" | "background"}  → {"reply": "..."}
+    GET  /v1/ws?device=phone  (WebSocket) send {"text": ...}, receive
+                     {"type": "sentence", "text": ...} ... {"type": "done"}
+    GET  /healthz
+    GET  /metrics   (Prometheus text, see alice_os.metrics)
+
+Simple commands are answered by the intent router without touching the LLM.
+Everything else goes through one pooled async Ollama client and the
+LLMScheduler, so one slow request can't stall the other devices.
+"""
+import asyncio
+import time
+from collections import OrderedDict
+
+from ..ai.memory import ConversationMemory
+from ..brain import SYSTEM_PROMPT, SentenceSplitter
+from ..metrics import metrics
+from .scheduler import PRIORITIES, LLMScheduler
+
+class Gateway:
+    """Serves turns from many devices over one scheduled, pooled LLM connection."""
+    
+    def __init__(self, model="llama3.2", ollama_host=None, max_concurrency=2, router=None,
+                 system_prompt=SYSTEM_PROMPT, keep_alive="30m", history_tokens=1024,
+                 max_devices=256):
+        import ollama
+        self.client = ollama.AsyncClient(host=ollama_host)
+        self.model = model
+        self.keep_alive = keep_alive
+        self.router = router
+        self.scheduler = LLMScheduler(max_concurrency)
+        self.prefix = [{"role": "system", "content": system_prompt}]
+        self.history_tokens = history_tokens
+        self.max_devices = max_devices
+        self.histories = OrderedDict()  # device -> ConversationMemory, least recently used first
+    
+    def _history(self, device):
+        history = self.histories.get(device)
+        if history is None:
+            history = self.histories[device] = ConversationMemory(max_tokens=self.history_tokens)
+            while len(self.histories) > self.max_devices:
+                self.histories.popitem(last=False)
+        else:
+            self.histories.move_to_end(device)
+        return history
+    
+    async def stream_turn(self, device, text, context=None, priority="interactive"):
+        """Yield the reply to one turn from a device, sentence by sentence."""
+        # Intent handlers block (SmartHome.control waits on the device), so keep them off the loop
+        routed = await asyncio.to_thread(self.router.route, text) if self.router else None
+        if routed:
+            yield routed[1]
+            return
+        
+        history = self._history(device)
+        messages = self.prefix + history.as_messages()
+        if context:
+            details = "\n".join(f"- {k.title()}: {v}" for k, v in context.items() if v is not None)
+            messages.append({"role": "system", "content": f"Context:\n{details}"})
+        messages.append({"role": "user", "content": text})
+        sentences = asyncio.Queue()
+        
+        queued_at = time.perf_counter()
+        
+        async def job():
+            start = time.perf_counter()
+            metrics.observe("gateway.queue", start - queued_at)
+            first, tokens = None, 0
+            try:
+                splitter = SentenceSplitter()
+                stream = await self.client.chat(
+                    model=self.model, messages=messages, stream=True, keep_alive=self.keep_alive
+                )
+                async for chunk in stream:
+                    if first is None:
+                        first = time.perf_counter()
+                        metrics.observe("llm.ttft", first - start)
+                    tokens += 1
+                    for sentence in splitter.feed(chunk["message"]["content"]):
+                        sentences.put_nowait(sentence)
+                for sentence in splitter.flush():
+                    sentences.put_nowait(sentence)
+                end = time.perf_counter()
+                metrics.observe("llm.total", end - start)
+                if tokens > 1 and end > first:
+                    metrics.observe_rate("llm.tokens_per_second", (tokens - 1) / (end - first))
+            finally:
+                sentences.put_nowait(None)
+        
+        scheduled = asyncio.ensure_future(self.scheduler.run(device, job, priority))
+        spoken = []
+        try:
+            while True:
+                sentence = await sentences.get()
+                if sentence is None:
+                    break
+                spoken.append(sentence)
+                yield sentence
+            await scheduled  # re-raise LLM errors
+        finally:
+            if not scheduled.done():
+                scheduled.cancel()
+            if spoken:
+                history.append("user", text)
+                history.append("assistant", " ".join(spoken))
+    
+    async def turn(self, device, text, context=None, priority="interactive"):
+        """Complete reply to one turn from a device."""
+        with metrics.timer("gateway.turn"):
+            return " ".join([s async for s in self.stream_turn(device, text, context, priority)])
+    
+    def app(self):
+        """aiohttp application exposing the gateway endpoints."""
+        from aiohttp import web
+        app = web.Application()
+        app.add_routes([
+            web.post("/v1/turn", self._handle_turn),
+            web.get("/v1/ws", self._handle_ws),
+            web.get("/healthz", self._handle_health),
+            web.get("/metrics", self._handle_metrics),
+        ])
+        return app
+    
+    def serve(self, host="0.0.0.0", port=8765):
+        """Run the gateway until interrupted."""
+        from aiohttp import web
+        print(f"🌐 Alice OS gateway on http://{host}:{port}")
+        web.run_app(self.app(), host=host, port=port, print=None)
+    
+    @staticmethod
+    def _parse(data):
+        if not isinstance(data, dict):
+            raise ValueError("request body must be a JSON object")
+        text = data.get("text") or ""
+        priority = data.get("priority", "interactive")
+        if not isinstance(text, str):
+            raise ValueError("'text' must be a string")
+        text = text.strip()
+        if not text:
+            raise ValueError("'text' is required")
+        if priority not in PRIORITIES:
+            raise ValueError(f"'priority' must be one of {', '.join(PRIORITIES)}")
+        context = data.get("context")
+        if context is not None and not isinstance(context, dict):
+            raise ValueError("'context' must be an object")
+        return text, context, priority
+    
+    async def _handle_turn(self, request):
+        from aiohttp import web
+        try:
+            data = await request.json()
+            text, context, priority = self._parse(data)
+        except ValueError as e:
+            return web.json_response({"error": str(e)}, status=400)
+        device = data.get("device") or request.remote
+        reply = await self.turn(device, text, context, priority)
+        return web.json_response({"device": device, "reply": reply})
+    
+    async def _handle_ws(self, request):
+        from aiohttp import WSMsgType, web
+        ws = web.WebSocketResponse(heartbeat=30)
+        await ws.prepare(request)
+        device = request.query.get("device") or request.remote
+        async for message in ws:
+            if message.type != WSMsgType.TEXT:
+                continue
+            try:
+                text, context, priority = self._parse(message.json())
+            except ValueError as e:
+                await ws.send_json({"type": "error", "error": str(e)})
+                continue
+            async for sentence in self.stream_turn(device, text, context, priority):
+                await ws.send_json({"type": "sentence", "text": sentence})
+            await ws.send_json({"type": "done"})
+        return ws
+    
+    async def _handle_health(self, request):
+        from aiohttp import web
+        return web.json_response({
+            "status": "ok",
+            "running": self.scheduler.running,
+            "queued": self.scheduler.pending(),
+            "devices": len(self.histories),
+        })
+    
+    async def _handle_metrics(self, request):
+        from aiohttp import web
+        return web.Response(text=metrics.prometheus(), content_type="text/plain")
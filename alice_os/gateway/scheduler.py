@@ -0,0 +1,81 @@
+"""Alice OS - LLM Request Scheduler
+
+One household box serves every device, so LLM requests go through a single
+scheduler with bounded concurrency. Interactive voice turns always run before
+background jobs; within a priority, devices take turns (round-robin), so one
+chatty device can't starve the rest.
+"""
+import asyncio
+from collections import OrderedDict, deque
+from functools import partial
+
+PRIORITIES = ("interactive", "background")
+
+class LLMScheduler:
+    """Bounded-concurrency job scheduler with priorities and per-device fairness."""
+    
+    def __init__(self, max_concurrency=2):
+        self.max_concurrency = max_concurrency
+        self.running = 0
+        self.completed = 0
+        self._queues = {priority: OrderedDict() for priority in PRIORITIES}  # device -> deque
+        self._tasks = {}  # future -> running job task
+    
+    async def run(self, device, job, priority="interactive"):
+        """Run the coroutine function job() once a slot is free; return its result."""
+        if priority not in self._queues:
+            raise ValueError(f"Unknown priority: {priority}")
+        future = asyncio.get_running_loop().create_future()
+        self._queues[priority].setdefault(device, deque()).append((job, future))
+        self._dispatch()
+        try:
+            return await future
+        except asyncio.CancelledError:
+            task = self._tasks.get(future)
+            if task:
+                task.cancel()
+            future.cancel()  # skipped by the dispatcher if still queued
+            raise
+    
+    def pending(self):
+        """Queued job count per priority."""
+        return {p: sum(len(q) for q in devices.values()) for p, devices in self._queues.items()}
+    
+    def _next(self):
+        for priority in PRIORITIES:
+            devices = self._queues[priority]
+            if devices:
+                device, queue = next(iter(devices.items()))
+                entry = queue.popleft()
+                if queue:
+                    devices.move_to_end(device)  # next job from this device waits its turn
+                else:
+                    del devices[device]
+                return entry
+        return None
+    
+    def _dispatch(self):
+        while self.running < self.max_concurrency:
+            entry = self._next()
+            if entry is None:
+                return
+            job, future = entry
+            if future.done():
+                continue  # caller gave up while queued
+            self.running += 1
+            task = asyncio.ensure_future(job())
+            self._tasks[future] = task
+            task.add_done_callback(partial(self._finished, future))
+    
+    def _finished(self, future, task):
+        self.running -= 1
+        self.completed += 1
+        self._tasks.pop(future, None)
+        if not future.done():
+            if task.cancelled():
+                future.cancel()
+            elif task.exception() is not None:
+                future.set_exception(task.exception())
+            else:
+                future.set_result(task.result())
+        self._dispatch()
@@ -1,29 +1,232 @@
-"""Alice OS - Habit Tracking & Behavior Change"""
-from datetime import datetime
+"""Alice OS - Habit Tracking & Behavior Change
+
+Completions are stored as an append-only event log (see log.py) with habit
+names in habits.json; streaks are maintained incrementally per habit.
+Bad habits share the log (an event is an occurrence). Pattern statistics
+(patterns.py) are updated with every event, and the analysis and daily
+suggestions derived from them are cached until the data changes.
+"""
+import json
+import time
+from datetime import date, datetime
+from pathlib import Path
+
+import numpy as np
+
+from .log import HabitLog, Streaks, latest_per_day
+from .patterns import PatternStats
+
+def normalize_habit(name):
+    return " ".join(name.lower().split())
+
+def _timestamp(when):
+    if when is None:
+        return time.time()
+    if isinstance(when, datetime):
+        return when.timestamp()
+    if isinstance(when, date):
+        return datetime(when.year, when.month, when.day, 12).timestamp()
+    return float(when)
 
 class HabitTracker:
-    def __init__(self):
-        self.habits = {}  # habit_id -> {name, streak, history, goals}
+    def __init__(self, path=None):
+        self.path = Path(path) if path else None
+        self.habits = {}  # habit_id -> {name, streaks, goals}
         self.bad_habits = {}  # habit_id -> {name, triggers, frequency}
+        self.ids = {}  # normalized name -> habit_id
+        self.names = []  # habit_id -> name (good and bad habits share ids)
+        self.patterns = PatternStats()
+        self._cache = {}  # name -> (key, result), recomputed only when the key changes
+        self.version = 0  # bumped on every event or new habit; the cache key
+        self.log = HabitLog(self.path / "habits.log" if self.path else None)
+        if self.path:
+            self._load()
+    
+    def _load(self):
+        names_file = self.path / "habits.json"
+        if names_file.exists():
+            for habit in json.loads(names_file.read_text()):
+                self._register(habit["name"], habit.get("goals", {}), habit.get("bad", False))
+        events = self.log.load()
+        latest = latest_per_day(events)
+        done = latest[latest["done"] == 1]
+        for habit_id, habit in self.habits.items():
+            habit["streaks"] = Streaks.from_days(done["day"][done["habit"] == habit_id])
+        # For bad habits an un-mark event retracts one occurrence
+        occurrences = np.bincount(events["habit"][events["done"] == 1], minlength=len(self.names))
+        retracted = np.bincount(events["habit"][events["done"] == 0], minlength=len(self.names))
+        for habit_id, habit in self.bad_habits.items():
+            habit["frequency"] = int(occurrences[habit_id] - retracted[habit_id])
+        self.patterns = PatternStats.from_events(done["habit"], done["day"], done["minute"])
+    
+    def _register(self, name, goals=None, bad=False):
+        habit_id = len(self.names)
+        self.version += 1
+        self.ids[name] = habit_id
+        self.names.append(name)
+        if bad:
+            self.bad_habits[habit_id] = {"name": name, "triggers": [], "frequency": 0}
+        else:
+            self.habits[habit_id] = {"name": name, "streaks": Streaks(), "goals": goals or {}}
+        return habit_id
+    
+    def _save_names(self):
+        if self.path:
+            self.path.mkdir(parents=True, exist_ok=True)
+            names = [
+                {"name": name, "bad": True} if habit_id in self.bad_habits
+                else {"name": name, "goals": self.habits[habit_id]["goals"]}
+                for habit_id, name in enumerate(self.names)
+            ]
+            (self.path / "habits.json").write_text(json.dumps(names, indent=2))
     
-    def track_habit(self, habit_name, completed=True):
-        """Log habit completion."""
-        pass
+    def habit_id(self, habit_name, create=False, bad=False):
+        name = normalize_habit(habit_name)
+        habit_id = self.ids.get(name)
+        if habit_id is None and create:
+            habit_id = self._register(name, bad=bad)
+            self._save_names()
+        return habit_id
     
-    def get_streak(self, habit_name):
-        """Get current streak for a habit."""
-        pass
+    def _record(self, habit_id, when, done):
+        ts = _timestamp(when)
+        moment = datetime.fromtimestamp(ts)
+        day, minute = moment.toordinal(), moment.hour * 60 + moment.minute
+        self.log.append(int(ts), day, minute, habit_id, int(done))
+        self.version += 1  # even when the day-level pattern stats don't change (bad habit frequency)
+        self.patterns.update(habit_id, day, minute, done)
+        return day
     
-    def analyze_patterns(self):
-        """AI-powered pattern recognition."""
-        # When do bad habits trigger?
-        # What helps good habits stick?
-        pass
+    def track_habit(self, habit_name, completed=True, when=None):
+        """Log habit completion (or un-mark it), optionally back-dated; returns the current streak."""
+        habit_id = self.habit_id(habit_name, create=True)
+        if habit_id in self.bad_habits:
+            if completed:
+                return self.track_bad_habit(habit_name, when)
+            return self._retract(habit_id, when)
+        day = self._record(habit_id, when, completed)
+        streaks = self.habits[habit_id]["streaks"]
+        if completed:
+            streaks.add(day)
+        else:
+            streaks.remove(day)
+        return streaks.current(date.today().toordinal())
+    
+    def get_streak(self, habit_name, today=None):
+        """Get current streak for a habit (0 for unknown and bad habits)."""
+        habit_id = self.habit_id(habit_name)
+        if habit_id not in self.habits:
+            return 0
+        today = (today or date.today()).toordinal()
+        return self.habits[habit_id]["streaks"].current(today)
+    
+    def get_longest_streak(self, habit_name):
+        habit_id = self.habit_id(habit_name)
+        return self.habits[habit_id]["streaks"].longest if habit_id in self.habits else 0
+    
+    def track_bad_habit(self, habit_name, when=None):
+        """Log an occurrence of a habit the user wants to break; returns how often it has happened."""
+        habit_id = self.habit_id(habit_name, create=True, bad=True)
+        if habit_id in self.habits:
+            raise ValueError(f"{habit_name!r} is tracked as a good habit")
+        self._record(habit_id, when, True)
+        self.bad_habits[habit_id]["frequency"] += 1
+        return self.bad_habits[habit_id]["frequency"]
+    
+    def _retract(self, habit_id, when):
+        """Un-mark a bad habit's occurrence on a day (nothing to retract is a no-op)."""
+        ts = _timestamp(when)
+        day = datetime.fromtimestamp(ts).toordinal()
+        if habit_id in self.patterns.by_day.get(day, ()):
+            self._record(habit_id, ts, False)
+            self.bad_habits[habit_id]["frequency"] -= 1
+        return self.bad_habits[habit_id]["frequency"]
+    
+    def _cached(self, name, key, compute):
+        cached = self._cache.get(name)
+        if cached is None or cached[0] != key:
+            cached = self._cache[name] = (key, compute())
+        return cached[1]
+    
+    def analyze_patterns(self, min_days=14, min_correlation=0.2):
+        """When bad habits trigger, what precedes them, and which good habits go together.
+        
+        Built from the incrementally maintained statistics; cached until the next event.
+        """
+        return self._cached("patterns", self.version,
+                            lambda: self._analyze(min_days, min_correlation))
+    
+    def _analyze(self, min_days, min_correlation):
+        stats = self.patterns
+        enough = stats.days >= min_days
+        same_day = stats.correlation(0) if enough else None
+        next_day = stats.correlation(1) if enough else None
+        
+        def related(row, candidates, sign=1):
+            scored = [(self.names[j], round(float(row[j]), 2)) for j in candidates
+                      if sign * row[j] >= min_correlation]
+            return sorted(scored, key=lambda item: -sign * item[1])
+        
+        good = list(self.habits)
+        report = {"days": stats.days, "habits": {}, "bad_habits": {}}
+        for habit_id, habit in self.habits.items():
+            others = [j for j in good if j != habit_id]
+            report["habits"][habit["name"]] = {
+                "peak_times": stats.peak_times(habit_id),
+                "longest_streak": habit["streaks"].longest,
+                "goes_with": related(same_day[habit_id], others) if enough else [],
+            }
+        for habit_id, habit in self.bad_habits.items():
+            everyone = [j for j in range(len(self.names)) if j != habit_id]
+            triggers = {
+                "peak_times": stats.peak_times(habit_id),
+                "frequency": habit["frequency"],
+                # good habits on the same day that make it less likely
+                "less_likely_with": related(same_day[habit_id], good, sign=-1) if enough else [],
+                # anything the day before that makes it more likely
+                "preceded_by": related(next_day[:, habit_id], everyone) if enough else [],
+            }
+            habit["triggers"] = triggers["preceded_by"]
+            report["bad_habits"][habit["name"]] = triggers
+        return report
     
     def suggest_intervention(self, bad_habit):
         """Proactively suggest habit breaking strategies."""
-        pass
+        triggers = self.analyze_patterns()["bad_habits"].get(normalize_habit(bad_habit))
+        if not triggers or not triggers["frequency"]:
+            return None
+        name = normalize_habit(bad_habit)
+        tips = []
+        if triggers["peak_times"]:
+            tips.append(f"{name} tends to happen around {triggers['peak_times'][0][0]}, so plan something else then")
+        if triggers["less_likely_with"]:
+            tips.append(f"on days you {triggers['less_likely_with'][0][0]} it happens less, so fit that in")
+        if triggers["preceded_by"]:
+            tips.append(f"it often follows a day of {triggers['preceded_by'][0][0]}")
+        return "; ".join(tips).capitalize() + "." if tips else None
+    
+    def get_daily_suggestions(self, today=None):
+        """Morning suggestions based on patterns (recomputed only after new events or a new day)."""
+        today = (today or date.today()).toordinal()
+        return self._cached("suggestions", (self.version, today),
+                            lambda: self._suggest(today))
     
-    def get_daily_suggestions(self):
-        """Morning suggestions based on patterns."""
-        pass
+    def _suggest(self, today):
+        suggestions = []
+        for habit_id, habit in self.habits.items():
+            if today in habit["streaks"].days:
+                continue
+            streak = habit["streaks"].current(today)
+            hour = self.patterns.usual_hour(habit_id, today)
+            when = f" (you usually do it around {hour:02d}:00)" if hour is not None else ""
+            if streak:
+                suggestions.append(f"Keep your {streak}-day {habit['name']} streak going{when}.")
+            elif habit["streaks"].longest:
+                suggestions.append(f"Time to restart {habit['name']}{when}.")
+        for habit_id, habit in self.bad_habits.items():
+            if self.patterns.happens_on(habit_id, today):
+                hour = self.patterns.usual_hour(habit_id, today)
+                tip = self.suggest_intervention(habit["name"])
+                suggestions.append(f"Heads up: {habit['name']} often happens on this day around {hour:02d}:00."
+                                   + (f" {tip}" if tip else ""))
+        return suggestions
@@ -0,0 +1,118 @@
+"""Alice OS - Habit event log and incremental streaks
+
+Every track_habit() call appends one fixed-size binary record to
+habits.log; startup reads the whole file with a single np.fromfile and
+rebuilds streaks vectorized, so years of history load in milliseconds.
+
+Streaks are kept as runs of consecutive completed days, indexed by both
+ends. Adding a day (even a back-dated one) merges at most two neighbouring
+runs in O(1), and the current streak is a dictionary lookup.
+"""
+from pathlib import Path
+
+import numpy as np
+
+EVENT = np.dtype([
+    ("ts", "<i8"),      # unix seconds
+    ("day", "<i4"),     # local date ordinal (date.toordinal())
+    ("minute", "<i2"),  # local minute of day
+    ("habit", "<u2"),   # habit id (index in habits.json)
+    ("done", "u1"),     # 1 = completed, 0 = un-marked
+])
+
+class Streaks:
+    """Runs of consecutive completed days for one habit."""
+    
+    def __init__(self):
+        self.days = set()
+        self.end_of = {}    # run start -> run end
+        self.start_of = {}  # run end -> run start
+        self.longest = 0
+    
+    @classmethod
+    def from_days(cls, days):
+        """Build from completed day ordinals (vectorized run detection)."""
+        streaks = cls()
+        days = np.unique(np.asarray(days, dtype=np.int64))
+        if len(days):
+            breaks = np.flatnonzero(np.diff(days) != 1)
+            starts = days[np.concatenate(([0], breaks + 1))]
+            ends = days[np.concatenate((breaks, [len(days) - 1]))]
+            streaks.days = set(days.tolist())
+            streaks.end_of = dict(zip(starts.tolist(), ends.tolist()))
+            streaks.start_of = dict(zip(ends.tolist(), starts.tolist()))
+            streaks.longest = int((ends - starts).max()) + 1
+        return streaks
+    
+    def add(self, day):
+        """Mark a day done, merging with the runs either side; False if already done."""
+        if day in self.days:
+            return False
+        self.days.add(day)
+        start = self.start_of.pop(day - 1, day)
+        end = self.end_of.pop(day + 1, day)
+        self.end_of[start] = end
+        self.start_of[end] = start
+        self.longest = max(self.longest, end - start + 1)
+        return True
+    
+    def remove(self, day):
+        """Un-mark a day, splitting its run. Rare, so O(run length) is fine here."""
+        if day not in self.days:
+            return False
+        self.days.discard(day)
+        start = day
+        while start - 1 in self.days:
+            start -= 1
+        end = self.end_of.pop(start)
+        del self.start_of[end]
+        for lo, hi in ((start, day - 1), (day + 1, end)):
+            if lo <= hi:
+                self.end_of[lo] = hi
+                self.start_of[hi] = lo
+        if end - start + 1 == self.longest:
+            self.longest = max((hi - lo + 1 for lo, hi in self.end_of.items()), default=0)
+        return True
+    
+    def current(self, today):
+        """Length of the run ending today (or yesterday, if today isn't done yet)."""
+        for end in (today, today - 1):
+            start = self.start_of.get(end)
+            if start is not None:
+                return end - start + 1
+        return 0
+
+class HabitLog:
+    """Append-only file of EVENT records (or memory only, without a path)."""
+    
+    def __init__(self, path=None):
+        self.path = Path(path) if path else None
+        self._file = None
+    
+    def load(self):
+        if self.path is None or not self.path.exists():
+            return np.zeros(0, dtype=EVENT)
+        usable = self.path.stat().st_size // EVENT.itemsize  # ignore a torn final record
+        return np.fromfile(self.path, dtype=EVENT, count=usable)
+    
+    def append(self, ts, day, minute, habit, done):
+        if self.path is None:
+            return
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, "ab")
+        self._file.write(np.array([(ts, day, minute, habit, done)], dtype=EVENT).tobytes())
+        self._file.flush()
+    
+    def close(self):
+        if self._file:
+            self._file.close()
+            self._file = None
+
+def latest_per_day(events):
+    """The last record for each (habit, day): later entries override earlier ones."""
+    if not len(events):
+        return events
+    keys = (events["habit"].astype(np.int64) << 32) | (events["day"].astype(np.int64) & 0xFFFFFFFF)
+    _, first_from_end = np.unique(keys[::-1], return_index=True)
+    return events[len(events) - 1 - first_from_end]
@@ -0,0 +1,150 @@
+"""Alice OS - Habit pattern statistics (when habits happen, what goes with what)
+
+Kept up to date as events arrive instead of re-scanning history:
+- an hour-of-week histogram per habit (7 x 24 bins),
+- co-occurrence counts: days on which both habits happened,
+- lagged counts: habit i on day d and habit j on day d + k.
+
+The matrices are rebuilt vectorized at load (a day x habit presence matrix
+and a couple of BLAS matrix products) and then updated in O(habits) per
+event. The per-day index that incremental updates need is only built on the
+first update, so loading never loops over events in Python.
+Correlations are phi coefficients over the days in the tracked span.
+"""
+import numpy as np
+
+HOURS_PER_WEEK = 7 * 24
+WEEKDAYS = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+
+def weekday(day):
+    """Monday = 0 for a date ordinal."""
+    return (day - 1) % 7
+
+def phi(both, counts, days):
+    """Phi coefficients between every pair of day-presence indicators."""
+    spread = counts * (days - counts)
+    num = days * both - np.multiply.outer(counts, counts)
+    den = np.sqrt(np.multiply.outer(spread, spread).astype(np.float64))
+    return np.divide(num, den, out=np.zeros(den.shape), where=den > 0)
+
+class PatternStats:
+    """Incrementally maintained timing and co-occurrence statistics for all habits."""
+    
+    def __init__(self, lags=(1,), capacity=8):
+        self.lags = lags
+        self._by_day = {}  # day ordinal -> {habit_id: minute}
+        self._unindexed = None  # (habits, days, minutes) loaded but not yet in _by_day
+        self.first_day = self.last_day = None
+        self.version = 0
+        self._allocate(capacity)
+    
+    def _allocate(self, capacity):
+        self.hour_of_week = np.zeros((capacity, HOURS_PER_WEEK), dtype=np.int64)
+        self.counts = np.zeros(capacity, dtype=np.int64)
+        self.together = np.zeros((capacity, capacity), dtype=np.int64)
+        self.lagged = {lag: np.zeros((capacity, capacity), dtype=np.int64) for lag in self.lags}
+    
+    def _ensure(self, habit):
+        capacity = len(self.counts)
+        if habit < capacity:
+            return
+        old = (self.hour_of_week, self.counts, self.together, self.lagged)
+        self._allocate(max(habit + 1, capacity * 2))
+        self.hour_of_week[:capacity] = old[0]
+        self.counts[:capacity] = old[1]
+        self.together[:capacity, :capacity] = old[2]
+        for lag in self.lags:
+            self.lagged[lag][:capacity, :capacity] = old[3][lag]
+    
+    @property
+    def by_day(self):
+        """day ordinal -> {habit_id: minute}, indexed from the loaded events on first use."""
+        if self._unindexed is not None:
+            habits, days, minutes = self._unindexed
+            self._unindexed = None
+            for habit, day, minute in zip(habits.tolist(), days.tolist(), minutes.tolist()):
+                self._by_day.setdefault(day, {})[habit] = minute
+        return self._by_day
+    
+    @classmethod
+    def from_events(cls, habits, days, minutes, lags=(1,)):
+        """Build from one (habit, day, minute) entry per completed habit-day."""
+        habits, days, minutes = (np.asarray(a, dtype=np.int64) for a in (habits, days, minutes))
+        stats = cls(lags, capacity=max(8, int(habits.max()) + 1 if len(habits) else 8))
+        if not len(habits):
+            return stats
+        n = len(stats.counts)
+        slots = weekday(days) * 24 + minutes // 60
+        stats.hour_of_week = np.bincount(
+            habits * HOURS_PER_WEEK + slots, minlength=n * HOURS_PER_WEEK
+        ).reshape(n, HOURS_PER_WEEK)
+        stats.counts = np.bincount(habits, minlength=n)
+        
+        stats.first_day, stats.last_day = int(days.min()), int(days.max())
+        # float64 products go through BLAS and are exact for any realistic count
+        present = np.zeros((stats.last_day - stats.first_day + 1, n))
+        present[days - stats.first_day, habits] = 1.0
+        stats.together = (present.T @ present).astype(np.int64)
+        for lag in lags:
+            if lag < len(present):
+                stats.lagged[lag] = (present[:-lag].T @ present[lag:]).astype(np.int64)
+        stats._unindexed = (habits, days, minutes)
+        return stats
+    
+    def update(self, habit, day, minute=None, done=True):
+        """Add (or with done=False remove) one habit-day; no-op if nothing changes."""
+        on_day = self.by_day.setdefault(day, {})
+        if done == (habit in on_day):
+            return False
+        self._ensure(habit)
+        delta = 1 if done else -1
+        minute = on_day.pop(habit) if not done else (minute or 0)
+        self.hour_of_week[habit, weekday(day) * 24 + minute // 60] += delta
+        self.counts[habit] += delta
+        self.together[habit, habit] += delta
+        for other in on_day:
+            self.together[habit, other] += delta
+            self.together[other, habit] += delta
+        for lag in self.lags:
+            for other in self.by_day.get(day + lag, ()):
+                self.lagged[lag][habit, other] += delta
+            for other in self.by_day.get(day - lag, ()):
+                self.lagged[lag][other, habit] += delta
+        if done:
+            on_day[habit] = minute
+            self.first_day = day if self.first_day is None else min(self.first_day, day)
+            self.last_day = day if self.last_day is None else max(self.last_day, day)
+        self.version += 1
+        return True
+    
+    @property
+    def days(self):
+        return 0 if self.first_day is None else self.last_day - self.first_day + 1
+    
+    def correlation(self, lag=0):
+        """Phi matrix: [i, j] = how much habit j on day d + lag goes with habit i on day d.
+        
+        Lagged values use whole-span habit counts, a close approximation for long spans.
+        """
+        both = self.together if lag == 0 else self.lagged[lag]
+        return phi(both, self.counts, max(self.days - lag, 0))
+    
+    def peak_times(self, habit, top=3):
+        """Busiest hour-of-week slots as ("Tue 21:00", count)."""
+        row = self.hour_of_week[habit] if habit < len(self.counts) else np.zeros(HOURS_PER_WEEK)
+        best = np.argsort(row)[::-1][:top]
+        return [(f"{WEEKDAYS[slot // 24]} {slot % 24:02d}:00", int(row[slot])) for slot in best if row[slot]]
+    
+    def happens_on(self, habit, day):
+        """Whether the habit has ever happened on this weekday."""
+        if habit >= len(self.counts):
+            return False
+        return bool(self.hour_of_week[habit, weekday(day) * 24 : weekday(day) * 24 + 24].any())
+    
+    def usual_hour(self, habit, day):
+        """Most common hour for a habit on that weekday (any day if none), or None."""
+        if habit >= len(self.counts) or not self.counts[habit]:
+            return None
+        row = self.hour_of_week[habit].reshape(7, 24)
+        hours = row[weekday(day)] if row[weekday(day)].any() else row.sum(axis=0)
+        return int(hours.argmax())
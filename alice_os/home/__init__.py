@@ -1,17 +1,276 @@
-"""Alice OS - Smart Home Control (Matter/Thread)"""
+"""Alice OS - Smart Home Control (Matter/Thread)
+
+Device I/O runs on an asyncio loop in a background thread: discovery probes
+every device concurrently with a per-device timeout, and device reports
+(subscriptions) keep an in-memory state cache current. get_status() reads
+that cache - with a freshness timestamp - and never touches the network.
+
+Each device has a single command worker, so commands reach a device in the
+order they were given. Commands that queue up behind one in flight are
+coalesced: only the latest target state is sent ("dim to 30... 20... 10"
+sends 30, then 10). Groups ("all the lights") and scenes fan out to every
+device at once, completing in about one round trip; if any device fails,
+the sync API raises DeviceError naming the devices that couldn't be reached.
+"""
+import asyncio
+import threading
+import time
+
+SCENES = {
+    "bedtime": [("lights", "off"), ("front door", "lock"), ("thermostat", "set_temperature", 18),
+                ("speaker", "stop")],
+    "movie": [("living room lights", "dim", 20), ("speaker", "play")],
+    "morning": [("kitchen lights", "on"), ("thermostat", "set_temperature", 20)],
+    "away": [("all", "off"), ("front door", "lock"), ("thermostat", "set_temperature", 16)],
+}
+EVERYTHING = ("all", "everything", "all devices")
+
+def normalize_device(name):
+    return " ".join(name.lower().replace("_", " ").split()).removeprefix("the ")
+
+def normalize_scene(name):
+    return "".join(name.lower().split())
+
+class DeviceError(Exception):
+    """A group or scene command failed on some devices.
+    
+    `failed` maps device id -> exception; `results` holds every device's state or exception.
+    """
+    
+    def __init__(self, failed, results, names=None):
+        self.failed = failed
+        self.results = results
+        self.names = names or list(failed)  # spoken names of the failed devices
+        super().__init__(f"{len(failed)} of {len(results)} devices failed: {', '.join(self.names)}")
+
 class SmartHome:
-    def __init__(self):
-        self.devices = {}
+    def __init__(self, transport=None, probe_timeout=2.0, max_age=300.0, debounce=0.0, scenes=None):
+        self.transport = transport  # see home.transport.Transport
+        self.probe_timeout = probe_timeout
+        self.max_age = max_age  # older cached states are refreshed in the background
+        self.debounce = debounce  # extra wait before sending, to let rapid commands coalesce
+        self.scenes = {normalize_scene(name): commands for name, commands in (scenes or SCENES).items()}
+        self.coalesced = 0  # commands dropped because a newer one superseded them
+        self._queues = {}  # device_id -> {"command", "waiters", "worker"}
+        self.devices = {}  # device_id -> {id, name, type, room}
+        self.state = {}    # device_id -> {state, online, updated}; entries are replaced, never mutated
+        self._loop = None
+        self._loop_lock = threading.Lock()
+        self._subscribed = False
+        self._refreshing = set()
+    
+    @property
+    def loop(self):
+        """The home's event loop, started in a daemon thread on first use."""
+        if self._loop is None:
+            with self._loop_lock:
+                if self._loop is None:
+                    loop = asyncio.new_event_loop()
+                    threading.Thread(target=loop.run_forever, name="alice-home", daemon=True).start()
+                    self._loop = loop
+        return self._loop
+    
+    def _run(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result()
+    
+    async def _shutdown(self):
+        if self.transport:
+            await self.transport.close()
+        pending = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+    
+    def close(self):
+        if self._loop is not None:
+            self._run(self._shutdown())
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._loop = None
+    
+    def _update(self, device_id, changes, online=True):
+        previous = self.state.get(device_id, {"state": {}})
+        self.state[device_id] = {
+            "state": {**previous["state"], **changes},
+            "online": online,
+            "updated": time.time() if online else previous.get("updated"),
+        }
+    
+    def _on_report(self, device_id, changes):
+        if device_id in self.devices:
+            self._update(device_id, changes)
+    
+    async def _probe(self, device_id):
+        try:
+            state = await asyncio.wait_for(self.transport.read(device_id), self.probe_timeout)
+        except (asyncio.TimeoutError, OSError, ConnectionError):
+            self._update(device_id, {}, online=False)
+            return False
+        self._update(device_id, state)
+        return True
+    
+    # -- async API ---------------------------------------------------------
+    
+    async def discover_async(self):
+        if self.transport is None:
+            return self.devices
+        found = await asyncio.wait_for(self.transport.discover(), self.probe_timeout * 2)
+        self.devices = {device["id"]: device for device in found}
+        if not self._subscribed:
+            self.transport.subscribe(self._on_report)
+            self._subscribed = True
+        await self.refresh_async()
+        return self.devices
+    
+    async def refresh_async(self, device_ids=None):
+        """Probe devices concurrently; returns how many answered in time."""
+        ids = list(self.devices if device_ids is None else device_ids)
+        results = await asyncio.gather(*(self._probe(device_id) for device_id in ids))
+        return sum(results)
+    
+    async def control_async(self, device_id, action, value=None):
+        """Queue a command for a device; returns its state once this (or a newer) command lands."""
+        queue = self._queues.setdefault(device_id, {"command": None, "waiters": [], "worker": None})
+        if queue["command"] is not None:
+            self.coalesced += 1
+        queue["command"] = (action, value)
+        waiter = asyncio.get_running_loop().create_future()
+        queue["waiters"].append(waiter)
+        if queue["worker"] is None or queue["worker"].done():
+            queue["worker"] = asyncio.create_task(self._send_commands(device_id, queue))
+        return await waiter
+    
+    async def _send_commands(self, device_id, queue):
+        while queue["command"] is not None:
+            if self.debounce:
+                await asyncio.sleep(self.debounce)
+            (action, value), waiters = queue["command"], queue["waiters"]
+            queue["command"], queue["waiters"] = None, []
+            try:
+                state = await asyncio.wait_for(
+                    self.transport.command(device_id, action, value), self.probe_timeout
+                )
+            except Exception as e:
+                for waiter in waiters:
+                    if not waiter.done():
+                        waiter.set_exception(e)
+                continue
+            self._update(device_id, state)
+            for waiter in waiters:
+                if not waiter.done():
+                    waiter.set_result(self.state[device_id]["state"])
+    
+    async def control_many_async(self, commands):
+        """Send (device_id, action[, value]) commands concurrently, in order per device.
+        
+        Returns {device_id: final state, or the exception if it failed}.
+        """
+        ids = [command[0] for command in commands]
+        results = await asyncio.gather(
+            *(self.control_async(*command) for command in commands), return_exceptions=True
+        )
+        return dict(zip(ids, results))
+    
+    async def activate_scene_async(self, name):
+        commands = [
+            (device_id, action, *value)
+            for target, action, *value in self.scenes[normalize_scene(name)]
+            for device_id in self.expand(target)
+        ]
+        return await self.control_many_async(commands)
+    
+    # -- sync API ----------------------------------------------------------
     
     def discover_devices(self):
-        """Discover Matter/Thread devices on network."""
-        pass
+        """Discover Matter/Thread devices on network (all probed concurrently)."""
+        return self._run(self.discover_async())
+    
+    def refresh(self, device_ids=None):
+        return self._run(self.refresh_async(device_ids))
+    
+    def resolve(self, name):
+        """Device id for an id or spoken name ("kitchen lights", "thermostat"), or None."""
+        if name in self.devices:
+            return name
+        wanted = normalize_device(name)
+        for device_id, device in self.devices.items():
+            names = (device.get("name", ""), f"{device.get('room', '')} {device.get('type', '')}", device_id)
+            if wanted in (normalize_device(n) for n in names):
+                return device_id
+        return None
+    
+    def resolve_group(self, name):
+        """Device ids for a type, room or "all" ("all the lights", "kitchen", "everything")."""
+        wanted = normalize_device(name)
+        wanted = normalize_device(wanted.removeprefix("all of ").removeprefix("all "))
+        if wanted in EVERYTHING:
+            return list(self.devices)
+        singular = wanted.rstrip("s")  # "locks" -> "lock", "lights" -> "light"
+        found = []
+        for device_id, device in self.devices.items():
+            kind, room = device.get("type", "").rstrip("s"), device.get("room", "")
+            if wanted == room or singular in (kind, f"{room} {kind}"):
+                found.append(device_id)
+        return found
+    
+    def expand(self, target):
+        """One device, or every device in a group."""
+        resolved = self.resolve(target)
+        return [resolved] if resolved else self.resolve_group(target)
+    
+    def control(self, device_id, action, value=None):
+        """Control a smart home device, or a whole group ("lights", "all", "bedroom").
+        
+        Returns the device's new state, {device_id: state} for a group, or None if nothing matched.
+        Raises the device's error, or DeviceError if any member of a group failed.
+        """
+        # Actions: on, off, dim (value=level), set_temperature (value=degrees), etc.
+        resolved = self.resolve(device_id)
+        if self.transport is not None and resolved is not None:
+            return self._run(self.control_async(resolved, action, value))
+        group = self.resolve_group(device_id) if self.transport is not None else []
+        if not group:
+            print(f"⚠️ Unknown device: {device_id}")
+            return None
+        commands = [(member, action, value) for member in group]
+        return self._checked(self._run(self.control_many_async(commands)))
+    
+    def _checked(self, results):
+        """Return {device_id: state}, or raise DeviceError if any device failed."""
+        failed = {id_: result for id_, result in results.items() if isinstance(result, BaseException)}
+        if failed:
+            names = [self.devices.get(id_, {}).get("name", id_) for id_ in failed]
+            raise DeviceError(failed, results, names)
+        return results
+    
+    def add_scene(self, name, commands):
+        """Define a scene: [(device or group, action[, value]), ...]."""
+        self.scenes[normalize_scene(name)] = list(commands)
     
-    def control(self, device_id, action):
-        """Control a smart home device."""
-        # Actions: on, off, dim, set_temperature, etc.
-        pass
+    def activate_scene(self, name):
+        """Run every command in a scene concurrently; None if there is no such scene.
+        
+        Raises DeviceError if any device in the scene failed.
+        """
+        if normalize_scene(name) not in self.scenes or self.transport is None:
+            return None
+        return self._checked(self._run(self.activate_scene_async(name)))
     
-    def get_status(self, device_id):
-        """Get current status of a device."""
-        pass
+    def get_status(self, device_id=None):
+        """Cached status of a device (or all devices when device_id is None); no network I/O.
+        
+        Each status carries `updated` and `age` (seconds); entries older than max_age are
+        marked stale and refreshed in the background.
+        """
+        if device_id is None:
+            return {id_: self.get_status(id_) for id_ in self.devices}
+        resolved = self.resolve(device_id)
+        entry = self.state.get(resolved)
+        if entry is None:
+            return None
+        age = time.time() - entry["updated"] if entry["updated"] else None
+        stale = age is None or age > self.max_age
+        if stale and self.transport is not None and resolved not in self._refreshing:
+            self._refreshing.add(resolved)
+            future = asyncio.run_coroutine_threadsafe(self._probe(resolved), self.loop)
+            future.add_done_callback(lambda _: self._refreshing.discard(resolved))
+        return {**self.devices[resolved], **entry, "age": age, "stale": stale}
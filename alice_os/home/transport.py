@@ -0,0 +1,28 @@
+"""Alice OS - Smart home transports
+
+A Transport is the async boundary between SmartHome and a device network
+(a Matter controller, a Thread border router, or the simulated fleet in
+alice_os.testing). SmartHome only awaits these methods; it never blocks on
+a device directly.
+"""
+class Transport:
+    """Interface every device network implements."""
+    
+    async def discover(self):
+        """Devices on the network: [{"id", "name", "type", "room"}]."""
+        raise NotImplementedError
+    
+    async def read(self, device_id):
+        """Current state of one device, e.g. {"on": True, "level": 40}."""
+        raise NotImplementedError
+    
+    async def command(self, device_id, action, value=None):
+        """Send an action; returns the device's resulting state."""
+        raise NotImplementedError
+    
+    def subscribe(self, callback):
+        """Call callback(device_id, state_changes) whenever a device reports a change."""
+        raise NotImplementedError
+    
+    async def close(self):
+        pass
@@ -0,0 +1,213 @@
+"""Alice OS - Intent Router (fast path for device, list and habit commands)
+
+Commands like "Turn on the lights" or "Add milk to my shopping list" don't
+need an LLM. Utterances are normalized, rules are looked up by their leading
+keyword, and the first compiled pattern that fully matches dispatches straight
+to the module handler. Anything else falls back to Brain.think.
+"""
+import re
+
+from ..habits import normalize_habit
+from ..home import DeviceError
+
+LEADING = re.compile(r"^(?:(?:hey|ok|okay)\s+)?(?:alice\s+)?(?:please\s+)?(?:(?:can|could|would|will) you\s+)?(?:please\s+)?")
+TRAILING = re.compile(r"\s+(?:please|alice|for me|now)$")
+PUNCTUATION = re.compile(r"[^\w\s%'-]")
+
+UNITS = {
+    "zero": 0, "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6, "seven": 7,
+    "eight": 8, "nine": 9, "ten": 10, "eleven": 11, "twelve": 12, "thirteen": 13,
+    "fourteen": 14, "fifteen": 15, "sixteen": 16, "seventeen": 17, "eighteen": 18,
+    "nineteen": 19,
+}
+TENS = {"twenty": 20, "thirty": 30, "forty": 40, "fifty": 50, "sixty": 60, "seventy": 70,
+        "eighty": 80, "ninety": 90}
+
+def parse_number(text):
+    """Parse "22", "22.5", "twenty-two" or "one hundred"; None if it isn't a number."""
+    text = text.strip().rstrip("%").strip()
+    try:
+        return float(text) if "." in text else int(text)
+    except ValueError:
+        pass
+    total = 0
+    words = text.replace("-", " ").split()
+    if not words:
+        return None
+    for word in words:
+        if word in UNITS:
+            total += UNITS[word]
+        elif word in TENS:
+            total += TENS[word]
+        elif word == "hundred":
+            total = (total or 1) * 100
+        elif word != "and":
+            return None
+    return total
+
+def normalize(text):
+    """Lowercase, strip punctuation and politeness so patterns stay simple."""
+    text = PUNCTUATION.sub(" ", text.lower())
+    text = " ".join(text.split())
+    text = LEADING.sub("", text)
+    return TRAILING.sub("", text)
+
+class IntentRouter:
+    """Keyword-indexed table of compiled patterns that dispatch to module handlers."""
+    
+    def __init__(self):
+        self._rules = {}  # leading keyword -> [(name, pattern, handler)]
+        self.hits = 0
+        self.misses = 0
+    
+    def add(self, name, keywords, pattern, handler):
+        """Register a rule; handler(**groups) returns a reply, or None to decline."""
+        compiled = re.compile(pattern)
+        for keyword in keywords:
+            self._rules.setdefault(keyword, []).append((name, compiled, handler))
+    
+    def match(self, text):
+        """(intent name, handler, groups) for the first rule that fully matches, else None."""
+        text = normalize(text)
+        first = text.split(" ", 1)[0]
+        for name, pattern, handler in self._rules.get(first, ()):
+            match = pattern.fullmatch(text)
+            if match:
+                groups = {k: v for k, v in match.groupdict().items() if v is not None}
+                return name, handler, groups
+        return None
+    
+    def route(self, text):
+        """Run the matching handler and return (intent name, reply), or None to use the LLM."""
+        matched = self.match(text)
+        if matched:
+            name, handler, groups = matched
+            reply = handler(**groups)
+            if reply is not None:
+                self.hits += 1
+                return name, reply
+        self.misses += 1
+        return None
+
+# Commands that are conditional, scheduled or compound need the LLM, not a literal device name
+DEFERRED = re.compile(
+    r"\b(?:and|or|but|then|when|whenever|once|if|unless|after|before|until|till|while|"
+    r"tonight|tomorrow|later|every|at \w+|minutes?|hours?|seconds?|o'clock)\b"
+)
+
+def _device(name):
+    """Device or group name from a capture, or None if it carries a condition or second command."""
+    name = re.sub(r"^(?:all (?:of )?)?(?:the )?", "", name.strip()).strip()
+    return None if not name or DEFERRED.search(name) else name
+
+def _spoken_list(names):
+    names = list(names)
+    return names[0] if len(names) == 1 else f"{', '.join(names[:-1])} and {names[-1]}"
+
+def unreachable(error, target):
+    """Honest reply for a failed command, naming the devices of a group or scene that failed."""
+    if not isinstance(error, DeviceError):
+        return f"Sorry, I couldn't reach the {target}."
+    reply = f"Sorry, I couldn't reach the {_spoken_list(error.names)}"
+    return reply + ("; everything else is done." if len(error.failed) < len(error.results) else ".")
+
+def default_router(home=None, shopping=None, habits=None):
+    """Router with the standard home, shopping and habit commands wired to their modules."""
+    router = IntentRouter()
+    
+    if home is not None:
+        def control(device, action, value=None):
+            """None if there is no such device, "" if the command landed, else an apology."""
+            try:
+                return None if home.control(device, action, value) is None else ""
+            except Exception as e:
+                print(f"⚠️ {action} {device} failed: {e}")
+                return unreachable(e, device)
+        
+        def switch(device, action):
+            device = _device(device)
+            failed = device and control(device, action)
+            if failed is None:
+                return None
+            return failed or f"Okay, turning {action} the {device}."
+        
+        def dim(device, level=None):
+            device, value = _device(device), parse_number(level) if level else None
+            if device is None or (level and value is None):
+                return None
+            failed = control(device, "dim", value)
+            if failed is None:
+                return None
+            return failed or f"Dimming the {device}" + (f" to {value} percent." if value is not None else ".")
+        
+        def set_temperature(value):
+            degrees = parse_number(value)
+            failed = None if degrees is None else control("thermostat", "set_temperature", degrees)
+            if failed is None:
+                return None
+            return failed or f"Setting the temperature to {degrees} degrees."
+        
+        def lock(action, device):
+            device = _device(device)
+            failed = device and control(device, action)
+            if failed is None:
+                return None
+            return failed or f"The {device} is {action}ed."
+        
+        def scene(scene, reply=None):
+            if not hasattr(home, "activate_scene"):
+                return None
+            try:
+                if home.activate_scene(scene) is None:
+                    return None
+            except Exception as e:
+                print(f"⚠️ {scene} scene failed: {e}")
+                return unreachable(e, f"devices for {scene} mode")
+            return reply or f"Okay, {scene} mode."
+        
+        def media(action):
+            failed = control("speaker", action)
+            if failed is None:
+                return None
+            return failed or {"play": "Playing some music.", "stop": "Stopping the music.",
+                    "pause": "Pausing the music."}[action]
+        
+        router.add("home.switch", ["turn", "switch"],
+                   r"(?:turn|switch) (?P<action>on|off) (?P<device>.+)", switch)
+        router.add("home.switch", ["turn", "switch"],
+                   r"(?:turn|switch) (?P<device>.+?) (?P<action>on|off)", switch)
+        router.add("home.dim", ["dim"],
+                   r"dim (?P<device>.+?)(?: to (?P<level>[\w -]+?)(?: ?%| percent)?)?", dim)
+        router.add("home.temperature", ["set", "turn"],
+                   r"(?:set|turn) (?:the )?(?:thermostat|heating|temperature)"
+                   r"(?: up| down)? to (?P<value>[\w .-]+?)(?: degrees)?(?: celsius| c)?", set_temperature)
+        router.add("home.lock", ["lock", "unlock"], r"(?P<action>lock|unlock) (?P<device>.+)", lock)
+        router.add("home.media", ["play", "stop", "pause"],
+                   r"(?P<action>play|stop|pause) (?:some |the )?music", media)
+        router.add("home.scene", ["activate", "start", "run", "set"],
+                   r"(?:activate|start|run|set) (?:the |my )?(?P<scene>.+?) (?:scene|mode)", scene)
+        router.add("home.scene", ["good", "goodnight"], r"good ?night",
+                   lambda: scene("bedtime", "Good night! Switching everything off and locking up."))
+    
+    if shopping is not None:
+        def add_to_list(item):
+            shopping.add_to_list(item.removeprefix("some ").strip())
+            return f"Added {item} to your shopping list."
+        
+        router.add("shopping.add", ["add", "put"],
+                   r"(?:add|put) (?P<item>.+?) (?:to|on) (?:my |the )?(?:shopping|grocery) list", add_to_list)
+    
+    if habits is not None:
+        def track(habit):
+            # Only habits the user already tracks; anything else ("track my package") goes to the LLM
+            if normalize_habit(habit) not in habits.ids:
+                return None
+            habits.track_habit(habit.strip())
+            return f"Nice work! Logged {habit}."
+        
+        router.add("habits.track", ["log", "track", "mark"],
+                   r"(?:log|track|mark) (?:my |a |an )?(?P<habit>.+?)(?: as (?:done|complete|completed))?", track)
+        router.add("habits.track", ["i"],
+                   r"i (?:did|finished|completed|done) (?:my |a |an )?(?P<habit>.+?)(?: today)?", track)
+    
+    return router
@@ -0,0 +1,180 @@
+"""Alice OS - Metrics (per-stage latency, LLM token timing, export)
+
+Every voice-loop stage (listen, transcribe, context, think, speak) and every
+LLM stream (time to first token, tokens/s) is timed into a rolling window of
+recent samples. Percentiles are only computed when someone asks, so the hot
+path is a perf_counter() call and a deque append.
+
+Export:
+- Prometheus text format: Metrics.prometheus(), served by Metrics.serve(port)
+  or the gateway's /metrics endpoint;
+- JSONL trace: one line per observation when trace_path is set.
+
+`metrics` is the process-wide default instance.
+"""
+import json
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+class RollingStats:
+    """Recent samples of one series plus lifetime count and sum."""
+    
+    def __init__(self, window=1024):
+        self.samples = deque(maxlen=window)
+        self.count = 0
+        self.total = 0.0
+    
+    def observe(self, value):
+        self.samples.append(value)
+        self.count += 1
+        self.total += value
+    
+    def quantiles(self, qs=QUANTILES):
+        """Nearest-rank quantiles over the rolling window."""
+        ordered = sorted(self.samples)
+        if not ordered:
+            return {q: 0.0 for q in qs}
+        last = len(ordered) - 1
+        return {q: ordered[min(last, int(q * len(ordered)))] for q in qs}
+
+class Metrics:
+    """Low-overhead latency/throughput recorder with Prometheus and JSONL export."""
+    
+    def __init__(self, window=1024, trace_path=None, enabled=True):
+        self.window = window
+        self.enabled = enabled
+        self.stages = {}  # stage -> RollingStats of seconds
+        self.rates = {}  # series -> RollingStats of tokens/s
+        self._lock = threading.Lock()
+        self._trace = None
+        if trace_path:
+            self.trace_to(trace_path)
+    
+    def trace_to(self, path):
+        """Append every observation to a JSONL trace file."""
+        self._trace = open(path, "a", buffering=1)
+    
+    def _series(self, table, name):
+        stats = table.get(name)
+        if stats is None:
+            stats = table[name] = RollingStats(self.window)
+        return stats
+    
+    def observe(self, stage, seconds, **fields):
+        """Record one duration for a stage."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._series(self.stages, stage).observe(seconds)
+            if self._trace:
+                self._trace.write(json.dumps({"ts": time.time(), "stage": stage, "seconds": seconds, **fields}) + "\n")
+    
+    def observe_rate(self, series, per_second):
+        """Record a throughput sample (e.g. LLM tokens/s)."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._series(self.rates, series).observe(per_second)
+            if self._trace:
+                self._trace.write(json.dumps({"ts": time.time(), "rate": series, "value": per_second}) + "\n")
+    
+    @contextmanager
+    def timer(self, stage, **fields):
+        """Time the body of a with-block as one observation of stage."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start, **fields)
+    
+    def timed(self, stage, func):
+        """Wrap func so every call is timed as stage."""
+        def wrapper(*args, **kwargs):
+            with self.timer(stage):
+                return func(*args, **kwargs)
+        wrapper.__wrapped__ = func
+        return wrapper
+    
+    def track_stream(self, name, chunks, start=None):
+        """Pass a token stream through, recording time to first token, total time and tokens/s."""
+        start = time.perf_counter() if start is None else start
+        first = None
+        tokens = 0
+        for chunk in chunks:
+            if first is None:
+                first = time.perf_counter()
+                self.observe(f"{name}.ttft", first - start)
+            tokens += 1
+            yield chunk
+        end = time.perf_counter()
+        self.observe(f"{name}.total", end - start)
+        if first is not None and tokens > 1 and end > first:
+            self.observe_rate(f"{name}.tokens_per_second", (tokens - 1) / (end - first))
+    
+    def snapshot(self):
+        """Current count, sum and percentiles of every series."""
+        with self._lock:  # quantiles() sorts the live deques, so take them under the lock
+            return {
+                kind: {
+                    name: {"count": s.count, "sum": s.total,
+                           **{f"p{int(q * 100)}": v for q, v in s.quantiles().items()}}
+                    for name, s in table.items()
+                }
+                for kind, table in (("stages", self.stages), ("rates", self.rates))
+            }
+    
+    def prometheus(self):
+        """Prometheus text exposition of all series as summaries."""
+        lines = []
+        families = (
+            ("alice_stage_seconds", "Voice loop and LLM stage latency", "stage", self.stages),
+            ("alice_llm_tokens_per_second", "LLM generation throughput", "series", self.rates),
+        )
+        with self._lock:
+            for metric, help_text, label, table in families:
+                lines.append(f"# HELP {metric} {help_text}")
+                lines.append(f"# TYPE {metric} summary")
+                for name, stats in sorted(table.items()):
+                    for q, value in stats.quantiles().items():
+                        lines.append(f'{metric}{{{label}="{name}",quantile="{q}"}} {value:.6g}')
+                    lines.append(f'{metric}_sum{{{label}="{name}"}} {stats.total:.6g}')
+                    lines.append(f'{metric}_count{{{label}="{name}"}} {stats.count}')
+        return "\n".join(lines) + "\n"
+    
+    def serve(self, port=9464, host="0.0.0.0"):
+        """Serve /metrics (Prometheus) and /metrics.json from a background thread."""
+        registry = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+            
+            def do_GET(self):
+                if self.path == "/metrics":
+                    body, kind = registry.prometheus().encode(), "text/plain; version=0.0.4"
+                elif self.path == "/metrics.json":
+                    body, kind = json.dumps(registry.snapshot()).encode(), "application/json"
+                else:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", kind)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+        
+        server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+    
+    def close(self):
+        if self._trace:
+            self._trace.close()
+            self._trace = None
+
+metrics = Metrics()
@@ -0,0 +1,187 @@
+"""Alice OS - Model Loading (lazy Whisper/Ollama/Piper access, shared registry, warm-up)
+
+Heavy dependencies are imported on first use, not at import time, so building
+an AliceOS is cheap. warm_up() preloads the STT and LLM models in parallel in
+the background while the rest of the system starts.
+
+`registry` is the process-wide ModelRegistry: every front-end (voice loop,
+gateway, device bridges) acquires models through it, so each Whisper model and
+Ollama client is loaded once per process and freed after sitting idle.
+"""
+import threading
+import time
+
+_present_models = set()  # Ollama models confirmed present locally (this process)
+_present_lock = threading.Lock()
+
+def _local_ollama_models(client=None):
+    if client is None:
+        import ollama as client
+    names = set()
+    for model in client.list()["models"]:
+        name = model.get("model") or model.get("name")
+        names.add(name)
+        if name.endswith(":latest"):
+            names.add(name[: -len(":latest")])
+    return names
+
+def ensure_ollama_model(name, client=None):
+    """Make sure an Ollama model is available locally, pulling only if it is missing."""
+    if name in _present_models:
+        return False
+    with _present_lock:
+        if name in _present_models:
+            return False
+        pulled = False
+        if name not in _local_ollama_models(client):
+            if client is None:
+                import ollama as client
+            client.pull(name)
+            pulled = True
+        _present_models.add(name)
+        return pulled
+
+def preload_ollama_model(name, keep_alive=None, client=None):
+    """Load an Ollama model into memory without generating anything."""
+    ensure_ollama_model(name, client)
+    if client is None:
+        import ollama as client
+    client.generate(model=name, prompt="", keep_alive=keep_alive)
+
+def load_ollama(name):
+    """Create an Ollama client for a model, pulling the model if it is missing."""
+    import ollama
+    client = ollama.Client()
+    ensure_ollama_model(name, client)
+    return client
+
+def unload_ollama(name, client):
+    """Ask the Ollama server to drop a model from memory."""
+    client.generate(model=name, prompt="", keep_alive=0)
+
+def load_whisper(size="base"):
+    """Load a Whisper model (imports whisper on first call)."""
+    import whisper
+    return whisper.load_model(size)
+
+def load_piper(model_path):
+    """Load a Piper TTS voice from its .onnx file (imports piper on first call)."""
+    from piper import PiperVoice
+    return PiperVoice.load(model_path)
+
+class ModelHandle:
+    """A counted reference to a shared model; release it (or use `with`) when done."""
+    
+    def __init__(self, registry, key, model):
+        self.registry = registry
+        self.key = key
+        self.model = model
+        self.released = False
+    
+    def release(self):
+        if not self.released:
+            self.released = True
+            self.registry.release(self.key)
+    
+    def __enter__(self):
+        return self.model
+    
+    def __exit__(self, *exc):
+        self.release()
+
+class ModelRegistry:
+    """Process-wide cache of loaded models with reference counting and idle eviction."""
+    
+    def __init__(self, idle_timeout=600.0):
+        self.idle_timeout = idle_timeout
+        self.loaders = {"whisper": load_whisper, "ollama": load_ollama, "piper": load_piper}
+        self.unloaders = {"ollama": unload_ollama}
+        self._entries = {}  # (kind, name) -> {model, refs, last_used, lock, timer}
+        self._lock = threading.Lock()
+    
+    def register(self, kind, loader, unloader=None):
+        """Add (or replace) the loader used for a kind of model."""
+        self.loaders[kind] = loader
+        if unloader:
+            self.unloaders[kind] = unloader
+    
+    def acquire(self, kind, name):
+        """Return a handle to the shared model, loading it if this process hasn't yet."""
+        key = (kind, name)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = {"model": None, "refs": 0, "last_used": 0.0,
+                         "lock": threading.Lock(), "timer": None}
+                self._entries[key] = entry
+            entry["refs"] += 1
+            if entry["timer"]:
+                entry["timer"].cancel()
+                entry["timer"] = None
+        try:
+            # Load outside the registry lock so other models aren't blocked
+            with entry["lock"]:
+                if entry["model"] is None:
+                    entry["model"] = self.loaders[kind](name)
+        except BaseException:
+            self.release(key)
+            raise
+        return ModelHandle(self, key, entry["model"])
+    
+    def release(self, key):
+        """Drop one reference; the model is evicted once idle for idle_timeout."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            entry["refs"] -= 1
+            entry["last_used"] = time.monotonic()
+            if entry["refs"] == 0 and self.idle_timeout is not None:
+                entry["timer"] = threading.Timer(self.idle_timeout, self.evict_idle)
+                entry["timer"].daemon = True
+                entry["timer"].start()
+    
+    def evict_idle(self, max_idle=None):
+        """Free every unreferenced model idle for at least max_idle seconds."""
+        max_idle = self.idle_timeout if max_idle is None else max_idle
+        now = time.monotonic()
+        with self._lock:
+            evicted = [
+                (key, entry) for key, entry in self._entries.items()
+                if entry["refs"] == 0 and now - entry["last_used"] >= max_idle
+            ]
+            for key, entry in evicted:
+                del self._entries[key]
+                if entry["timer"]:
+                    entry["timer"].cancel()
+        for (kind, name), entry in evicted:
+            unload = self.unloaders.get(kind)
+            if unload and entry["model"] is not None:
+                try:
+                    unload(name, entry["model"])
+                except Exception as e:
+                    print(f"⚠️ Unloading {kind}:{name} failed: {e}")
+        return [key for key, _ in evicted]
+    
+    def stats(self):
+        """Reference count of every model currently held."""
+        with self._lock:
+            return {f"{kind}:{name}": entry["refs"] for (kind, name), entry in self._entries.items()}
+
+registry = ModelRegistry()
+
+def warm_up(*loaders, background=True):
+    """Run loaders in parallel threads; failures are reported and retried on first use."""
+    def run(loader):
+        try:
+            loader()
+        except Exception as e:
+            print(f"⚠️ Warm-up failed ({getattr(loader, '__qualname__', loader)}): {e}")
+    
+    threads = [threading.Thread(target=run, args=(loader,), daemon=True) for loader in loaders]
+    for thread in threads:
+        thread.start()
+    if not background:
+        for thread in threads:
+            thread.join()
+    return threads
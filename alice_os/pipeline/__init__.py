@@ -0,0 +1,192 @@
+"""Alice OS - Voice Pipeline (concurrent listen → transcribe → think → speak)
+
+Each stage of the voice loop runs as its own asyncio worker, connected to the
+next by a bounded queue:
+
+    capture → [heard] → transcribe + context → [prompts] → think → [replies] → speak
+
+The blocking module calls (Whisper, Ollama, TTS) run in worker threads, so the
+mic keeps capturing while Alice is thinking or speaking and a turn costs roughly
+the slowest stage instead of the sum of all of them.
+
+If think returns an iterator (e.g. Brain.think_stream) rather than a string,
+each sentence is handed to speak as soon as it is produced.
+
+With `metrics`, every stage is timed (a streaming think up to its first
+sentence), along with "turn.response": the time from an utterance being
+captured to Alice starting to answer it.
+
+Barge-in: when a new utterance is captured, any think/speak work still in
+flight for an older turn is cancelled and its queued output dropped.
+"""
+import asyncio
+import time
+
+class VoicePipeline:
+    """Runs the voice-loop stages as concurrent workers linked by bounded queues."""
+    
+    def __init__(self, listen, transcribe, get_context, think, speak,
+                 interrupt=None, maxsize=2, barge_in=True, metrics=None, idle=0.05):
+        self.metrics = metrics
+        if metrics is not None:
+            listen = metrics.timed("listen", listen)
+            transcribe = metrics.timed("transcribe", transcribe)
+            get_context = metrics.timed("context", get_context)
+            speak = metrics.timed("speak", speak)
+        self.listen = listen
+        self.transcribe = transcribe
+        self.get_context = get_context
+        self.think = think
+        self.speak = speak
+        self.interrupt = interrupt  # e.g. stop TTS playback on barge-in
+        self.barge_in = barge_in
+        self.maxsize = maxsize
+        self.idle = idle  # back-off when listen() returns without an utterance
+        self.turn = 0  # id of the most recent utterance
+        self.turns_spoken = 0
+        self.turns_interrupted = 0
+        self._inflight = set()
+        self._heard_at = {}  # turn -> capture time, until it starts being answered
+    
+    async def run(self, max_turns=None):
+        """Run the pipeline until cancelled, or until max_turns replies are spoken."""
+        self._max_turns = max_turns
+        self._finished = asyncio.Event()
+        self._heard = asyncio.Queue(self.maxsize)
+        self._prompts = asyncio.Queue(self.maxsize)
+        self._replies = asyncio.Queue(self.maxsize)
+        
+        workers = [
+            asyncio.create_task(self._capture_worker()),
+            asyncio.create_task(self._transcribe_worker()),
+            asyncio.create_task(self._think_worker()),
+            asyncio.create_task(self._speak_worker()),
+        ]
+        finished = asyncio.create_task(self._finished.wait())
+        try:
+            done, _ = await asyncio.wait(workers + [finished], return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task is not finished:
+                    task.result()  # re-raise a crashed stage
+        finally:
+            for task in workers + [finished] + list(self._inflight):
+                task.cancel()
+            await asyncio.gather(*workers, finished, return_exceptions=True)
+    
+    def _is_stale(self, turn):
+        return self.barge_in and turn < self.turn
+    
+    def _drop(self, turn):
+        """Forget a turn that will never be answered."""
+        self._heard_at.pop(turn, None)
+    
+    def _interrupt_inflight(self):
+        """Cancel in-flight think/speak work and drop queued output for older turns."""
+        busy = bool(self._inflight) or not self._prompts.empty() or not self._replies.empty()
+        for task in list(self._inflight):
+            task.cancel()
+        for queue in (self._prompts, self._replies):
+            while not queue.empty():
+                queue.get_nowait()
+        if busy:
+            self.turns_interrupted += 1
+            if self.interrupt:
+                self.interrupt()
+    
+    def _observe(self, stage, start):
+        if self.metrics is not None:
+            self.metrics.observe(stage, time.perf_counter() - start)
+    
+    async def _interruptible(self, func, *args):
+        """Run a blocking stage in a thread; returns its task so callers can check cancellation."""
+        task = asyncio.ensure_future(asyncio.to_thread(func, *args))
+        self._inflight.add(task)
+        try:
+            await asyncio.wait({task})
+        finally:
+            self._inflight.discard(task)
+            task.cancel()
+        return task
+    
+    async def _capture_worker(self):
+        while True:
+            audio = await asyncio.to_thread(self.listen)
+            if audio is None:
+                await asyncio.sleep(self.idle)  # a non-blocking listen() must not spin a core
+                continue
+            self.turn += 1
+            self._heard_at[self.turn] = time.perf_counter()
+            if self.barge_in:
+                self._interrupt_inflight()
+                for turn in [turn for turn in self._heard_at if turn < self.turn]:
+                    self._drop(turn)
+            await self._heard.put((self.turn, audio))
+    
+    async def _transcribe_worker(self):
+        while True:
+            turn, audio = await self._heard.get()
+            if self._is_stale(turn):
+                self._drop(turn)
+                continue
+            # Context is gathered alongside transcription, not after it
+            text, ctx = await asyncio.gather(
+                asyncio.to_thread(self.transcribe, audio),
+                asyncio.to_thread(self.get_context),
+            )
+            if not text or not text.strip() or self._is_stale(turn):
+                self._drop(turn)  # noise or an empty transcript is not a turn
+                continue
+            await self._prompts.put((turn, text, ctx))
+    
+    async def _think_worker(self):
+        while True:
+            turn, text, ctx = await self._prompts.get()
+            if self._is_stale(turn):
+                self._drop(turn)
+                continue
+            start = time.perf_counter()
+            task = await self._interruptible(self.think, text, ctx)
+            if task.cancelled() or self._is_stale(turn):
+                self._drop(turn)
+                continue
+            response = task.result()
+            if isinstance(response, str):
+                self._observe("think", start)
+                await self._replies.put((turn, response))
+            else:
+                # Streaming think: hand each sentence to speak as soon as it is ready
+                sentences = iter(response)
+                first = True
+                while True:
+                    task = await self._interruptible(next, sentences, None)
+                    if task.cancelled() or self._is_stale(turn):
+                        self._drop(turn)
+                        break
+                    sentence = task.result()
+                    if first:
+                        self._observe("think", start)  # time to the first sentence
+                        first = False
+                    if sentence is None:
+                        break
+                    await self._replies.put((turn, sentence))
+            if not self._is_stale(turn):
+                await self._replies.put((turn, None))  # end of turn
+    
+    async def _speak_worker(self):
+        while True:
+            turn, sentence = await self._replies.get()
+            if self._is_stale(turn):
+                self._drop(turn)
+                continue
+            heard_at = self._heard_at.pop(turn, None)
+            if heard_at is not None and self.metrics is not None:
+                self.metrics.observe("turn.response", time.perf_counter() - heard_at)
+            if sentence is None:
+                self.turns_spoken += 1
+                if self._max_turns and self.turns_spoken >= self._max_turns:
+                    self._finished.set()
+                continue
+            task = await self._interruptible(self.speak, sentence)
+            if task.cancelled():
+                continue
+            task.result()
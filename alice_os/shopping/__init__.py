@@ -1,21 +1,57 @@
-"""Alice OS - Shopping & Grocery Management"""
+"""Alice OS - Shopping & Grocery Management
+
+The pantry keeps a sorted expiry index (see pantry.py), so expiry queries and
+alerts only touch the items that are actually due.
+"""
+from .pantry import ExpiryAlerts, Pantry
+
+DAY = 86400
+
 class Shopping:
     def __init__(self):
-        self.pantry = {}  # item -> quantity, expiry
+        self.pantry = Pantry()  # items by name, indexed by expiry
+        self.alerts = None
         self.shopping_list = []
         self.price_history = {}
     
     def add_to_list(self, item, category="General"):
         """Add item to shopping list."""
-        pass
+        for entry in self.shopping_list:
+            if entry["item"].lower() == item.lower():
+                return entry
+        entry = {"item": item, "category": category}
+        self.shopping_list.append(entry)
+        return entry
     
     def scan_receipt(self, receipt_image):
         """Extract items from receipt photo."""
         pass
     
-    def track_expiry(self):
-        """Alert when items are expiring soon."""
-        pass
+    def add_to_pantry(self, item, quantity=1, expiry=None):
+        """Stock the pantry; expiry is a date, datetime or timestamp."""
+        return self.pantry.add(item, quantity, expiry)
+    
+    def use_item(self, item, quantity=1):
+        """Use some of an item; returns what's left (quantity 0 once it's gone)."""
+        return self.pantry.use(item, quantity)
+    
+    def track_expiry(self, within_days=3, expired_days=7):
+        """Items expiring within the next few days, or expired in the last expired_days, soonest first."""
+        now = self.pantry.clock()
+        return [
+            {**entry, "days_left": round((entry["expiry"] - now) / DAY, 1)}
+            for entry in self.pantry.expiring(within_days * DAY, now, expired_days * DAY)
+        ]
+    
+    def start_expiry_alerts(self, notify, lead_days=2):
+        """Call notify(entry) once per item as it comes within lead_days of expiring.
+        
+        Driven by a timer armed for the next expiry boundary, not by polling.
+        """
+        if self.alerts:
+            self.alerts.stop()
+        self.alerts = ExpiryAlerts(self.pantry, notify, lead_days * DAY).start()
+        return self.alerts
     
     def auto_reorder(self):
         """Automatically order consumables."""
@@ -0,0 +1,173 @@
+"""Alice OS - Pantry with an expiry index and scheduled alerts
+
+Items are kept in a dict plus a list of (expiry, item) sorted with bisect,
+so "what's expiring soon?" is a binary search and a slice: O(log n + k) for
+the k items due. Adding, restocking and using items keep the index in step.
+
+ExpiryAlerts doesn't poll: it arms one timer for the next item to enter the
+alert window, and re-arms whenever that boundary moves. Each item alerts
+once per stocking; it can alert again only after it has been used up.
+"""
+import threading
+import time
+from bisect import bisect_left, bisect_right, insort
+from datetime import date, datetime
+
+_LAST = "\uffff"  # sorts after any item name, for bisecting past equal expiries
+
+def to_timestamp(expiry):
+    """Timestamp for an expiry given as a date (end of that day), datetime or number."""
+    if expiry is None or isinstance(expiry, (int, float)):
+        return expiry
+    if isinstance(expiry, datetime):
+        return expiry.timestamp()
+    if isinstance(expiry, date):
+        return datetime(expiry.year, expiry.month, expiry.day, 23, 59, 59).timestamp()
+    raise TypeError(f"Unsupported expiry: {expiry!r}")
+
+class Pantry:
+    """Item -> quantity and expiry, with a sorted expiry index."""
+    
+    def __init__(self, clock=time.time):
+        self.clock = clock
+        self.items = {}   # name -> {"item", "quantity", "expiry"}
+        self._index = []  # sorted (expiry, name) for items that expire
+        self._lock = threading.RLock()
+        self.listeners = []  # called with (name, expiry) after an item's expiry changes (None: gone)
+    
+    def __len__(self):
+        return len(self.items)
+    
+    def __contains__(self, item):
+        return item.strip().lower() in self.items
+    
+    def _unindex(self, name):
+        expiry = self.items[name]["expiry"]
+        if expiry is not None:
+            del self._index[bisect_left(self._index, (expiry, name))]
+    
+    def add(self, item, quantity=1, expiry=None):
+        """Stock an item; restocking keeps the earliest expiry (use those first)."""
+        name = item.strip().lower()
+        expiry = to_timestamp(expiry)
+        with self._lock:
+            entry = self.items.get(name)
+            previous = entry and entry["expiry"]
+            if entry is None:
+                entry = {"item": name, "quantity": quantity, "expiry": expiry}
+            else:
+                self._unindex(name)
+                earliest = min((e for e in (entry["expiry"], expiry) if e is not None), default=None)
+                entry = {"item": name, "quantity": entry["quantity"] + quantity, "expiry": earliest}
+            self.items[name] = entry
+            if entry["expiry"] is not None:
+                insort(self._index, (entry["expiry"], name))
+        if entry["expiry"] != previous:
+            for listener in self.listeners:
+                listener(name, entry["expiry"])
+        return entry
+    
+    def use(self, item, quantity=1):
+        """Consume some of an item; it leaves the pantry (and the index) when none is left."""
+        name = item.strip().lower()
+        with self._lock:
+            entry = self.items.get(name)
+            if entry is None:
+                return None
+            if entry["quantity"] - quantity > 0:
+                entry = self.items[name] = {**entry, "quantity": entry["quantity"] - quantity}
+                return entry
+            self._unindex(name)
+            del self.items[name]
+        for listener in self.listeners:
+            listener(name, None)
+        return {**entry, "quantity": 0}
+    
+    def remove(self, item):
+        entry = self.items.get(item.strip().lower())
+        return self.use(item, entry["quantity"]) if entry else None
+    
+    def between(self, after, until):
+        """Items with after < expiry <= until, soonest first."""
+        with self._lock:
+            lo = 0 if after is None else bisect_right(self._index, (after, _LAST))
+            hi = bisect_right(self._index, (until, _LAST))
+            return [self.items[name] for _, name in self._index[lo:hi]]
+    
+    def expiring(self, within=3 * 86400, now=None, expired_for=None):
+        """Items expiring within `within` seconds, plus those that expired in the last
+        `expired_for` seconds (every expired item when None)."""
+        now = self.clock() if now is None else now
+        return self.between(None if expired_for is None else now - expired_for, now + within)
+    
+    def next_expiry(self, after=None):
+        """The first expiry later than `after` (or the first overall), or None."""
+        with self._lock:
+            i = 0 if after is None else bisect_right(self._index, (after, _LAST))
+            return self._index[i][0] if i < len(self._index) else None
+
+class ExpiryAlerts:
+    """Notify once per item as it comes within `lead` seconds of expiring."""
+    
+    def __init__(self, pantry, notify, lead=2 * 86400):
+        self.pantry = pantry
+        self.notify = notify
+        self.lead = lead
+        self.horizon = None  # every item expiring up to here has been alerted
+        self.alerted = set()  # names alerted since they were stocked
+        self._timer = None
+        self._due_at = None
+        self._lock = threading.Lock()
+        pantry.listeners.append(self._changed)
+    
+    def check(self):
+        """Alert on items that entered the window since the last check, then re-arm."""
+        with self._lock:
+            limit = self.pantry.clock() + self.lead
+            due = [entry for entry in self.pantry.between(self.horizon, limit)
+                   if entry["item"] not in self.alerted]
+            self.alerted.update(entry["item"] for entry in due)
+            self.horizon = limit
+            self._schedule()
+        for entry in due:
+            self.notify(entry)
+        return due
+    
+    def _schedule(self):
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
+        upcoming = self.pantry.next_expiry(self.horizon)
+        self._due_at = None if upcoming is None else upcoming - self.lead
+        if self._due_at is not None:
+            self._timer = threading.Timer(max(0.0, self._due_at - self.pantry.clock()), self.check)
+            self._timer.daemon = True
+            self._timer.start()
+    
+    def _changed(self, name, expiry):
+        with self._lock:
+            if expiry is None:
+                self.alerted.discard(name)  # used up: the next stocking alerts afresh
+                return
+            if self.horizon is None:
+                return
+            if expiry > self.horizon:
+                if self._due_at is None or expiry - self.lead < self._due_at:
+                    self._schedule()
+                return
+            if name in self.alerted:
+                return  # restocked with an earlier date: already alerted
+            self.alerted.add(name)
+            entry = self.pantry.items.get(name)
+        if entry is not None:
+            self.notify(entry)  # stocked already inside the window
+    
+    def start(self):
+        self.check()
+        return self
+    
+    def stop(self):
+        with self._lock:
+            if self._timer:
+                self._timer.cancel()
+                self._timer = None
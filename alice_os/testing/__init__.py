@@ -0,0 +1,293 @@
+"""Alice OS - Local Stand-ins for tests and benchmarks
+
+FakeOllamaServer speaks enough of the Ollama HTTP API (/api/chat,
+/api/generate, /api/embed, /api/tags, /api/pull, /api/show) for the real
+`ollama` client to talk to it. Replies are deterministic and per-token delays
+simulate generation speed, so gateway and end-to-end tests need no model.
+
+FakeWhisperModel has Whisper's transcribe() interface: utterance(text) makes
+a deterministic audio buffer that it later transcribes back to that text, with
+an optional simulated real-time factor.
+
+SimulatedFleet is a smart-home Transport over in-memory devices with
+per-device latency, unreachable devices and push reports, for exercising
+SmartHome's concurrency without a Matter network.
+"""
+import asyncio
+import hashlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+from ..home.transport import Transport
+
+SAMPLE_RATE = 16000
+
+class FakeWhisperModel:
+    """Deterministic stand-in for a Whisper model."""
+    
+    def __init__(self, realtime_factor=0.0):
+        self.realtime_factor = realtime_factor  # seconds of compute per second of audio
+        self._texts = {}
+    
+    def utterance(self, text, seconds=1.0):
+        """Audio buffer that this model will transcribe as `text`."""
+        seed = int(hashlib.md5(text.encode()).hexdigest()[:8], 16)
+        audio = np.random.default_rng(seed).uniform(-0.3, 0.3, int(seconds * SAMPLE_RATE))
+        audio = audio.astype(np.float32)
+        self._texts[hashlib.md5(audio.tobytes()).digest()] = text
+        return audio
+    
+    def transcribe(self, audio, **options):
+        audio = np.asarray(audio, dtype=np.float32)
+        if self.realtime_factor:
+            time.sleep(self.realtime_factor * len(audio) / SAMPLE_RATE)
+        text = self._texts.get(hashlib.md5(audio.tobytes()).digest(), "")
+        return {"text": f" {text}", "language": "en", "segments": []}
+
+def echo_reply(messages):
+    """Default reply: a short, deterministic answer to the last user message."""
+    last = next((m["content"] for m in reversed(messages) if m["role"] == "user"), "")
+    return f"You said {last.strip().rstrip('.?!')}. I can help with that."
+
+def tokenize_reply(text):
+    """Split a reply into word-sized 'tokens' that re-join exactly."""
+    words = text.split(" ")
+    return [w if i == 0 else " " + w for i, w in enumerate(words)]
+
+class FakeOllamaServer:
+    """Threaded HTTP server implementing the Ollama API with canned, deterministic replies."""
+    
+    def __init__(self, reply=echo_reply, token_delay=0.0, first_token_delay=0.0,
+                 models=("llama3.2:latest",), port=0):
+        self.reply = reply
+        self.token_delay = token_delay
+        self.first_token_delay = first_token_delay
+        self.models = list(models)
+        self.requests = []
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = None
+    
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+    
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+    
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+    
+    def __enter__(self):
+        return self.start()
+    
+    def __exit__(self, *exc):
+        self.stop()
+    
+    def _enter(self, path, body):
+        with self._lock:
+            self.requests.append((path, body))
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+    
+    def _exit(self):
+        with self._lock:
+            self.active -= 1
+    
+    def _handler(self):
+        fake = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            
+            def log_message(self, *args):
+                pass
+            
+            def _json(self, payload, status=200):
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+            
+            def do_GET(self):
+                if self.path == "/api/tags":
+                    self._json({"models": [{"model": m, "name": m} for m in fake.models]})
+                elif self.path == "/api/version":
+                    self._json({"version": "0.0.0-fake"})
+                else:
+                    self._json({"error": "not found"}, 404)
+            
+            def do_HEAD(self):
+                self.send_response(200)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+            
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length) or b"{}")
+                fake._enter(self.path, body)
+                try:
+                    if self.path == "/api/chat":
+                        self._generate(body, fake.reply(body.get("messages", [])), chat=True)
+                    elif self.path == "/api/generate":
+                        prompt = body.get("prompt") or ""
+                        text = fake.reply([{"role": "user", "content": prompt}]) if prompt else ""
+                        self._generate(body, text, chat=False)
+                    elif self.path == "/api/embed":
+                        inputs = body.get("input")
+                        inputs = [inputs] if isinstance(inputs, str) else inputs
+                        self._json({"model": body.get("model"), "embeddings": [fake_embedding(t) for t in inputs]})
+                    elif self.path == "/api/pull":
+                        if body.get("model") not in fake.models:
+                            fake.models.append(body.get("model"))
+                        self._json({"status": "success"})
+                    elif self.path == "/api/show":
+                        self._json({"modelfile": "", "parameters": "", "template": ""})
+                    else:
+                        self._json({"error": "not found"}, 404)
+                finally:
+                    fake._exit()
+            
+            def _generate(self, body, text, chat):
+                tokens = tokenize_reply(text) if text else []
+                context = list(body.get("context") or []) + list(range(len(tokens)))
+                final = {
+                    "model": body.get("model"), "created_at": "1970-01-01T00:00:00Z",
+                    "done": True, "done_reason": "stop",
+                    "prompt_eval_count": sum(len(m.get("content", "")) // 4 for m in body.get("messages", [])),
+                    "eval_count": len(tokens),
+                }
+                if not chat:
+                    final["context"] = context
+                
+                def part(token):
+                    if chat:
+                        return {"message": {"role": "assistant", "content": token}}
+                    return {"response": token}
+                
+                if tokens:
+                    time.sleep(fake.first_token_delay)
+                if not body.get("stream", True):
+                    time.sleep(fake.token_delay * len(tokens))
+                    self._json({**final, **part(text)})
+                    return
+                
+                self.send_response(200)
+                self.send_header("Content-Type", "application/x-ndjson")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                for i, token in enumerate(tokens):
+                    if i:
+                        time.sleep(fake.token_delay)
+                    self._chunk({"model": body.get("model"), "created_at": final["created_at"],
+                                 "done": False, **part(token)})
+                self._chunk({**final, **part("")})
+                self.wfile.write(b"0\r\n\r\n")
+            
+            def _chunk(self, payload):
+                data = json.dumps(payload).encode() + b"\n"
+                self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+                self.wfile.flush()
+        
+        return Handler
+
+def fake_embedding(text, dim=32):
+    """Deterministic bag-of-words embedding (hashed word counts)."""
+    vector = [0.0] * dim
+    for word in text.lower().split():
+        vector[int(hashlib.md5(word.encode()).hexdigest(), 16) % dim] += 1.0
+    return vector
+
+DEVICE_ACTIONS = {
+    "on": {"on": True},
+    "off": {"on": False},
+    "lock": {"locked": True},
+    "unlock": {"locked": False},
+    "play": {"playing": True},
+    "pause": {"playing": False},
+    "stop": {"playing": False},
+}
+
+class SimulatedFleet(Transport):
+    """In-memory devices with simulated network latency."""
+    
+    def __init__(self, devices=None, latency=0.01, unreachable=()):
+        self.devices = {d["id"]: dict(d) for d in (devices or [])}
+        self.states = {id_: dict(d.pop("state", {})) for id_, d in self.devices.items()}
+        self.latency = latency  # seconds per round trip (a dict gives per-device latency)
+        self.unreachable = set(unreachable)
+        self.callbacks = []
+        self.reads = 0
+        self.commands = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+    
+    @classmethod
+    def house(cls, rooms=("kitchen", "living room", "bedroom", "hallway", "office"), **options):
+        """A typical home: lights in every room plus a thermostat, door lock and speaker."""
+        devices = [{"id": f"light.{room.replace(' ', '_')}", "name": f"{room} lights",
+                    "type": "lights", "room": room, "state": {"on": False, "level": 100}}
+                   for room in rooms]
+        devices += [
+            {"id": "climate.thermostat", "name": "thermostat", "type": "thermostat",
+             "room": "hallway", "state": {"target": 20, "current": 19.5}},
+            {"id": "lock.front_door", "name": "front door", "type": "lock",
+             "room": "hallway", "state": {"locked": True}},
+            {"id": "media.speaker", "name": "speaker", "type": "speaker",
+             "room": "living room", "state": {"playing": False}},
+        ]
+        return cls(devices, **options)
+    
+    async def _round_trip(self, device_id):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            latency = self.latency.get(device_id, 0.01) if isinstance(self.latency, dict) else self.latency
+            await asyncio.sleep(latency)
+            if device_id in self.unreachable:
+                await asyncio.sleep(3600)  # never answers; callers must time out
+        finally:
+            self.in_flight -= 1
+    
+    async def discover(self):
+        await asyncio.sleep(self.latency if not isinstance(self.latency, dict) else 0.01)
+        return [dict(device) for device in self.devices.values()]
+    
+    async def read(self, device_id):
+        self.reads += 1
+        await self._round_trip(device_id)
+        return dict(self.states[device_id])
+    
+    async def command(self, device_id, action, value=None):
+        self.commands.append((device_id, action, value))
+        await self._round_trip(device_id)
+        if action == "dim":
+            changes = {"on": True, "level": value}
+        elif action == "set_temperature":
+            changes = {"target": value}
+        else:
+            changes = DEVICE_ACTIONS[action]
+        self.states[device_id].update(changes)
+        return dict(self.states[device_id])
+    
+    def subscribe(self, callback):
+        self.callbacks.append(callback)
+    
+    def report(self, device_id, **changes):
+        """Simulate a device changing on its own (e.g. a wall switch); pushes to subscribers."""
+        self.states[device_id].update(changes)
+        for callback in self.callbacks:
+            callback(device_id, changes)
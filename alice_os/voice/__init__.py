@@ -1,9 +1,43 @@
-"""Alice OS - Voice Input Module (Whisper STT)"""
-import whisper
+"""Alice OS - Voice Module (Whisper STT, Piper TTS)"""
+import os
+import threading
+
+import numpy as np
+
+from ..models import registry
+from .streaming import SAMPLE_RATE, StreamingTranscriber, to_float32
 
 class VoiceInput:
-    def __init__(self):
-        self.model = whisper.load_model("base")
+    def __init__(self, model_size="base", tts_model=None):
+        self.model_size = model_size
+        self.tts_model = tts_model or os.environ.get("ALICE_PIPER_VOICE")
+        self._handle = None
+        self._handle_lock = threading.Lock()
+        self._tts_handle = None
+        self._tts_warned = False
+        self._interrupts = 0  # bumped by stop(), so a reply still being synthesized isn't played
+    
+    @property
+    def model(self):
+        """Shared Whisper model, acquired from the registry on first use."""
+        if self._handle is None:
+            with self._handle_lock:
+                if self._handle is None:
+                    self._handle = registry.acquire("whisper", self.model_size)
+        return self._handle.model
+    
+    def close(self):
+        """Release this instance's references to the shared Whisper and Piper models."""
+        if self._handle is not None:
+            self._handle.release()
+            self._handle = None
+        if self._tts_handle is not None:
+            self._tts_handle.release()
+            self._tts_handle = None
+    
+    def warm_up(self):
+        """Load the Whisper model now instead of on the first utterance."""
+        return self.model
     
     def listen(self):
         """Capture audio and convert to text."""
@@ -11,6 +45,59 @@ class VoiceInput:
         pass
     
     def transcribe(self, audio_path):
-        """Transcribe audio file to text."""
+        """Transcribe an audio file, or an in-memory 16 kHz PCM buffer, to text."""
+        if isinstance(audio_path, os.PathLike):
+            audio_path = str(audio_path)
+        elif not isinstance(audio_path, str):
+            audio_path = to_float32(audio_path)
         result = self.model.transcribe(audio_path)
         return result["text"]
+    
+    def transcribe_stream(self, chunks, sample_rate=SAMPLE_RATE, **options):
+        """Transcribe a live stream of PCM chunks, yielding partial and final Transcripts."""
+        transcriber = StreamingTranscriber(self.model, **options)
+        for chunk in chunks:
+            yield from transcriber.feed(chunk, sample_rate)
+        yield from transcriber.flush()
+    
+    @property
+    def tts(self):
+        """Shared Piper voice, acquired from the registry on first use (None if not configured)."""
+        if self._tts_handle is None and self.tts_model:
+            with self._handle_lock:
+                if self._tts_handle is None:
+                    self._tts_handle = registry.acquire("piper", self.tts_model)
+        return self._tts_handle.model if self._tts_handle is not None else None
+    
+    def speak(self, text):
+        """Speak text aloud (one sentence at a time when streaming)."""
+        if not text or not text.strip():
+            return
+        interrupts = self._interrupts
+        try:
+            voice = self.tts
+            if voice is None:
+                raise RuntimeError("no voice model (pass tts_model or set ALICE_PIPER_VOICE)")
+            audio = b"".join(voice.synthesize_stream_raw(text))
+            if interrupts != self._interrupts:
+                return  # interrupted while synthesizing
+            self.play(np.frombuffer(audio, dtype=np.int16), voice.config.sample_rate)
+        except Exception as e:
+            if not self._tts_warned:
+                self._tts_warned = True
+                print(f"⚠️ Piper TTS unavailable, replies will not be spoken: {e}")
+    
+    def play(self, samples, sample_rate):
+        """Play 16-bit PCM through the default output device and wait for it to finish."""
+        import sounddevice
+        sounddevice.play(samples, sample_rate)
+        sounddevice.wait()
+    
+    def stop(self):
+        """Cut off the reply being spoken (barge-in); speak() returns as soon as playback stops."""
+        self._interrupts += 1
+        try:
+            import sounddevice
+        except ImportError:
+            return
+        sounddevice.stop()
@@ -0,0 +1,38 @@
+"""Alice OS - Voice CLI
+
+Usage:
+    python -m alice_os.voice transcribe-dir RECORDINGS_DIR --output transcripts.jsonl
+    python -m alice_os.voice transcribe-dir RECORDINGS_DIR --workers 4 --model small
+"""
+import argparse
+
+from .batch import transcribe_dir
+
+def main():
+    parser = argparse.ArgumentParser(description="Alice OS - Voice tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+    
+    batch = commands.add_parser(
+        "transcribe-dir", help="Transcribe a directory of recordings in parallel (resumable)"
+    )
+    batch.add_argument("directory")
+    batch.add_argument("--output", default="transcripts.jsonl", help="JSONL results file")
+    batch.add_argument("--workers", type=int, default=None, help="Worker processes")
+    batch.add_argument("--model", default="base", help="Whisper model size")
+    batch.add_argument("--language", default=None, help="Skip language detection")
+    batch.add_argument("--no-recursive", action="store_true")
+    
+    args = parser.parse_args()
+    
+    if args.command == "transcribe-dir":
+        options = {"language": args.language} if args.language else {}
+        print(f"🎧 Transcribing {args.directory} → {args.output}")
+        counts = transcribe_dir(
+            args.directory, args.output, workers=args.workers, model_size=args.model,
+            recursive=not args.no_recursive, **options
+        )
+        print(f"✅ {counts['transcribed']} transcribed, {counts['skipped']} already done, "
+              f"{counts['failed']} failed")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Alice OS - Batch Transcription (process pool, streaming JSONL, resumable)
+
+Files are fanned out over a process pool with one Whisper model loaded per
+worker. Each result is appended to the JSONL output as soon as it finishes,
+so an interrupted run can be resumed: files already transcribed are skipped.
+"""
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from ..models import load_whisper
+
+AUDIO_EXTENSIONS = {".wav", ".mp3", ".m4a", ".ogg", ".flac", ".webm"}
+
+_model = None  # this worker process's Whisper model
+
+def _init_worker(loader, model_size, threads):
+    global _model
+    try:
+        import torch
+        torch.set_num_threads(threads)  # don't oversubscribe cores across workers
+    except ImportError:
+        pass
+    _model = loader(model_size)
+
+def _transcribe_file(path, key, options):
+    try:
+        result = _model.transcribe(path, **options)
+    except Exception as e:
+        return {"file": key, "error": str(e)}
+    return {"file": key, "text": result["text"].strip(), "language": result.get("language")}
+
+def find_audio(directory, recursive=True):
+    """All audio files under directory, in a stable order."""
+    pattern = "**/*" if recursive else "*"
+    return sorted(
+        p for p in Path(directory).glob(pattern)
+        if p.is_file() and p.suffix.lower() in AUDIO_EXTENSIONS
+    )
+
+def load_done(output):
+    """Files already transcribed successfully in an existing JSONL output."""
+    done = set()
+    if not Path(output).exists():
+        return done
+    with open(output) as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # partial last line from an interrupted run
+            if "text" in record:
+                done.add(record["file"])
+    return done
+
+def transcribe_dir(directory, output, workers=None, model_size="base", recursive=True,
+                   loader=load_whisper, **options):
+    """Transcribe every audio file under directory into output (JSONL); returns counts."""
+    directory = Path(directory)
+    done = load_done(output)
+    pending = [
+        (str(path), path.relative_to(directory).as_posix())
+        for path in find_audio(directory, recursive)
+    ]
+    pending = [(path, key) for path, key in pending if key not in done]
+    counts = {"skipped": len(done), "transcribed": 0, "failed": 0}
+    if not pending:
+        return counts
+    
+    workers = workers or max(1, min(4, (os.cpu_count() or 2) // 2))
+    workers = min(workers, len(pending))
+    threads = max(1, (os.cpu_count() or 1) // workers)
+    options = {"fp16": False, **options}
+    
+    with open(output, "a") as out, ProcessPoolExecutor(
+        workers, initializer=_init_worker, initargs=(loader, model_size, threads)
+    ) as pool:
+        futures = [pool.submit(_transcribe_file, path, key, options) for path, key in pending]
+        for future in as_completed(futures):
+            record = future.result()
+            out.write(json.dumps(record) + "\n")
+            out.flush()
+            if "error" in record:
+                counts["failed"] += 1
+                print(f"  ❌ {record['file']}: {record['error']}")
+            else:
+                counts["transcribed"] += 1
+                print(f"  ✅ {record['file']}")
+    return counts
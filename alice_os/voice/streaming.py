@@ -0,0 +1,139 @@
+"""Alice OS - Streaming Transcription (in-memory PCM + VAD segmentation)
+
+Raw PCM frames are fed straight from the capture buffer: no temp files.
+An energy-based voice-activity detector splits the stream into utterances,
+partial transcripts are emitted while the user is still speaking, and a final
+transcript is emitted as soon as the trailing silence exceeds the hangover.
+"""
+from collections import deque
+from dataclasses import dataclass
+
+import numpy as np
+
+SAMPLE_RATE = 16000  # Whisper works on 16 kHz mono float32
+
+@dataclass
+class Transcript:
+    text: str
+    final: bool
+    audio: np.ndarray = None  # segment samples, set on final transcripts
+
+def to_float32(pcm, sample_rate=SAMPLE_RATE):
+    """Convert int16/float PCM (mono or interleaved stereo, or raw int16 bytes) to 16 kHz mono float32."""
+    if isinstance(pcm, (bytes, bytearray, memoryview)):
+        pcm = np.frombuffer(pcm, dtype=np.int16, count=len(pcm) // 2)
+    audio = np.asarray(pcm)
+    if audio.dtype == np.int16:
+        audio = audio.astype(np.float32) / 32768.0
+    else:
+        audio = audio.astype(np.float32, copy=False)
+    if audio.ndim == 2:
+        audio = audio.mean(axis=1)
+    if sample_rate != SAMPLE_RATE and len(audio):
+        n_out = int(round(len(audio) * SAMPLE_RATE / sample_rate))
+        x_out = np.linspace(0, len(audio) - 1, n_out)
+        audio = np.interp(x_out, np.arange(len(audio)), audio).astype(np.float32)
+    return audio
+
+class EnergyVAD:
+    """Frame-level voice-activity detection from short-term energy with an adaptive noise floor."""
+    
+    def __init__(self, frame_ms=30, min_threshold=0.005, ratio=3.0, adapt=0.05):
+        self.frame_size = SAMPLE_RATE * frame_ms // 1000
+        self.min_threshold = min_threshold
+        self.ratio = ratio  # speech must be this many times louder than the noise floor
+        self.adapt = adapt
+        self.noise_floor = min_threshold / ratio
+    
+    def frame_energy(self, audio):
+        """RMS energy of each complete frame in `audio`."""
+        n = len(audio) // self.frame_size
+        frames = audio[: n * self.frame_size].reshape(n, self.frame_size)
+        return np.sqrt(np.mean(frames * frames, axis=1))
+    
+    def is_speech(self, audio):
+        """Boolean speech mask, one entry per complete frame."""
+        energy = self.frame_energy(audio)
+        threshold = max(self.min_threshold, self.noise_floor * self.ratio)
+        speech = energy > threshold
+        quiet = energy[~speech]
+        if len(quiet):
+            self.noise_floor += self.adapt * (float(quiet.mean()) - self.noise_floor)
+        return speech
+
+class StreamingTranscriber:
+    """Segment a live PCM stream with VAD and transcribe each utterance incrementally."""
+    
+    def __init__(self, model, vad=None, partial_interval=1.0, hangover=0.5,
+                 min_speech=0.25, max_segment=30.0, pre_roll=0.3, **options):
+        self.model = model
+        self.vad = vad or EnergyVAD()
+        frame = self.vad.frame_size / SAMPLE_RATE
+        self.partial_frames = int(partial_interval / frame)
+        self.hangover_frames = int(hangover / frame)
+        self.min_speech_frames = int(min_speech / frame)
+        self.max_frames = int(max_segment / frame)
+        self.options = {"fp16": False, **options}
+        self._leftover = np.zeros(0, dtype=np.float32)
+        self._pre_roll = deque(maxlen=max(1, int(pre_roll / frame)))
+        self._reset()
+    
+    def _reset(self):
+        self._segment = []
+        self._speech_frames = 0
+        self._silent_frames = 0
+        self._since_partial = 0
+    
+    @property
+    def in_speech(self):
+        return bool(self._segment)
+    
+    def _transcribe(self, audio):
+        return self.model.transcribe(audio, **self.options)["text"].strip()
+    
+    def _finalize(self):
+        audio = np.concatenate(self._segment)
+        enough = self._speech_frames >= self.min_speech_frames
+        self._reset()
+        if not enough:
+            return []
+        return [Transcript(self._transcribe(audio), final=True, audio=audio)]
+    
+    def feed(self, pcm, sample_rate=SAMPLE_RATE):
+        """Consume a chunk of PCM; return any partial/final transcripts it completes."""
+        audio = np.concatenate([self._leftover, to_float32(pcm, sample_rate)])
+        size = self.vad.frame_size
+        n = len(audio) // size
+        self._leftover = audio[n * size:]
+        events = []
+        
+        speech = self.vad.is_speech(audio[: n * size])
+        for i, voiced in enumerate(speech):
+            frame = audio[i * size:(i + 1) * size]
+            if voiced:
+                if not self._segment:
+                    self._segment.extend(self._pre_roll)
+                    self._pre_roll.clear()
+                self._segment.append(frame)
+                self._speech_frames += 1
+                self._silent_frames = 0
+            elif self._segment:
+                self._segment.append(frame)
+                self._silent_frames += 1
+            else:
+                self._pre_roll.append(frame)
+                continue
+            self._since_partial += 1
+            if self._silent_frames >= self.hangover_frames or len(self._segment) >= self.max_frames:
+                events.extend(self._finalize())
+        
+        if self._segment and self._since_partial >= self.partial_frames:
+            self._since_partial = 0
+            text = self._transcribe(np.concatenate(self._segment))
+            if text:
+                events.append(Transcript(text, final=False))
+        return events
+    
+    def flush(self):
+        """End of stream: finalize any utterance still in progress."""
+        return self._finalize() if self._segment else []
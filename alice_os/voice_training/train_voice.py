@@ -7,6 +7,7 @@ Usage:
     python train_voice.py --step setup       # Create directories & script
     python train_voice.py --step preprocess   # Process audio files
     python train_voice.py --step validate     # Check quality
+    python train_voice.py --step transcribe    # Auto-align text with Whisper (optional)
     python train_voice.py --step prepare       # Create dataset
     python train_voice.py --step all          # Run full pipeline
     python train_voice.py --step train         # Train model (GPU required)
@@ -27,6 +28,7 @@ TRAINING_DIR = Path(__file__).parent / "voice_training"
 RECORDINGS_DIR = TRAINING_DIR / "recordings"
 PROCESSED_DIR = TRAINING_DIR / "processed"
 MODEL_DIR = TRAINING_DIR / "model"
+TRANSCRIPTS_FILE = TRAINING_DIR / "transcripts.jsonl"
 
 def run_cmd(cmd, check=True):
     """Run a shell command."""
@@ -172,6 +174,18 @@ def step_validate():
     
     return issues
 
+def step_transcribe():
+    """Transcribe recordings with Whisper so dataset text matches what was said."""
+    print("📝 Transcribing recordings...")
+    
+    run_cmd([
+        sys.executable, "-m", "alice_os.voice", "transcribe-dir",
+        str(RECORDINGS_DIR),
+        "--output", str(TRANSCRIPTS_FILE),
+        "--language", "en",
+    ])
+    print(f"\n📁 Transcripts: {TRANSCRIPTS_FILE}")
+
 def step_prepare():
     """Create dataset JSON for Piper training."""
     print("📊 Preparing dataset...")
@@ -187,11 +201,23 @@ def step_prepare():
             if line and not line.startswith('#'):
                 script[f"sample_{i+1}"] = line.strip()
     
+    # Whisper transcripts (--step transcribe) take priority over script order
+    transcripts = {}
+    if TRANSCRIPTS_FILE.exists():
+        import json
+        for line in TRANSCRIPTS_FILE.read_text().splitlines():
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if record.get("text"):
+                transcripts[record["file"]] = record["text"]
+    
     for i, wav_file in enumerate(sorted(RECORDINGS_DIR.glob("*.wav"))):
         sample_id = f"sample_{i+1}"
         dataset.append({
             "file": str(wav_file.relative_to(TRAINING_DIR)),
-            "text": script.get(sample_id, sample_id),
+            "text": transcripts.get(wav_file.name, script.get(sample_id, sample_id)),
             "id": sample_id
         })
     
@@ -235,7 +261,7 @@ def main():
     )
     parser.add_argument(
         "--step",
-        choices=["setup", "preprocess", "validate", "prepare", "train", "all"],
+        choices=["setup", "preprocess", "validate", "transcribe", "prepare", "train", "all"],
         default="setup"
     )
     
@@ -251,6 +277,8 @@ def main():
         step_preprocess()
     elif args.step == "validate":
         step_validate()
+    elif args.step == "transcribe":
+        step_transcribe()
     elif args.step == "prepare":
         step_prepare()
         step_validate()
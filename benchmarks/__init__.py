@@ -0,0 +1,7 @@
+"""Alice OS - Benchmark Suite
+
+Drives whole AliceOS turns and the module APIs against deterministic local
+stand-ins (FakeWhisperModel, FakeOllamaServer), reports latency and
+throughput, and compares against benchmarks/baseline.json so regressions fail
+loudly. See `python -m benchmarks --help`.
+"""
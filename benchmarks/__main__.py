@@ -0,0 +1,61 @@
+"""Alice OS - Benchmark CLI
+
+Usage:
+    python -m benchmarks                     # stand-ins, compare with baseline.json
+    python -m benchmarks --update-baseline   # record current numbers as the baseline
+    python -m benchmarks --real-ollama       # use the local Ollama server for LLM cases
+    python -m benchmarks --only turn brain   # run a subset (name prefixes)
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from .suite import compare, run_suite
+
+BASELINE = Path(__file__).parent / "baseline.json"
+
+def main():
+    parser = argparse.ArgumentParser(description="Alice OS - Benchmarks")
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=1.5, help="Allowed p50 slowdown factor")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiply iteration counts")
+    parser.add_argument("--real-ollama", action="store_true", help="Use a real local Ollama server")
+    parser.add_argument("--only", nargs="*", help="Only run cases starting with these prefixes")
+    parser.add_argument("--output", type=Path, help="Also write results as JSON")
+    args = parser.parse_args()
+    
+    mode = "real-ollama" if args.real_ollama else "stand-in"
+    print(f"⏱️  Alice OS benchmarks ({mode})")
+    results = run_suite(scale=args.scale, real_ollama=args.real_ollama, only=args.only)
+    
+    baselines = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+    baseline = baselines.get(mode, {})
+    
+    print(f"\n{'case':<36}{'p50 ms':>10}{'p95 ms':>10}{'ops/s':>12}{'base p50':>10}")
+    for name, r in results.items():
+        base = baseline.get(name, {}).get("p50")
+        base_text = f"{base * 1000:.2f}" if base is not None else "-"
+        print(f"{name:<36}{r['p50'] * 1000:>10.2f}{r['p95'] * 1000:>10.2f}"
+              f"{r['ops_per_sec']:>12.1f}{base_text:>10}")
+    
+    if args.output:
+        args.output.write_text(json.dumps({mode: results}, indent=2))
+    
+    if args.update_baseline:
+        baselines[mode] = {**baseline, **results}
+        args.baseline.write_text(json.dumps(baselines, indent=2, sort_keys=True) + "\n")
+        print(f"\n✅ Baseline updated: {args.baseline}")
+        return
+    
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print("\n❌ Performance regressions:")
+        for regression in regressions:
+            print(f"  - {regression}")
+        sys.exit(1)
+    print("\n✅ No regressions" if baseline else "\n⚠️ No baseline yet (run with --update-baseline)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+"""Alice OS - Benchmark cases, harness and baseline comparison"""
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+
+import numpy as np
+
+from alice_os.ai import AIConfig, AliceAI
+from alice_os.brain import Brain
+from alice_os.finance.categorize import PATTERNS
+from alice_os.habits import HabitTracker
+from alice_os.models import registry
+from alice_os.testing import FakeOllamaServer, FakeWhisperModel, SimulatedFleet
+
+# Stand-in timings: roughly a fast CPU running Llama 3.2 3B and Whisper base
+FIRST_TOKEN_DELAY = 0.02
+TOKEN_DELAY = 0.002
+WHISPER_REALTIME_FACTOR = 0.02
+
+@contextmanager
+def stand_ins(real_ollama=False):
+    """Fake Whisper (always) and fake Ollama (unless real_ollama) for the duration."""
+    whisper = FakeWhisperModel(realtime_factor=WHISPER_REALTIME_FACTOR)
+    previous_loader = registry.loaders["whisper"]
+    previous_host = os.environ.get("OLLAMA_HOST")
+    server = None
+    registry.register("whisper", lambda size: whisper)
+    if not real_ollama:
+        server = FakeOllamaServer(token_delay=TOKEN_DELAY, first_token_delay=FIRST_TOKEN_DELAY).start()
+        os.environ["OLLAMA_HOST"] = server.url
+    try:
+        yield whisper
+    finally:
+        registry.loaders["whisper"] = previous_loader
+        if server:
+            server.stop()
+            if previous_host is None:
+                os.environ.pop("OLLAMA_HOST", None)
+            else:
+                os.environ["OLLAMA_HOST"] = previous_host
+        registry.evict_idle(max_idle=0)
+
+def first_sentence(brain, text):
+    """Seconds until the first streamed sentence is available."""
+    start = time.perf_counter()
+    stream = brain.think_stream(text, cache=False)
+    next(stream)
+    elapsed = time.perf_counter() - start
+    for _ in stream:
+        pass
+    return elapsed
+
+def seed_finance(finance, rows=200_000, seed=0):
+    """Several years of synthetic history: ~150 merchants across 12 categories."""
+    rng = np.random.default_rng(seed)
+    timestamps = np.sort(rng.integers(1_577_836_800, 1_704_067_200, rows))  # 2020-2023
+    amounts = -rng.lognormal(3, 1, rows).astype(np.int64) * 100
+    merchants = [f"merchant {i}" for i in rng.integers(0, 150, rows)]
+    categories = [f"category {i}" for i in rng.integers(0, 12, rows)]
+    finance.transactions.extend(timestamps, amounts, merchants, categories)
+    for merchant, pence in (("netflix com", -1099), ("spotify", -1199), ("gym co", -3500)):
+        months = np.arange(np.datetime64("2020-01"), np.datetime64("2024-01"))
+        days = months.astype("datetime64[D]").astype(np.int64)
+        finance.transactions.extend(days * 86400, [pence] * len(days), [merchant] * len(days))
+
+def seed_habits(habits, years=3, seed=0):
+    """A few habits done on most days, with occasional misses, and one bad habit."""
+    rng = np.random.default_rng(seed)
+    start = time.time() - years * 365 * 86400
+    for name in ("meditate", "morning run", "read", "drink water", "stretch"):
+        for day in np.flatnonzero(rng.random(years * 365) < 0.85):
+            habits.track_habit(name, when=start + day * 86400 + 8 * 3600)
+    for day in np.flatnonzero(rng.random(years * 365) < 0.3):
+        habits.track_bad_habit("doomscrolling", when=start + day * 86400 + 23 * 3600)
+
+def seed_pantry(shopping, items=50_000, seed=0):
+    """A (very) well-stocked pantry with expiries spread over the next two years."""
+    rng = np.random.default_rng(seed)
+    now = time.time()
+    for i, days in enumerate(rng.uniform(-5, 730, items)):
+        shopping.add_to_pantry(f"item {i}", 1, now + days * 86400)
+
+def build_cases(whisper, memory_path, finance_rows=200_000):
+    """name -> (callable, iterations). A callable may return its own measured seconds."""
+    from alice_os.__main__ import AliceOS
+    
+    alice = AliceOS()
+    alice.brain.cache = None  # measure real LLM turns, not cache hits
+    seed_finance(alice.finance, finance_rows)
+    habits_path = os.path.join(memory_path, "habits")
+    seed_habits(HabitTracker(habits_path))
+    seed_habits(alice.habits)
+    seed_pantry(alice.shopping)
+    rooms = [f"room {i}" for i in range(40)] + ["kitchen"]
+    alice.home.transport = SimulatedFleet.house(rooms=rooms, latency=0.005)
+    alice.home.discover_devices()
+    cached_brain = Brain()
+    ai = AliceAI(AIConfig(memory_path=memory_path, rag_top_k=0))
+    
+    merchants = [f"{pattern} {branch}" for pattern in PATTERNS for branch in ("express", "london", "online")]
+    
+    command = whisper.utterance("Turn off the kitchen lights.")
+    question = whisper.utterance("Tell me something interesting about octopuses.")
+    
+    return {
+        "turn.command": (lambda: alice.turn(command), 50),
+        "turn.llm": (lambda: alice.turn(question), 20),
+        "brain.think.cached": (lambda: cached_brain.think("Good morning!"), 200),
+        "brain.think_stream.first_sentence": (lambda: first_sentence(alice.brain, "Tell me a story."), 20),
+        "ai.chat": (lambda: ai.chat("How was my day?"), 20),
+        "intents.route": (lambda: alice.intents.route("Add milk to my shopping list."), 2000),
+        "context.get_context": (alice.context.get_context, 5000),
+        "finance.spending_insights": (alice.finance.get_spending_insights, 50),
+        "finance.spending_insights.week": (lambda: alice.finance.get_spending_insights("week"), 50),
+        "finance.add_transaction": (lambda: alice.finance.add_transaction(-4.2, "Costa Coffee"), 2000),
+        "finance.categorize_many": (lambda: alice.finance.categorizer.categorize_many(merchants), 200),
+        "finance.track_subscriptions": (alice.finance.track_subscriptions, 2000),
+        "home.discover_devices": (alice.home.discover_devices, 20),
+        "home.get_status.all": (alice.home.get_status, 200),
+        "home.control.all_lights": (lambda: alice.home.control("all the lights", "off"), 50),
+        "home.activate_scene": (lambda: alice.home.activate_scene("bedtime"), 50),
+        "habits.get_streak": (lambda: alice.habits.get_streak("meditate"), 2000),
+        "habits.track_habit": (lambda: alice.habits.track_habit("meditate"), 2000),
+        "habits.load": (lambda: HabitTracker(habits_path), 20),
+        "habits.daily_suggestions": (alice.habits.get_daily_suggestions, 2000),
+        "habits.analyze_patterns.uncached": (
+            lambda: alice.habits._cache.clear() or alice.habits.analyze_patterns(), 200),
+        "shopping.track_expiry": (alice.shopping.track_expiry, 2000),
+        "shopping.add_to_pantry": (lambda: alice.shopping.add_to_pantry("milk", 1, time.time() + 86400 * 7), 2000),
+    }
+
+def measure(func, iterations, warmup=2):
+    """Latency percentiles (seconds) and throughput for repeated calls."""
+    for _ in range(warmup):
+        func()
+    samples = []
+    start = time.perf_counter()
+    for _ in range(iterations):
+        t = time.perf_counter()
+        result = func()
+        samples.append(result if isinstance(result, float) else time.perf_counter() - t)
+    total = time.perf_counter() - start
+    samples.sort()
+    return {
+        "iterations": iterations,
+        "p50": samples[len(samples) // 2],
+        "p95": samples[min(len(samples) - 1, int(0.95 * len(samples)))],
+        "mean": sum(samples) / len(samples),
+        "ops_per_sec": iterations / total if total else float("inf"),
+    }
+
+def run_suite(scale=1.0, real_ollama=False, only=None):
+    """Run every benchmark case; scale shrinks iteration counts (for smoke tests)."""
+    results = {}
+    with stand_ins(real_ollama) as whisper, tempfile.TemporaryDirectory() as memory_path:
+        cases = build_cases(whisper, memory_path, finance_rows=max(1000, int(200_000 * scale)))
+        for name, (func, iterations) in cases.items():
+            if only and not any(name.startswith(prefix) for prefix in only):
+                continue
+            results[name] = measure(func, max(2, int(iterations * scale)))
+    return results
+
+def compare(results, baseline, tolerance=1.5, slack=0.001):
+    """Regression messages for cases whose p50 exceeds tolerance x baseline (+ slack seconds)."""
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        limit = base["p50"] * tolerance + slack
+        if result["p50"] > limit:
+            regressions.append(
+                f"{name}: p50 {result['p50'] * 1000:.2f}ms > {limit * 1000:.2f}ms "
+                f"(baseline {base['p50'] * 1000:.2f}ms x{tolerance})"
+            )
+    return regressions
@@ -0,0 +1,64 @@
+"""Tests for the AI module."""
+from alice_os.ai.memory import ConversationMemory
+from alice_os.ai.retrieval import MemoryIndex
+from alice_os.testing import fake_embedding
+
+def test_memory_stays_within_token_budget():
+    """Old turns are evicted into the summary instead of growing the prompt."""
+    memory = ConversationMemory(max_tokens=100)
+    for i in range(50):
+        memory.append("user", f"message number {i} " + "x" * 40)
+    
+    assert memory.tokens <= 100
+    assert memory.messages[-1]["content"].startswith("message number 49")
+    assert "message number 43" in memory.summary
+    assert "message number 0" not in memory.summary  # the summary rolls too
+    assert memory.as_messages()[0]["role"] == "system"
+
+def test_memory_reloads_from_log_tail(tmp_path):
+    """A restart restores the same summary and recent turns from the append-only log."""
+    path = tmp_path / "conversation.jsonl"
+    memory = ConversationMemory(max_tokens=100, path=path)
+    for i in range(30):
+        memory.append("user" if i % 2 == 0 else "assistant", f"turn {i} " + "y" * 30)
+    
+    reloaded = ConversationMemory(max_tokens=100, path=path)
+    assert reloaded.messages == memory.messages
+    assert reloaded.summary == memory.summary
+    
+    reloaded.append("user", "after restart")
+    assert ConversationMemory(max_tokens=100, path=path).messages[-1]["content"] == "after restart"
+
+def test_memory_index_finds_relevant_notes_and_reindexes_incrementally(tmp_path):
+    """Only changed files are re-read, and search reflects edits and deletions."""
+    (tmp_path / "health.md").write_text("Dentist appointment on Friday at 3pm.\n\nBuy floss.")
+    (tmp_path / "car.txt").write_text("MOT is due in March. The garage is on King Street.")
+    (tmp_path / "conversation.jsonl").write_text('{"seq": 1}\n')
+    
+    index = MemoryIndex(tmp_path)
+    assert index.refresh() == 2
+    (score, file, text), = index.search("when is my dentist appointment", k=1)
+    assert file == "health.md" and "Friday" in text
+    
+    assert index.refresh() == 0
+    (tmp_path / "car.txt").write_text("The car was sold in April.")
+    (tmp_path / "health.md").unlink()
+    assert index.refresh() == 2
+    assert index.search("dentist") == []
+    assert index.search("car sold")[0][1] == "car.txt"
+    
+    reloaded = MemoryIndex(tmp_path)
+    assert reloaded.refresh() == 0
+    assert reloaded.search("car sold")[0][1] == "car.txt"
+
+def test_memory_index_with_embeddings_forgets_deleted_notes(tmp_path):
+    """A deleted note's embedding no longer scores, so search never returns a freed slot."""
+    (tmp_path / "health.md").write_text("Dentist appointment on Friday at 3pm.")
+    (tmp_path / "car.txt").write_text("MOT is due in March.")
+    index = MemoryIndex(tmp_path, embed=lambda texts: [fake_embedding(t) for t in texts])
+    assert index.refresh() == 2
+    
+    (tmp_path / "health.md").unlink()
+    index.refresh()
+    results = index.search("dentist appointment on Friday")
+    assert [file for _, file, _ in results] in ([], ["car.txt"])
@@ -0,0 +1,14 @@
+"""Smoke test for the benchmark suite."""
+from benchmarks.suite import compare, run_suite
+
+def test_suite_runs_against_stand_ins_and_flags_regressions():
+    """Every case runs end-to-end on stand-ins; slow cases are reported."""
+    results = run_suite(scale=0.01, only=["turn", "brain", "intents"])
+    assert {"turn.command", "turn.llm", "brain.think.cached"} <= set(results)
+    assert all(r["p50"] > 0 and r["ops_per_sec"] > 0 for r in results.values())
+    
+    baseline = {name: {"p50": r["p50"]} for name, r in results.items()}
+    assert compare(results, baseline) == []
+    slower = {"turn.llm": {**results["turn.llm"], "p50": results["turn.llm"]["p50"] * 3 + 0.01}}
+    regressions = compare(slower, baseline)
+    assert len(regressions) == 1 and regressions[0].startswith("turn.llm")
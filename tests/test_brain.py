@@ -0,0 +1,82 @@
+"""Tests for the Brain module."""
+from alice_os.brain import Brain, iter_sentences
+from alice_os.brain.cache import ResponseCache
+from alice_os.brain.session import LLMSession
+
+def test_iter_sentences_regroups_token_stream():
+    """Sentences are emitted as soon as they are complete, regardless of chunking."""
+    tokens = ["Hel", "lo! I'm", " Alice.", " It's 3.5", " degrees", " outside"]
+    assert list(iter_sentences(tokens)) == ["Hello!", "I'm Alice.", "It's 3.5 degrees outside"]
+
+def test_response_cache_lru_and_ttl():
+    """Entries expire after their TTL and the least recently used is evicted first."""
+    now = [0.0]
+    cache = ResponseCache(maxsize=2, ttl=10, clock=lambda: now[0])
+    cache.put("a", 1)
+    cache.put("b", 2, ttl=100)
+    assert cache.get("a") == 1
+    cache.put("c", 3)  # evicts b, the least recently used
+    assert cache.get("b") is None
+    now[0] = 11
+    assert cache.get("a") is None and cache.get("c") is None
+    assert cache.stats()["hits"] == 1 and cache.stats()["evictions"] == 1
+
+def test_response_cache_skips_time_and_date_questions():
+    """Answers about the clock or calendar go stale immediately, so they are never cached."""
+    cache = ResponseCache()
+    for text in ("What time is it?", "what's the date", "What day is it today",
+                 "is the clock right", "anything on Friday"):
+        assert cache.key(text) is None
+    assert cache.key("tell me a joke") is not None
+
+def test_brain_think_skips_llm_for_repeated_phrases(monkeypatch):
+    """Normalized repeats hit the cache; context-sensitive prompts always reach the LLM."""
+    calls = []
+    
+    class FakeClient:
+        def chat(self, model, messages, stream=False, **options):
+            calls.append(messages[-1]["content"])
+            return {"message": {"content": "Good morning! Sleep well?"}}
+    
+    monkeypatch.setattr(Brain, "client", property(lambda self: FakeClient()))
+    brain = Brain()
+    ctx = {"location": "kitchen", "time": "morning"}
+    
+    assert brain.think("Good morning, Alice!", ctx) == "Good morning! Sleep well?"
+    assert list(brain.think_stream("good morning", ctx)) == ["Good morning!", "Sleep well?"]
+    brain.think("good morning", {"location": "bedroom", "time": "morning"})
+    brain.think("what's on my schedule today", ctx)
+    brain.think("what's on my schedule today", ctx)
+    brain.think("good morning", ctx, cache=False)
+    
+    assert len(calls) == 5
+    assert brain.cache.stats()["hits"] == 1
+
+class RecordingClient:
+    """Stand-in Ollama client that records every request."""
+    
+    def __init__(self):
+        self.requests = []
+    
+    def chat(self, **request):
+        self.requests.append(request)
+        return {"message": {"content": "ok"}, "prompt_eval_count": 3, "done": True}
+    
+    def generate(self, **request):
+        self.requests.append(request)
+        return {"response": "ok", "done": True}
+
+def test_session_keeps_model_warm_and_prefix_stable():
+    """Every request keeps the model resident and starts with the identical prefix."""
+    client = RecordingClient()
+    session = LLMSession(client, "llama3.2", "You are Alice.", profile="Likes tea.", keep_alive="1h")
+    session.chat([{"role": "user", "content": "hi"}])
+    session.chat([{"role": "user", "content": "hi"}, {"role": "assistant", "content": "ok"},
+                  {"role": "user", "content": "again"}])
+    
+    first, second = client.requests
+    assert first["messages"][0] == second["messages"][0] == {
+        "role": "system", "content": "You are Alice.\n\nLikes tea."
+    }
+    assert first["keep_alive"] == second["keep_alive"] == "1h"
+    assert session.last_stats["prompt_eval_count"] == 3
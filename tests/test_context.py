@@ -0,0 +1,108 @@
+"""Tests for the context engine."""
+import time
+
+import numpy as np
+import pytest
+
+from alice_os.context import ContextEngine
+from alice_os.context.prosody import prosody_features
+from alice_os.context.sensors import Sensor, time_of_day
+from alice_os.voice.streaming import SAMPLE_RATE
+
+def test_snapshot_is_immutable_and_swapped_on_publish():
+    """Readers get a stable read-only snapshot; updates replace it wholesale."""
+    engine = ContextEngine(sensors=[])
+    before = engine.get_context()
+    engine.update_location("kitchen")
+    after = engine.get_context()
+    
+    assert before["location"] is None and after["location"] == "kitchen"
+    assert engine.location == "kitchen"
+    with pytest.raises(TypeError):
+        after["location"] = "garden"
+
+def test_poll_refreshes_on_interval_and_expires_stale_values():
+    """Polled sensors refresh when due; values past their staleness budget drop out."""
+    now = [0.0]
+    reads = []
+    engine = ContextEngine(
+        sensors=[Sensor("time", lambda: reads.append(1) or "morning", interval=60),
+                 Sensor("mood", max_age=10)],
+        clock=lambda: now[0],
+    )
+    engine.publish("mood", "happy")
+    assert engine.poll() == 10  # next deadline: mood expiry
+    assert engine.get_context()["time"] == "morning" and len(reads) == 1
+    
+    now[0] = 30
+    engine.poll()
+    assert len(reads) == 1  # not due yet
+    assert engine.mood is None  # stale
+    
+    now[0] = 60
+    engine.poll()
+    assert len(reads) == 2
+
+def test_background_thread_keeps_failing_sensor_from_blocking_reads():
+    """A slow or failing sensor never delays get_context()."""
+    def slow():
+        time.sleep(0.2)
+        raise RuntimeError("GPS unavailable")
+    
+    engine = ContextEngine(sensors=[Sensor("location", slow, interval=0.05)]).start()
+    try:
+        start = time.perf_counter()
+        for _ in range(1000):
+            engine.get_context()
+        assert time.perf_counter() - start < 0.05
+        time.sleep(0.3)
+        assert engine.sensors["location"].errors >= 1
+    finally:
+        engine.stop()
+    assert time_of_day(time.mktime((2024, 1, 1, 8, 0, 0, 0, 0, -1))) == "morning"
+
+def utterance(f0, amplitude, syllables, seconds=2.0):
+    """Harmonic 'voice' at f0 whose loudness pulses at the syllable rate."""
+    t = np.arange(int(SAMPLE_RATE * seconds)) / SAMPLE_RATE
+    voice = sum(np.sin(2 * np.pi * f0 * k * t) / k for k in range(1, 4))
+    return (amplitude * voice * np.sin(np.pi * syllables * t) ** 2).astype(np.float32)
+
+def test_prosody_features_measure_pitch_and_rate():
+    """Pitch and syllable rate are recovered from raw samples."""
+    features = prosody_features(utterance(220, 0.3, 5))
+    assert abs(100 * 2 ** (features["pitch"] / 12) - 220) < 5
+    assert 4.5 < features["rate"] < 5.5
+    assert prosody_features(np.zeros(SAMPLE_RATE, dtype=np.float32)) is None
+
+def test_mood_follows_voice_relative_to_baseline():
+    """Louder, higher, faster speech than usual reads as energetic; queued audio is processed off-turn."""
+    engine = ContextEngine(sensors=[])
+    for _ in range(3):
+        engine.infer_mood(utterance(120, 0.1, 4))
+    assert engine.mood is None  # still learning the baseline
+    
+    engine.observe_audio(utterance(180, 0.4, 7))
+    engine.observe_audio("/tmp/recording.wav")  # files are never decoded again
+    assert engine.mood is None
+    engine.poll()
+    assert engine.mood == "energetic"
+    
+    engine = ContextEngine(sensors=[])
+    for _ in range(3):
+        engine.infer_mood(utterance(120, 0.1, 4))
+    assert engine.infer_mood(utterance(100, 0.03, 3)) in ("calm", "tired")
+
+def test_observe_audio_accepts_what_stt_accepts_and_never_raises():
+    """Arrays, sample lists and int16 bytes all feed mood; bad input is only counted."""
+    engine = ContextEngine(sensors=[])
+    samples = utterance(120, 0.1, 4)
+    engine.observe_audio(samples)
+    engine.observe_audio(samples.tolist())
+    engine.observe_audio((samples * 32767).astype(np.int16).tobytes())
+    engine.poll()
+    assert engine.mood_estimator.count == 3 and engine.mood_errors == 0
+    
+    engine.observe_audio(None)
+    engine.observe_audio(np.array(["not", "audio"]))
+    engine.poll()
+    assert engine.mood_errors == 2
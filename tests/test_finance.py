@@ -0,0 +1,182 @@
+"""Tests for the finance module."""
+import calendar
+
+import numpy as np
+
+from alice_os.finance import Finance
+from alice_os.finance.anomaly import AnomalyDetector, P2Quantile
+from alice_os.finance.categorize import Categorizer
+from alice_os.finance.importers import iter_ofx
+from alice_os.finance.store import TransactionStore, normalize_merchant
+
+def day(y, m, d):
+    return calendar.timegm((y, m, d, 0, 0, 0))
+
+def test_import_csv_and_ofx_statements(tmp_path):
+    """Both export formats stream into the columnar store with interned merchants."""
+    csv_file = tmp_path / "statement.csv"
+    csv_file.write_text(
+        "Date,Description,Paid out,Paid in\n"
+        "01/05/2024,CARD PAYMENT TO TESCO STORES 3297,12.50,\n"
+        "02/05/2024,Tesco Stores 1120,7.25,\n"
+        "03/05/2024,SALARY ACME LTD,,2000.00\n"
+    )
+    ofx_file = tmp_path / "statement.ofx"
+    ofx_file.write_text(
+        "<OFX><BANKTRANLIST>\n"
+        "<STMTTRN>\n<TRNTYPE>DEBIT\n<DTPOSTED>20240510120000\n<TRNAMT>-9.99\n<NAME>NETFLIX.COM\n</STMTTRN>\n"
+        "</BANKTRANLIST></OFX>\n"
+    )
+    finance = Finance()
+    assert finance.import_statement(csv_file) == 3
+    assert finance.import_statement(ofx_file) == 1
+    
+    store = finance.transactions
+    assert store.amount.tolist() == [-1250, -725, 200000, -999]
+    assert store.merchant[0] == store.merchant[1]  # both "tesco stores"
+    assert store.row(3) == {"timestamp": day(2024, 5, 10), "amount": -9.99,
+                            "merchant": "netflix com", "category": None}
+
+def test_import_parses_single_line_ofx_and_skips_reimported_rows(tmp_path):
+    """Transactions are found across the whole stream, and importing twice adds nothing."""
+    transaction = ("<STMTTRN><TRNTYPE>DEBIT</TRNTYPE><DTPOSTED>202405{:02d}</DTPOSTED>"
+                   "<TRNAMT>-{}.00</TRNAMT><FITID>{}</FITID><NAME>{}</NAME></STMTTRN>")
+    ofx_file = tmp_path / "statement.ofx"
+    ofx_file.write_text(
+        "<OFX><BANKTRANLIST>"
+        + transaction.format(1, 3, "a1", "Costa")
+        + transaction.format(1, 3, "a2", "Costa")  # a second, identical coffee
+        + transaction.format(2, 40, "a3", "Shell")
+        + transaction.format(2, 40, "a3", "Shell")  # the same transaction listed twice
+        + "</BANKTRANLIST></OFX>"
+    )
+    csv_file = tmp_path / "statement.csv"
+    csv_file.write_text("Date,Description,Amount\n03/05/2024,Tesco,-12.00\n")
+    
+    finance = Finance()
+    assert finance.import_statement(ofx_file) == 3
+    assert finance.transactions.amount.tolist() == [-300, -300, -4000]
+    assert finance.import_statement(csv_file) == 1
+    assert finance.import_statement(ofx_file) == 0
+    assert finance.import_statement(csv_file) == 0
+    assert len(finance.transactions) == 4
+    assert len(list(iter_ofx(ofx_file, chunk_size=7))) == 3  # tags split across reads
+
+def test_spending_insights_group_by_period_category_and_merchant():
+    """Group-bys only count money out and respect the time window."""
+    finance = Finance()
+    finance.add_transaction(-30, "Tesco", day(2024, 4, 29), "groceries")   # Monday
+    finance.add_transaction(-20, "Tesco", day(2024, 5, 5), "groceries")    # Sunday, same week
+    finance.add_transaction(-50, "Shell", day(2024, 5, 6), "transport")
+    finance.add_transaction(1500, "Salary", day(2024, 5, 1))
+    
+    monthly = finance.get_spending_insights()
+    assert monthly["total"] == 100 and monthly["count"] == 3
+    assert monthly["by_period"] == {"2024-04": 30, "2024-05": 70}
+    assert monthly["by_category"] == {"transport": 50, "groceries": 50}
+    assert monthly["top_merchants"][0] == ("shell", 50)
+    
+    weekly = finance.get_spending_insights("week", since=day(2024, 4, 1))
+    assert weekly["by_period"] == {"2024-04-29": 50, "2024-05-06": 50}
+
+def test_store_grows_and_round_trips(tmp_path):
+    """Columns grow past their initial capacity and persist compactly."""
+    store = TransactionStore(capacity=4)
+    n = 10_000
+    store.extend(np.arange(n) * 3600, -np.arange(n), [f"shop {i % 7}" for i in range(n)])
+    store.set_category(slice(0, 10), "misc")
+    assert len(store) == n and len(store.merchants) == 7
+    
+    store.save(tmp_path / "transactions")
+    loaded = TransactionStore.load(tmp_path / "transactions")
+    assert len(loaded) == n and loaded.row(5) == store.row(5)
+    assert normalize_merchant("POS AMAZON.CO.UK*AB12CD  REF 99") == "amazon co"
+
+def test_subscriptions_are_detected_incrementally():
+    """Regular payments per merchant and amount band become subscriptions as they arrive."""
+    finance = Finance()
+    for month in range(1, 5):
+        finance.add_transaction(-9.99, "NETFLIX.COM", day(2024, month, 3 + month % 2))
+        finance.add_transaction(-4.50, "Pret A Manger", day(2024, month, month * 5))
+    finance.add_transaction(-10.99, "NETFLIX.COM", day(2024, 5, 3))  # price rise, same band
+    finance.add_transaction(-250.0, "NETFLIX.COM", day(2024, 5, 9))  # different band
+    for week in range(4):
+        finance.add_transaction(-6.0, "Gym Co", day(2024, 4, 15 + 7 * week))
+    
+    subs = finance.track_subscriptions(now=day(2024, 5, 10))
+    assert [(s["merchant"], s["cadence"]) for s in subs] == [("gym co", "weekly"), ("netflix com", "monthly")]
+    assert subs[1]["amount"] == 10.99 and subs[1]["payments"] == 5
+    
+    # A back-dated import only touches its own group; lapsed subscriptions drop off
+    finance.add_transaction(-9.99, "NETFLIX.COM", day(2023, 12, 3))
+    assert finance.track_subscriptions(now=day(2024, 5, 10))[1]["payments"] == 6
+    assert [s["merchant"] for s in finance.track_subscriptions(now=day(2024, 8, 1))] == []
+
+def test_unusual_spending_alerts_fire_on_import(tmp_path):
+    """Outliers against a merchant's history alert immediately; state survives a restart."""
+    finance = Finance()
+    fired = []
+    finance.anomalies.listeners.append(fired.append)
+    for i, amount in enumerate([3.10, 2.95, 3.40, 3.05, 2.80, 3.20, 3.00, 3.15]):
+        finance.add_transaction(-amount, "Costa Coffee", day(2024, 3, 1 + i), "eating out")
+    assert fired == []
+    
+    finance.add_transaction(-48.0, "Costa Coffee", day(2024, 3, 20), "eating out")
+    assert len(fired) == 1 and fired[0]["merchant"] == "costa coffee"
+    assert fired[0]["against"] == "merchant" and 2.9 < fired[0]["typical"] < 3.2
+    assert finance.alert_unusual_spending(since=day(2024, 3, 15)) == fired
+    
+    finance.anomalies.save(tmp_path / "anomalies.json")
+    restored = AnomalyDetector.load(tmp_path / "anomalies.json")
+    assert restored.check(day(2024, 3, 21), 3.1, "costa coffee", "eating out") is None
+    assert restored.check(day(2024, 3, 22), 60.0, "costa coffee", "eating out")["score"] > 3
+
+def test_categorizing_imported_rows_teaches_category_baselines(tmp_path):
+    """Rows categorized after import feed their category, so a new merchant's outlier is caught."""
+    statement = tmp_path / "statement.csv"
+    shops = ["TESCO STORES", "ASDA", "ALDI", "LIDL"]
+    statement.write_text("Date,Description,Amount\n" + "".join(
+        f"{1 + i:02d}/04/2024,{shops[i % 4]},-{20 + i % 5}.00\n" for i in range(12)
+    ))
+    finance = Finance()
+    finance.import_statement(statement)
+    assert finance.categorize_uncategorized() == 12
+    
+    alert = finance.anomalies.check(day(2024, 5, 1), 400.0, "waitrose", "groceries")
+    assert alert is not None and alert["against"] == "category"
+
+def test_p2_quantile_tracks_streaming_percentile():
+    """The P² sketch approximates a high percentile in constant memory."""
+    rng = np.random.default_rng(1)
+    data = rng.lognormal(3, 0.5, 20_000)
+    sketch = P2Quantile(0.99)
+    for x in data:
+        sketch.update(x)
+    assert abs(sketch.value / np.quantile(data, 0.99) - 1) < 0.05
+
+def test_categorizer_tiers_and_bulk_categorization():
+    """Known merchants never reach the LLM; unknown ones are batched once and cached."""
+    batches = []
+    def classify(merchants):
+        batches.append(list(merchants))
+        return {"Bobs Bikes": "Shopping", "THE CROWN": "eating out", "mystery ltd": "eatng out"}
+    
+    finance = Finance(categorizer=Categorizer(classify=classify, batch_size=2))
+    for description in ["TESCO STORES 3297", "UBER EATS LONDON", "Bobs Bikes", "The Crown",
+                        "Mystery Ltd", "Bobs Bikes", "TESCO STORES 11"]:
+        finance.add_transaction(-10, description, day(2024, 6, 1))
+    finance.add_transaction(2000, "ACME SALARY", day(2024, 6, 1))
+    
+    assert finance.categorize_uncategorized() == 6
+    assert batches == [["bobs bikes", "the crown"], ["mystery ltd"]]
+    assert [finance.transactions.row(i)["category"] for i in range(8)] == [
+        "groceries", "eating out", "shopping", "eating out", None, "shopping", "groceries", None]
+    
+    assert finance.categorize_transaction(-5, "Bobs Bikes") == "shopping"
+    assert finance.categorize_transaction(-5, "BP 4431 GARAGE") == "transport"
+    assert finance.categorize_transaction(-5, "BPM STUDIOS") is None  # not "bp": asks the LLM
+    assert batches[-1] == ["bpm studios"]
+    assert finance.categorize_uncategorized() == 0  # invalid answers are asked about again
+    assert batches[-1] == ["mystery ltd"]
+    stats = finance.categorizer.stats()
+    assert (stats["llm"], stats["cache"], stats["trie"]) == (5, 1, 3) and stats["hit_rate"] == 4 / 9
@@ -0,0 +1,91 @@
+"""Tests for the multi-device gateway and LLM scheduler."""
+import asyncio
+
+from aiohttp.test_utils import TestClient, TestServer
+
+from alice_os.gateway import Gateway
+from alice_os.gateway.scheduler import LLMScheduler
+from alice_os.intents import default_router
+from alice_os.shopping import Shopping
+from alice_os.testing import FakeOllamaServer
+
+def test_scheduler_prioritizes_voice_and_rotates_devices():
+    """Interactive jobs run before background ones, and devices take turns."""
+    order = []
+    
+    async def main():
+        scheduler = LLMScheduler(max_concurrency=1)
+        gate = asyncio.Event()
+        
+        def job(name):
+            async def run():
+                order.append(name)
+                if name == "warmup":
+                    await gate.wait()
+                return name
+            return run
+        
+        busy = asyncio.ensure_future(scheduler.run("pc", job("warmup")))
+        await asyncio.sleep(0)
+        submitted = [
+            scheduler.run("pc", job("pc-report"), priority="background"),
+            scheduler.run("phone", job("phone-1")),
+            scheduler.run("phone", job("phone-2")),
+            scheduler.run("phone", job("phone-3")),
+            scheduler.run("kitchen", job("kitchen-1")),
+        ]
+        tasks = [asyncio.ensure_future(c) for c in submitted]
+        await asyncio.sleep(0)
+        assert scheduler.pending() == {"interactive": 4, "background": 1}
+        gate.set()
+        results = await asyncio.gather(busy, *tasks)
+        assert results[1] == "pc-report"
+    
+    asyncio.run(main())
+    assert order == ["warmup", "phone-1", "kitchen-1", "phone-2", "phone-3", "pc-report"]
+
+def test_gateway_forgets_least_recently_used_devices(monkeypatch):
+    """Conversation histories are capped so one-off devices don't accumulate forever."""
+    monkeypatch.setattr("ollama.AsyncClient", lambda host=None: None)
+    gateway = Gateway(max_devices=2)
+    phone = gateway._history("phone")
+    gateway._history("pi")
+    assert gateway._history("phone") is phone
+    gateway._history("pc")
+    assert list(gateway.histories) == ["phone", "pc"]
+
+def test_gateway_serves_devices_concurrently_against_fake_ollama():
+    """Several devices are served at once, within the LLM concurrency bound."""
+    with FakeOllamaServer(token_delay=0.02) as ollama_server:
+        async def main():
+            shopping = Shopping()
+            gateway = Gateway(ollama_host=ollama_server.url, max_concurrency=2,
+                              router=default_router(shopping=shopping))
+            async with TestClient(TestServer(gateway.app())) as client:
+                async def turn(device, text):
+                    response = await client.post("/v1/turn", json={"device": device, "text": text})
+                    return (await response.json())["reply"]
+                
+                replies = await asyncio.gather(*[turn(f"device-{i}", f"hello {i}") for i in range(5)])
+                fast = await turn("phone", "Add milk to my shopping list")
+                bad = await client.post("/v1/turn", json={"device": "phone"})
+                not_object = await client.post("/v1/turn", json=["hello"])
+                bad_context = await client.post("/v1/turn", json={"text": "hi", "context": ["x"]})
+                bad_text = await client.post("/v1/turn", json={"text": 42})
+                
+                async with client.ws_connect("/v1/ws?device=pi") as ws:
+                    await ws.send_json({"text": "what's up"})
+                    messages = []
+                    while not messages or messages[-1]["type"] != "done":
+                        messages.append(await ws.receive_json())
+            return replies, fast, (bad.status, not_object.status, bad_context.status, bad_text.status), messages, gateway
+        
+        replies, fast, statuses, messages, gateway = asyncio.run(main())
+    
+    assert replies == [f"You said hello {i}. I can help with that." for i in range(5)]
+    assert fast == "Added milk to your shopping list."
+    assert statuses == (400, 400, 400, 400)
+    assert [m["text"] for m in messages[:-1]] == ["You said what's up.", "I can help with that."]
+    assert ollama_server.max_active <= 2
+    assert len(ollama_server.requests) == 6  # the shopping command never reached the LLM
+    assert gateway.histories["device-3"].messages[0]["content"] == "hello 3"
@@ -0,0 +1,104 @@
+"""Tests for habit tracking."""
+from datetime import date, datetime, timedelta
+
+from alice_os.habits import HabitTracker
+from alice_os.habits.log import EVENT, Streaks
+
+TODAY = date(2024, 6, 10)
+
+def days_ago(n):
+    return TODAY - timedelta(days=n)
+
+def test_streaks_merge_runs_including_back_dated_days():
+    """Filling a gap joins two runs; un-marking splits them again."""
+    streaks = Streaks()
+    today = TODAY.toordinal()
+    for n in (0, 1, 2, 4, 5):
+        streaks.add(today - n)
+    assert streaks.current(today) == 3 and streaks.longest == 3
+    
+    streaks.add(today - 3)  # back-dated
+    assert streaks.current(today) == 6 and streaks.longest == 6
+    assert streaks.current(today + 1) == 6  # today not done yet: yesterday's streak holds
+    assert streaks.current(today + 2) == 0
+    
+    streaks.remove(today - 2)
+    assert streaks.current(today) == 2 and streaks.longest == 3
+    assert Streaks.from_days(sorted(streaks.days)).end_of == streaks.end_of
+
+def test_tracker_persists_append_only_log(tmp_path):
+    """Events survive a restart; the latest entry for a day wins."""
+    tracker = HabitTracker(tmp_path)
+    for n in range(5):
+        tracker.track_habit("Morning Run", when=days_ago(n))
+    tracker.track_habit("meditate", when=days_ago(1))
+    tracker.track_habit("morning run", completed=False, when=days_ago(4))
+    assert tracker.get_streak("morning run", today=TODAY) == 4
+    tracker.log.close()
+    
+    assert (tmp_path / "habits.log").stat().st_size == 7 * EVENT.itemsize
+    reloaded = HabitTracker(tmp_path)
+    assert reloaded.get_streak("Morning  run", today=TODAY) == 4
+    assert reloaded.get_longest_streak("morning run") == 4
+    assert reloaded.get_streak("meditate", today=TODAY) == 1
+    assert reloaded.get_streak("yoga") == 0
+
+def test_patterns_link_bad_habits_to_good_ones(tmp_path):
+    """Peak times and correlations come out of incremental stats and match a rebuild from disk."""
+    tracker = HabitTracker(tmp_path)
+    start = datetime(2024, 4, 1)
+    for n in range(42):
+        day = start + timedelta(days=n)
+        if n % 2:
+            tracker.track_bad_habit("late night snacking", when=day.replace(hour=23, minute=15))
+        else:
+            tracker.track_habit("exercise", when=day.replace(hour=7))
+        if n % 3 == 0:
+            tracker.track_habit("read", when=day.replace(hour=21))
+    
+    report = tracker.analyze_patterns()
+    snacking = report["bad_habits"]["late night snacking"]
+    assert snacking["frequency"] == 21
+    assert snacking["peak_times"][0][0].endswith("23:00")
+    assert snacking["less_likely_with"][0] == ("exercise", -1.0)
+    assert tracker.analyze_patterns() is report  # cached until the next event
+    
+    tracker.log.close()
+    reloaded = HabitTracker(tmp_path)
+    for name in ("together", "hour_of_week", "counts"):
+        assert (getattr(reloaded.patterns, name) == getattr(tracker.patterns, name)).all()
+    assert (reloaded.patterns.lagged[1] == tracker.patterns.lagged[1]).all()
+    assert "exercise" in reloaded.suggest_intervention("late night snacking")
+
+def test_bad_habits_have_no_streaks_and_un_marking_retracts(tmp_path):
+    """Streak queries on a bad habit return 0; an un-mark removes an occurrence, never adds one."""
+    tracker = HabitTracker(tmp_path)
+    for n in range(3):
+        tracker.track_bad_habit("doomscrolling", when=days_ago(n))
+    assert tracker.get_streak("doomscrolling", today=TODAY) == 0
+    assert tracker.get_longest_streak("doomscrolling") == 0
+    assert tracker.analyze_patterns()["bad_habits"]["doomscrolling"]["frequency"] == 3
+    tracker.track_bad_habit("doomscrolling", when=days_ago(0))  # again the same day
+    assert tracker.analyze_patterns()["bad_habits"]["doomscrolling"]["frequency"] == 4
+    
+    assert tracker.track_habit("doomscrolling", completed=False, when=days_ago(1)) == 3
+    assert tracker.track_habit("doomscrolling", completed=False, when=days_ago(1)) == 3
+    assert tracker.track_habit("doomscrolling", completed=False, when=days_ago(9)) == 3
+    tracker.log.close()
+    
+    reloaded = HabitTracker(tmp_path)
+    assert reloaded.bad_habits[reloaded.habit_id("doomscrolling")]["frequency"] == 3
+    assert (reloaded.patterns.counts == tracker.patterns.counts).all()
+
+def test_daily_suggestions_are_cached_until_data_changes():
+    """The morning briefing is reused until an event arrives or the day changes."""
+    tracker = HabitTracker()
+    for n in range(1, 4):
+        tracker.track_habit("meditate", when=datetime.combine(days_ago(n), datetime.min.time()).replace(hour=8))
+    
+    suggestions = tracker.get_daily_suggestions(today=TODAY)
+    assert suggestions == ["Keep your 3-day meditate streak going (you usually do it around 08:00)."]
+    assert tracker.get_daily_suggestions(today=TODAY) is suggestions
+    
+    tracker.track_habit("meditate", when=datetime.combine(TODAY, datetime.min.time()).replace(hour=8))
+    assert tracker.get_daily_suggestions(today=TODAY) == []
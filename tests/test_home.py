@@ -0,0 +1,111 @@
+"""Tests for smart home control."""
+import asyncio
+import time
+
+import pytest
+
+from alice_os.home import DeviceError, SmartHome
+from alice_os.intents import default_router
+from alice_os.testing import SimulatedFleet
+
+def test_discovery_probes_concurrently_and_times_out_unreachable_devices():
+    """Eight devices at 50ms each take about one round trip; a dead device costs one timeout."""
+    fleet = SimulatedFleet.house(latency=0.05, unreachable={"lock.front_door"})
+    home = SmartHome(fleet, probe_timeout=0.2)
+    try:
+        start = time.perf_counter()
+        devices = home.discover_devices()
+        elapsed = time.perf_counter() - start
+        
+        assert len(devices) == 8 and fleet.max_in_flight == 8
+        assert elapsed < 0.5  # serial polling would take 8 x 50ms + 200ms
+        assert home.get_status("front door")["online"] is False
+        assert home.get_status("kitchen lights")["state"] == {"on": False, "level": 100}
+    finally:
+        home.close()
+
+def test_status_is_served_from_cache_and_kept_fresh_by_reports():
+    """get_status never hits the network; commands and device reports update the cache."""
+    fleet = SimulatedFleet.house(latency=0.01)
+    home = SmartHome(fleet)
+    try:
+        home.discover_devices()
+        reads = fleet.reads
+        
+        assert home.control("kitchen lights", "dim", 30) == {"on": True, "level": 30}
+        fleet.report("light.bedroom", on=True)  # someone used the wall switch
+        
+        status = home.get_status()
+        assert status["light.kitchen"]["state"]["level"] == 30
+        assert status["light.bedroom"]["state"]["on"] is True
+        assert status["light.bedroom"]["age"] < 1 and not status["light.bedroom"]["stale"]
+        assert fleet.reads == reads
+        assert home.control("garage", "on") is None
+    finally:
+        home.close()
+
+def test_rapid_commands_to_one_device_coalesce_in_order():
+    """Commands queued behind one in flight collapse to the latest target state."""
+    fleet = SimulatedFleet.house(latency=0.05)
+    home = SmartHome(fleet)
+    try:
+        home.discover_devices()
+        
+        async def burst():
+            first = asyncio.ensure_future(home.control_async("light.kitchen", "dim", 30))
+            await asyncio.sleep(0.01)  # 30 is now in flight
+            rest = [asyncio.ensure_future(home.control_async("light.kitchen", "dim", level))
+                    for level in (20, 10)]
+            return await asyncio.gather(first, *rest)
+        
+        states = home._run(burst())
+        assert fleet.commands == [("light.kitchen", "dim", 30), ("light.kitchen", "dim", 10)]
+        assert [s["level"] for s in states] == [30, 10, 10] and home.coalesced == 1
+    finally:
+        home.close()
+
+def test_groups_and_scenes_fan_out_in_one_round_trip():
+    """"All the lights" and scenes hit every device concurrently; routing uses them directly."""
+    fleet = SimulatedFleet.house(latency=0.05)
+    home = SmartHome(fleet)
+    try:
+        home.discover_devices()
+        router = default_router(home)
+        
+        start = time.perf_counter()
+        assert router.route("Turn on all the lights") == ("home.switch", "Okay, turning on the lights.")
+        assert time.perf_counter() - start < 0.15  # five lights, one round trip
+        assert all(home.get_status(f"light.{room}")["state"]["on"]
+                   for room in ("kitchen", "bedroom", "office"))
+        
+        fleet.commands.clear()
+        assert router.route("Good night Alice")[0] == "home.scene"
+        assert len(fleet.commands) == 8 and fleet.max_in_flight >= 8
+        assert home.get_status("front door")["state"]["locked"] is True
+        assert home.get_status("thermostat")["state"]["target"] == 18
+        assert router.route("Activate the party mode") is None  # unknown scene: ask the LLM
+    finally:
+        home.close()
+
+def test_group_and_scene_failures_name_the_devices_that_could_not_be_reached():
+    """A command that fails on every light (or some of a scene) isn't reported as done."""
+    lights = {f"light.{room}" for room in ("kitchen", "living_room", "bedroom", "hallway", "office")}
+    fleet = SimulatedFleet.house(latency=0.01, unreachable=lights)
+    home = SmartHome(fleet, probe_timeout=0.1)
+    try:
+        home.discover_devices()
+        with pytest.raises(DeviceError) as error:
+            home.control("lights", "off")
+        assert set(error.value.failed) == lights and len(error.value.results) == 5
+        
+        router = default_router(home)
+        intent, reply = router.route("Turn off all the lights")
+        assert intent == "home.switch" and reply.startswith("Sorry, I couldn't reach the ")
+        assert "kitchen lights" in reply and "office lights" in reply and "Okay" not in reply
+        
+        intent, reply = router.route("Good night Alice")
+        assert intent == "home.scene" and "couldn't reach" in reply and "bedroom lights" in reply
+        assert reply.endswith("everything else is done.")
+        assert home.get_status("front door")["state"]["locked"] is True
+    finally:
+        home.close()
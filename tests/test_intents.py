@@ -0,0 +1,79 @@
+"""Tests for the intent router."""
+import time
+
+from alice_os.intents import default_router, parse_number
+from alice_os.shopping import Shopping
+
+class FakeHome:
+    def __init__(self, devices=("lights", "kitchen lights", "thermostat", "front door", "speaker")):
+        self.devices = set(devices)
+        self.commands = []
+    
+    def control(self, device_id, action, value=None):
+        if device_id not in self.devices:
+            return None
+        self.commands.append((device_id, action, value))
+        return {"state": action}
+
+class FakeHabits:
+    def __init__(self, names=("morning run",)):
+        self.ids = {name: i for i, name in enumerate(names)}
+        self.tracked = []
+    
+    def track_habit(self, habit_name, completed=True):
+        self.tracked.append(habit_name)
+
+def test_router_dispatches_script_commands_without_llm():
+    """Commands from the recording script go straight to their handlers."""
+    home, shopping, habits = FakeHome(), Shopping(), FakeHabits()
+    router = default_router(home, shopping, habits)
+    
+    assert router.route("Turn on the lights.")[0] == "home.switch"
+    router.route("Hey Alice, turn the kitchen lights off please")
+    router.route("Dim the lights to fifty percent.")
+    router.route("Set the temperature to twenty-two degrees.")
+    router.route("Lock the front door.")
+    router.route("Stop the music.")
+    router.route("Add milk to my shopping list.")
+    router.route("Log my morning run")
+    
+    assert home.commands == [
+        ("lights", "on", None),
+        ("kitchen lights", "off", None),
+        ("lights", "dim", 50),
+        ("thermostat", "set_temperature", 22),
+        ("front door", "lock", None),
+        ("speaker", "stop", None),
+    ]
+    assert shopping.shopping_list == [{"item": "milk", "category": "General"}]
+    assert habits.tracked == ["morning run"]
+
+def test_router_falls_back_for_open_questions():
+    """Anything without a confident match is left to the LLM."""
+    router = default_router(FakeHome(), Shopping(), FakeHabits())
+    assert router.route("What's the weather like today?") is None
+    assert router.route("Set the temperature to something cosy") is None
+    assert parse_number("ninety-nine") == 99 and parse_number("lots") is None
+    
+    start = time.perf_counter()
+    for _ in range(1000):
+        router.route("Turn off the lights.")
+    assert time.perf_counter() - start < 0.5
+
+def test_router_declines_commands_it_cannot_carry_out():
+    """Unknown devices, conditional commands and untracked habits are left to the LLM."""
+    home, habits = FakeHome(), FakeHabits()
+    router = default_router(home, Shopping(), habits)
+    
+    assert router.route("Turn on the garage lights") is None
+    assert router.route("Turn off the lights when I leave") is None
+    assert router.route("Turn off the lights and lock the front door") is None
+    assert router.route("Lock the front door in ten minutes") is None
+    assert router.route("Track my package") is None
+    assert home.commands == [] and habits.tracked == []
+    
+    def unreachable(device_id, action, value=None):
+        raise TimeoutError(device_id)
+    
+    home.control = unreachable
+    assert router.route("Lock the front door") == ("home.lock", "Sorry, I couldn't reach the front door.")
@@ -0,0 +1,45 @@
+"""Tests for latency metrics."""
+import json
+import time
+
+from alice_os.metrics import Metrics
+
+def test_metrics_percentiles_and_prometheus_export(tmp_path):
+    """Stage timings aggregate into percentiles and export as text and JSONL."""
+    trace = tmp_path / "trace.jsonl"
+    metrics = Metrics(trace_path=trace)
+    for ms in range(1, 101):
+        metrics.observe("think", ms / 1000)
+    with metrics.timer("speak"):
+        pass
+    
+    stats = metrics.snapshot()["stages"]["think"]
+    assert stats["count"] == 100
+    assert stats["p50"] == 0.051 and stats["p99"] == 0.1
+    
+    text = metrics.prometheus()
+    assert 'alice_stage_seconds{stage="think",quantile="0.95"} 0.096' in text
+    assert 'alice_stage_seconds_count{stage="speak"} 1' in text
+    metrics.close()
+    assert len(trace.read_text().splitlines()) == 101
+    assert json.loads(trace.read_text().splitlines()[0])["stage"] == "think"
+
+def test_track_stream_records_ttft_and_token_rate():
+    """Wrapping a token stream records time to first token and tokens/s."""
+    metrics = Metrics()
+    
+    def tokens():
+        time.sleep(0.05)
+        for token in ["a", "b", "c", "d"]:
+            yield token
+            time.sleep(0.01)
+    
+    assert list(metrics.track_stream("llm", tokens())) == ["a", "b", "c", "d"]
+    snapshot = metrics.snapshot()
+    assert snapshot["stages"]["llm.ttft"]["p50"] >= 0.05
+    assert 0 < snapshot["rates"]["llm.tokens_per_second"]["p50"] < 1000
+    
+    start = time.perf_counter()
+    for _ in range(10000):
+        metrics.observe("hot", 0.001)
+    assert time.perf_counter() - start < 0.5  # cheap enough to leave on
@@ -0,0 +1,101 @@
+"""Tests for model loading."""
+import sys
+import threading
+import types
+
+import numpy as np
+import ollama
+
+from alice_os import models
+from alice_os.voice import VoiceInput
+
+def test_ensure_ollama_model_only_pulls_missing_models(monkeypatch):
+    """The presence check replaces the unconditional pull and is cached per process."""
+    calls = {"list": 0, "pull": []}
+    
+    def fake_list():
+        calls["list"] += 1
+        return {"models": [{"model": "llama3.2:latest"}]}
+    
+    monkeypatch.setattr(models, "_present_models", set())
+    monkeypatch.setattr(ollama, "list", fake_list)
+    monkeypatch.setattr(ollama, "pull", calls["pull"].append)
+    
+    assert models.ensure_ollama_model("llama3.2") is False
+    assert models.ensure_ollama_model("llama3.2") is False
+    assert models.ensure_ollama_model("phi4") is True
+    assert calls == {"list": 2, "pull": ["phi4"]}
+
+def test_voice_input_loads_whisper_lazily(monkeypatch):
+    """Constructing VoiceInput is cheap; the model loads once, on first use."""
+    loads = []
+    registry = models.ModelRegistry()
+    registry.register("whisper", lambda size: loads.append(size) or object())
+    monkeypatch.setattr("alice_os.voice.registry", registry)
+    
+    voice = VoiceInput("tiny")
+    assert loads == []
+    assert voice.model is voice.warm_up()
+    assert loads == ["tiny"]
+
+def test_registry_shares_models_and_evicts_when_idle():
+    """Handles for the same model share one load; unreferenced models are freed."""
+    loads, unloads = [], []
+    registry = models.ModelRegistry(idle_timeout=None)
+    registry.register("whisper", lambda size: loads.append(size) or object(),
+                      lambda size, model: unloads.append(size))
+    
+    a = registry.acquire("whisper", "base")
+    b = registry.acquire("whisper", "base")
+    assert a.model is b.model and loads == ["base"]
+    assert registry.stats() == {"whisper:base": 2}
+    
+    a.release()
+    assert registry.evict_idle(max_idle=0) == []  # still referenced by b
+    with b:
+        pass
+    assert registry.evict_idle(max_idle=0) == [("whisper", "base")]
+    assert unloads == ["base"] and registry.stats() == {}
+    
+    registry.acquire("whisper", "base")
+    assert loads == ["base", "base"]
+
+def test_voice_speak_plays_piper_audio_and_warns_once_without_it(monkeypatch, capsys):
+    """speak() plays synthesized PCM; a missing voice model is reported once, not per reply."""
+    class FakePiper:
+        class config:
+            sample_rate = 22050
+        
+        def synthesize_stream_raw(self, text):
+            yield np.arange(len(text), dtype=np.int16).tobytes()
+    
+    registry = models.ModelRegistry()
+    registry.register("piper", lambda path: FakePiper())
+    monkeypatch.setattr("alice_os.voice.registry", registry)
+    
+    played = []
+    voice = VoiceInput(tts_model="deanna.onnx")
+    voice.play = lambda samples, rate: played.append((len(samples), rate))
+    voice.speak("Hello.")
+    voice.speak("  ")
+    assert played == [(6, 22050)]
+    
+    monkeypatch.delenv("ALICE_PIPER_VOICE", raising=False)
+    mute = VoiceInput()
+    mute.speak("Hello.")
+    mute.speak("Still there?")
+    assert capsys.readouterr().out.count("Piper TTS unavailable") == 1
+
+def test_voice_stop_cuts_off_playback(monkeypatch):
+    """stop() ends a blocking playback, so a barge-in silences the old reply at once."""
+    stopped = threading.Event()
+    sounddevice = types.SimpleNamespace(play=lambda samples, rate: None,
+                                        wait=lambda: stopped.wait(5), stop=stopped.set)
+    monkeypatch.setitem(sys.modules, "sounddevice", sounddevice)
+    
+    voice = VoiceInput()
+    speaking = threading.Thread(target=voice.play, args=(np.zeros(16000, dtype=np.int16), 16000))
+    speaking.start()
+    voice.stop()
+    speaking.join(1)
+    assert not speaking.is_alive()
@@ -0,0 +1,158 @@
+"""Tests for the concurrent voice pipeline."""
+import asyncio
+import threading
+import time
+
+from alice_os.metrics import Metrics
+from alice_os.pipeline import VoicePipeline
+
+def make_listen(utterances, gap=0.0):
+    """Return a listen() that yields each utterance after `gap` seconds, then silence."""
+    pending = list(utterances)
+    
+    def listen():
+        time.sleep(gap)
+        return pending.pop(0) if pending else None
+    return listen
+
+def test_pipeline_overlaps_stages():
+    """Three turns should cost about one turn plus the slowest stage, not 3x the sum."""
+    stage = 0.1
+    spoken = []
+    context_threads = set()
+    
+    def slow(result):
+        def stage_fn(*args):
+            time.sleep(stage)
+            return result(*args)
+        return stage_fn
+    
+    def get_context():
+        context_threads.add(threading.get_ident())
+        time.sleep(stage)
+        return {"location": "home"}
+    
+    pipeline = VoicePipeline(
+        listen=make_listen(["a", "b", "c"], gap=stage),
+        transcribe=slow(lambda audio: audio.upper()),
+        get_context=get_context,
+        think=slow(lambda text, ctx: f"{text}@{ctx['location']}"),
+        speak=slow(spoken.append),
+        barge_in=False,
+    )
+    
+    start = time.perf_counter()
+    asyncio.run(pipeline.run(max_turns=3))
+    elapsed = time.perf_counter() - start
+    
+    assert spoken == ["A@home", "B@home", "C@home"]
+    assert elapsed < 3 * 4 * stage * 0.75
+    assert threading.get_ident() not in context_threads
+
+def test_barge_in_cancels_inflight_reply():
+    """A new utterance cancels the reply still being generated for the previous one."""
+    spoken = []
+    interrupts = []
+    
+    def think(text, ctx):
+        time.sleep(0.4 if text == "first" else 0.01)
+        return f"reply to {text}"
+    
+    pipeline = VoicePipeline(
+        listen=make_listen(["first", "second"], gap=0.1),
+        transcribe=lambda audio: audio,
+        get_context=dict,
+        think=think,
+        speak=spoken.append,
+        interrupt=lambda: interrupts.append(True),
+    )
+    asyncio.run(pipeline.run(max_turns=1))
+    
+    assert spoken == ["reply to second"]
+    assert interrupts and pipeline.turns_interrupted == 1
+
+def test_barge_in_interrupt_stops_reply_being_spoken():
+    """interrupt() is how an in-flight speak gets cut off; the next reply follows straight away."""
+    spoken = []
+    stop = threading.Event()
+    
+    def speak(sentence):
+        if sentence == "reply to first":
+            stop.wait(5)  # playing until interrupted
+        spoken.append(sentence)
+    
+    listen_calls, heard_second = [], []
+    began = time.perf_counter()
+    
+    def listen():
+        """Non-blocking mic: "first" at once, nothing for a while, then "second"."""
+        listen_calls.append(time.perf_counter() - began)
+        if len(listen_calls) == 1:
+            return "first"
+        if listen_calls[-1] > 0.3 and not heard_second:
+            heard_second.append(True)
+            return "second"
+        return None
+    
+    pipeline = VoicePipeline(
+        listen=listen,
+        transcribe=lambda audio: audio,
+        get_context=dict,
+        think=lambda text, ctx: f"reply to {text}",
+        speak=speak,
+        interrupt=stop.set,
+    )
+    start = time.perf_counter()
+    asyncio.run(pipeline.run(max_turns=1))
+    
+    assert time.perf_counter() - start < 2
+    assert spoken == ["reply to first", "reply to second"]
+    assert len(listen_calls) < 20  # idle listens back off instead of spinning
+
+def test_streaming_think_speaks_first_sentence_early():
+    """With a streaming think, speaking starts before generation has finished."""
+    events = []
+    
+    def think(text, ctx):
+        yield "First sentence."
+        time.sleep(0.2)
+        events.append("generated")
+        yield "Second sentence."
+    
+    pipeline = VoicePipeline(
+        listen=make_listen(["hi"]),
+        transcribe=lambda audio: audio,
+        get_context=dict,
+        think=think,
+        speak=events.append,
+    )
+    asyncio.run(pipeline.run(max_turns=1))
+    
+    assert events == ["First sentence.", "generated", "Second sentence."]
+
+def test_pipeline_times_streaming_think_and_forgets_dropped_turns():
+    """A streaming think is timed to its first sentence; noise turns leave nothing behind."""
+    metrics = Metrics()
+    spoken = []
+    
+    def think(text, ctx):
+        time.sleep(0.1)
+        yield "First sentence."
+        time.sleep(0.3)
+        yield "Second sentence."
+    
+    pipeline = VoicePipeline(
+        listen=make_listen(["", "  ", "hi"]),
+        transcribe=lambda audio: audio,
+        get_context=dict,
+        think=think,
+        speak=spoken.append,
+        barge_in=False,
+        metrics=metrics,
+    )
+    asyncio.run(pipeline.run(max_turns=1))
+    
+    think_time = metrics.stages["think"].samples[0]
+    assert 0.1 <= think_time < 0.3
+    assert spoken == ["First sentence.", "Second sentence."]
+    assert pipeline._heard_at == {}
@@ -0,0 +1,68 @@
+"""Tests for shopping and the pantry."""
+import time
+from datetime import date
+
+import pytest
+
+from alice_os.shopping import Shopping
+from alice_os.shopping.pantry import ExpiryAlerts, Pantry
+
+DAY = 86400
+
+def test_expiry_queries_follow_stock_changes():
+    """Only due items are returned; restocking and using items keep the index in step."""
+    now = [1_000_000.0]
+    pantry = Pantry(clock=lambda: now[0])
+    pantry.add("Milk", 2, now[0] + 1 * DAY)
+    pantry.add("yoghurt", 4, now[0] + 2 * DAY)
+    pantry.add("rice", 1, now[0] + 300 * DAY)
+    pantry.add("salt")  # never expires
+    assert [e["item"] for e in pantry.expiring(3 * DAY)] == ["milk", "yoghurt"]
+    
+    pantry.add("rice", 1, now[0] + 0.5 * DAY)  # an older bag turns up
+    assert pantry.items["rice"]["quantity"] == 2
+    assert [e["item"] for e in pantry.expiring(DAY)] == ["rice", "milk"]
+    
+    assert pantry.use("milk", 2)["quantity"] == 0
+    assert "milk" not in pantry
+    assert [e["item"] for e in pantry.expiring(3 * DAY)] == ["rice", "yoghurt"]
+    assert pantry.next_expiry(now[0] + 0.5 * DAY) == now[0] + 2 * DAY
+
+def test_alerts_fire_once_at_each_boundary_without_polling():
+    """The timer wakes at the next item's alert time; items stocked inside the window alert at once."""
+    pantry = Pantry()
+    alerted = []
+    now = time.time()
+    pantry.add("spinach", 1, now + 0.1)
+    pantry.add("cheese", 1, now + 0.3)
+    pantry.add("beans", 1, now + 100 * DAY)
+    alerts = ExpiryAlerts(pantry, lambda entry: alerted.append(entry["item"]), lead=0.05)
+    try:
+        alerts.start()
+        assert alerted == []
+        assert alerts._timer is not None and alerts._due_at == pytest.approx(now + 0.05)
+        time.sleep(0.35)
+        assert alerted == ["spinach", "cheese"]
+        assert alerts._due_at == now + 100 * DAY - 0.05  # next wake-up is the beans
+        
+        pantry.add("bread", 1, time.time() - 1)  # already past its date
+        assert alerted[-1] == "bread"
+        pantry.add("cheese", 1, time.time() - 2)  # restocked with an earlier date
+        assert alerted == ["spinach", "cheese", "bread"]
+        pantry.use("bread")
+        pantry.add("bread", 1, time.time() - 1)  # used up, then stocked again
+        assert alerted == ["spinach", "cheese", "bread", "bread"]
+    finally:
+        alerts.stop()
+
+def test_shopping_track_expiry_reports_days_left():
+    """track_expiry lists what's due soon with days remaining."""
+    shopping = Shopping()
+    shopping.add_to_pantry("eggs", 6, date.today())
+    shopping.add_to_pantry("pasta", 1, date(2100, 1, 1))
+    shopping.add_to_pantry("old jam", 1, time.time() - 30 * DAY)
+    expiring = shopping.track_expiry()
+    assert [e["item"] for e in expiring] == ["eggs"]
+    assert [e["item"] for e in shopping.track_expiry(expired_days=60)] == ["old jam", "eggs"]
+    assert 0 <= expiring[0]["days_left"] <= 1
+    assert shopping.use_item("eggs", 2)["quantity"] == 4
@@ -0,0 +1,78 @@
+"""Tests for the Voice module."""
+import json
+from pathlib import Path
+
+import numpy as np
+
+from alice_os.voice.batch import transcribe_dir
+from alice_os.voice.streaming import SAMPLE_RATE, StreamingTranscriber, to_float32
+
+class FakeWhisper:
+    """Stand-in model that reports how much audio it was given."""
+    
+    def __init__(self):
+        self.calls = []
+    
+    def transcribe(self, audio, **options):
+        self.calls.append(len(audio))
+        return {"text": f"{len(audio) / SAMPLE_RATE:.1f}s"}
+
+def tone(seconds, amplitude=0.3):
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    return (amplitude * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+
+def silence(seconds):
+    return np.zeros(int(seconds * SAMPLE_RATE), dtype=np.float32)
+
+def test_streaming_transcriber_emits_partials_then_final():
+    """Speech is segmented in memory, with partials during and a final after the pause."""
+    model = FakeWhisper()
+    transcriber = StreamingTranscriber(model, partial_interval=0.5, hangover=0.3)
+    audio = np.concatenate([silence(0.5), tone(1.2), silence(0.6), tone(0.05)])
+    
+    events = []
+    for chunk in np.array_split(audio, 20):
+        events.extend(transcriber.feed(chunk))
+    events.extend(transcriber.flush())
+    
+    partials = [e for e in events if not e.final]
+    finals = [e for e in events if e.final]
+    assert partials
+    assert len(finals) == 1  # the trailing 50ms blip is too short to count as speech
+    assert 1.2 <= len(finals[0].audio) / SAMPLE_RATE <= 1.9
+
+def test_int16_input_is_accepted():
+    """int16 capture buffers are converted without touching disk."""
+    model = FakeWhisper()
+    transcriber = StreamingTranscriber(model, hangover=0.2)
+    pcm = (np.concatenate([tone(0.6), silence(0.4)]) * 32767).astype(np.int16)
+    events = transcriber.feed(pcm)
+    assert [e.final for e in events][-1] is True
+    assert np.allclose(to_float32(pcm.tobytes()), to_float32(pcm))  # raw capture bytes too
+
+def fake_loader(size):
+    return FakeWhisperFile()
+
+class FakeWhisperFile:
+    """Stand-in model that 'transcribes' a file to its name."""
+    
+    def transcribe(self, path, **options):
+        if "broken" in path:
+            raise RuntimeError("bad audio")
+        return {"text": f" {Path(path).stem} ", "language": "en"}
+
+def test_transcribe_dir_is_resumable(tmp_path):
+    """Results stream to JSONL and a second run only retries what is missing."""
+    recordings = tmp_path / "recordings"
+    (recordings / "nested").mkdir(parents=True)
+    for name in ["001_hello.wav", "002_broken.wav", "nested/003_lights.mp3", "notes.txt"]:
+        (recordings / name).write_bytes(b"")
+    output = tmp_path / "transcripts.jsonl"
+    
+    counts = transcribe_dir(recordings, output, workers=2, loader=fake_loader)
+    assert counts == {"skipped": 0, "transcribed": 2, "failed": 1}
+    records = {r["file"]: r for r in map(json.loads, output.read_text().splitlines())}
+    assert records["nested/003_lights.mp3"]["text"] == "003_lights"
+    
+    counts = transcribe_dir(recordings, output, workers=2, loader=fake_loader)
+    assert counts == {"skipped": 2, "transcribed": 0, "failed": 1}